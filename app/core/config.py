@@ -6,13 +6,136 @@ class Settings(BaseSettings):
     CONFLUENCE_USER: str
     CONFLUENCE_API_TOKEN: str
 
-    # 'gemini', 'openai' 등 사용할 LLM 프로바이더를 선택합니다.
+    # Confluence HTTP 클라이언트 설정 (앱 전체에서 하나의 커넥션 풀을 공유합니다)
+    CONFLUENCE_HTTP2: bool = False  # True로 설정하려면 'h2' 패키지가 필요합니다.
+    CONFLUENCE_MAX_CONNECTIONS: int = 100
+    CONFLUENCE_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    CONFLUENCE_KEEPALIVE_EXPIRY: float = 30.0  # 초
+    CONFLUENCE_TIMEOUT: float = 30.0  # 요청당 기본 타임아웃 (초)
+    CONFLUENCE_CONNECT_TIMEOUT: float = 5.0  # 커넥션 수립 타임아웃 (초)
+    CONFLUENCE_SEARCH_PAGE_SIZE: int = 50  # CQL 검색 시 한 번에 가져올 결과 수
+    # CQL의 날짜(lastmodified >= "yyyy-MM-dd HH:mm")는 CONFLUENCE_USER의 프로필 시간대로 해석됩니다. (IANA 이름, 예: Asia/Seoul)
+    CONFLUENCE_TIMEZONE: str = "UTC"
+
+    # Confluence 호출 속도 제한 및 재시도
+    # CONFLUENCE_RATE_LIMIT: 프로세스 전체의 초기 초당 요청 수. 성공 시 조금씩 늘고 429 시 절반으로 줄어듭니다.
+    # 기본값 0은 제한기를 끈 상태이며, 429는 제한기 없이도 Retry-After를 지켜 재시도합니다.
+    # 여러 워커/스크립트가 같은 계정으로 호출하여 429가 잦을 때 켜세요. (예: 10)
+    CONFLUENCE_RATE_LIMIT: float = 0.0
+    CONFLUENCE_RATE_LIMIT_MIN: float = 0.5
+    CONFLUENCE_RATE_LIMIT_MAX: float = 50.0
+    CONFLUENCE_RATE_BURST: float = 10.0
+    CONFLUENCE_MAX_RETRIES: int = 4
+    CONFLUENCE_BACKOFF_BASE: float = 0.5  # 지수 백오프 기본 대기 시간 (초)
+    CONFLUENCE_BACKOFF_MAX: float = 30.0
+    CONFLUENCE_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패가 이 횟수에 도달하면 회로를 엽니다
+    CONFLUENCE_CIRCUIT_RESET_TIMEOUT: float = 30.0  # 회로가 열린 뒤 시험 요청을 허용하기까지의 시간 (초)
+
+    # update_page에서 409 Conflict 발생 시 최신 버전으로 재시도할 횟수
+    UPDATE_CONFLICT_RETRIES: int = 2
+
+    # 현재 버전과 내용(제목 + 정규화한 본문)의 해시가 같으면 update_page의 PUT을 생략합니다.
+    WRITE_ELISION_ENABLED: bool = True
+    WRITE_ELISION_PATH: str = ".cache/page_hashes.sqlite3"
+
+    # get_page 응답 캐시 ('memory', 'sqlite', 'none')
+    PAGE_CACHE_BACKEND: str = "memory"
+    PAGE_CACHE_TTL: float = 30.0  # 이 시간이 지나면 version.number로 재검증합니다 (초)
+    PAGE_CACHE_MAX_ENTRIES: int = 1000
+    PAGE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PAGE_CACHE_SQLITE_PATH: str = ".cache/page_cache.sqlite3"
+
+    # LLM 대화 세션 저장소 ('memory' 또는 여러 워커가 공유하는 'sqlite')
+    SESSION_BACKEND: str = "memory"
+    SESSION_SQLITE_PATH: str = ".cache/sessions.sqlite3"
+    SESSION_TTL: float = 3600.0  # 마지막 대화 이후 세션 유지 시간 (초)
+    SESSION_MAX_SESSIONS: int = 1000
+    SESSION_MAX_HISTORY_TOKENS: int = 8000  # 세션당 보관할 대화 기록 토큰 수 (초과 시 오래된 메시지부터 삭제)
+    SESSION_MAX_TOTAL_TOKENS: int = 2_000_000  # 전체 세션 토큰 한도 (초과 시 LRU 세션부터 제거)
+
+    # draft_summary_report (map-reduce 요약) 설정
+    REPORT_MAX_PAGES: int = 200
+    REPORT_FETCH_CONCURRENCY: int = 8
+    REPORT_MAP_CONCURRENCY: int = 4  # 동시에 실행할 LLM 요약 호출 수
+    REPORT_CHUNK_TOKENS: int = 3000  # map 단계 청크당 토큰 예산
+    REPORT_REDUCE_FANIN: int = 8  # reduce 단계에서 한 번에 합칠 요약 수
+    REPORT_SUMMARY_CACHE_PATH: str = ".cache/report_summaries.sqlite3"
+    REPORT_SUMMARY_CACHE_TTL: float = 14 * 86400.0  # 초. 이보다 오래된 요약은 다시 생성합니다
+    REPORT_SUMMARY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # /pages/batch 일괄 쓰기 동시성
+    BATCH_WRITE_CONCURRENCY: int = 8
+
+    # scripts/update_pages_by_label.py 일괄 처리 파이프라인의 기본 동시성
+    BATCH_CONFLUENCE_CONCURRENCY: int = 8
+    BATCH_LLM_CONCURRENCY: int = 4
+
+    # 로컬 검색 인덱스 (SQLite FTS5, 선택적으로 임베딩 기반 의미 검색)
+    INDEX_PATH: str = ".cache/search_index.sqlite3"
+    INDEX_TOKENIZER: str = "unicode61"  # 한국어 부분 일치가 필요하면 'trigram'
+    INDEX_EMBEDDINGS: bool = False  # 동기화 시 LLM 프로바이더로 임베딩도 생성합니다 (numpy 필요)
+    INDEX_EMBED_CHARS: int = 2000  # 임베딩에 사용할 페이지 앞부분 글자 수
+    INDEX_SYNC_CQL: str = "type = page"  # 기본 동기화 범위
+    INDEX_SYNC_OVERLAP_MINUTES: int = 10  # 증분 동기화 시 이전 커서보다 앞당겨 조회할 시간 (분)
+    INDEX_SYNC_PRUNE_HOURS: float = 24.0  # 증분 동기화 중 이 간격마다 범위의 페이지 ID 전체를 조회하여 삭제된 페이지를 인덱스에서 뺍니다 (시간)
+
+    # 변경 동기화 작업자 (스페이스별 커서 이후 수정된 페이지만 가져옵니다)
+    SYNC_SPACES: str = ""  # 쉼표로 구분한 스페이스 키. 비어 있으면 백그라운드 동기화를 하지 않습니다.
+    SYNC_INTERVAL: float = 300.0  # 동기화 주기 (초)
+    SYNC_OVERLAP_MINUTES: int = 5  # 커서보다 앞당겨 조회할 시간 (분). CQL 날짜는 분 단위이고 검색 색인 반영이 늦을 수 있습니다.
+    SYNC_STORE_PATH: str = ".cache/page_store.sqlite3"
+
+    # /llm/execute 단계별 trace (요청 헤더 X-Trace: 1로 요청별로도 켤 수 있습니다)
+    TRACE_LLM_REQUESTS: bool = False
+    TRACE_BUFFER_SIZE: int = 50  # GET /traces로 조회할 수 있는 최근 trace 수
+
+    # 페이지 트리 탐색 (/pages/{page_id}/tree, scripts/export_space.py)
+    TREE_CRAWL_CONCURRENCY: int = 8  # 동시에 자식 목록을 조회할 부모 페이지 수
+    TREE_CRAWL_MAX_DEPTH: int = 50
+
+    # 첨부 파일 업로드/다운로드 (본문을 메모리에 모으지 않고 조각 단위로 전달합니다)
+    ATTACHMENT_CHUNK_SIZE: int = 64 * 1024  # 바이트
+    ATTACHMENT_UPLOAD_CONCURRENCY: int = 4  # 여러 파일을 올릴 때 동시에 업로드할 파일 수
+
+    # 'gemini', 'openai' 등 사용할 LLM 프로바이더를 선택합니다. ('router'는 LLM_ROUTER_PROVIDERS 중 가장 빠른 곳으로 보냅니다)
     LLM_PROVIDER: str = "gemini"
 
+    # LLM 라우터 (LLM_PROVIDER='router')
+    LLM_ROUTER_PROVIDERS: str = "openai,gemini"  # 쉼표로 구분. 기록이 같으면 앞쪽을 우선하며, 임베딩은 항상 첫 번째를 사용합니다.
+    LLM_ROUTER_WINDOW: int = 100  # 프로바이더별로 지연 시간과 오류율을 계산할 최근 호출 수
+    LLM_ROUTER_MAX_ERROR_RATE: float = 0.5  # 최근 오류율이 이보다 높으면 LLM_ROUTER_COOLDOWN 동안 제외합니다
+    LLM_ROUTER_COOLDOWN: float = 30.0  # 초
+    LLM_ROUTER_EXPLORE_RATIO: float = 0.05  # 지연 시간 기록을 갱신하기 위해 두 번째로 빠른 프로바이더로 보낼 요청 비율
+    LLM_ROUTER_HEDGE: bool = True  # complete/stream_query가 늦으면 다음 프로바이더에도 요청합니다 (process_query 제외)
+    LLM_ROUTER_HEDGE_QUANTILE: float = 0.95  # 첫 프로바이더의 이 분위수 지연 시간이 지나면 중복 요청을 보냅니다
+    LLM_ROUTER_HEDGE_MIN_SAMPLES: int = 20  # 기록이 이만큼 쌓이기 전에는 중복 요청하지 않습니다
+    LLM_ROUTER_HEDGE_MIN_DELAY: float = 0.1  # 초
+    LLM_ROUTER_HEDGE_BUDGET: float = 0.1  # 전체 요청 대비 중복 요청의 최대 비율
+
+    # LLM 응답 캐시 (process_query/complete, 요청별로 bypass_cache로 우회)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_PATH: str = ".cache/llm_cache.sqlite3"
+    LLM_CACHE_TTL: float = 86400.0  # 초
+    LLM_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # 함수 호출(도구) 루프 제한
+    LLM_MAX_TOOL_ITERATIONS: int = 5  # 한 질의에서 도구 호출을 주고받는 최대 횟수
+    LLM_MAX_TOTAL_TOKENS: int = 32000  # 한 질의에서 사용할 누적 토큰 한도
+    TOOL_RESULT_MAX_CHARS: int = 12000  # 모델에 돌려줄 도구 결과의 최대 길이
+    TOOL_SEARCH_MAX_RESULTS: int = 10  # search_pages 도구가 반환할 최대 페이지 수
+
+    # LLM에 전달하는 페이지 본문 형식 ('markdown': 간결한 Markdown으로 변환, 'storage': 원본 XHTML)
+    LLM_BODY_FORMAT: str = "markdown"
+    TOOL_PAGE_MAX_TOKENS: int = 2000  # search_pages 결과에서 페이지 본문 하나의 토큰 예산
+
     # 각 프로바이더의 API 키 (사용하는 프로바이더의 키만 필요)
     GOOGLE_API_KEY: str | None = None
     OPENAI_API_KEY: str | None = None
 
+    # 프로바이더 API 주소 재정의 (프록시나 scripts/mock_llm.py 같은 가짜 서버를 사용할 때)
+    OPENAI_BASE_URL: str | None = None  # 예: http://127.0.0.1:8091/v1
+    GEMINI_API_ENDPOINT: str | None = None  # gRPC 'host:port' (TLS). 예: localhost:8092
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
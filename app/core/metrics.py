@@ -0,0 +1,172 @@
+import re
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Sequence
+
+from app.core.tracing import span
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가하는 카운터."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value:g}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램. (Prometheus의 _bucket/_sum/_count 형식으로 노출)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}  # 버킷별 개수 + [sum, count]
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        lines = []
+        for key, state in items:
+            for bound, count in zip(self.buckets, state):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', f'{bound:g}'))} {count:g}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {state[-1]:g}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]:g}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(0.0.4)으로 모든 지표를 반환합니다."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(Counter("mcp_http_requests_total", "API requests by route and status.", ("method", "route", "status")))
+HTTP_LATENCY = registry.register(Histogram("mcp_http_request_duration_seconds", "API request latency until response headers are sent.", ("method", "route")))
+CONFLUENCE_LATENCY = registry.register(Histogram("mcp_confluence_request_duration_seconds", "Upstream Confluence request latency per attempt.", ("method", "endpoint", "status")))
+CONFLUENCE_ERRORS = registry.register(Counter("mcp_confluence_errors_total", "Failed Confluence attempts by error class.", ("method", "endpoint", "error")))
+LLM_LATENCY = registry.register(Histogram("mcp_llm_request_duration_seconds", "LLM API call latency.", ("provider", "model", "operation")))
+LLM_TOKENS = registry.register(Counter("mcp_llm_tokens_total", "LLM tokens used.", ("provider", "model", "kind")))
+LLM_ERRORS = registry.register(Counter("mcp_llm_errors_total", "Failed LLM API calls by error class.", ("provider", "model", "error")))
+LLM_ROUTED = registry.register(Counter("mcp_llm_router_requests_total", "LLM router calls by provider, operation and role (primary/explore/fallback/hedge).", ("provider", "operation", "role")))
+LLM_HEDGE_WINS = registry.register(Counter("mcp_llm_router_hedge_wins_total", "Hedged LLM requests answered first by the hedge.", ("provider", "operation")))
+TOOL_LATENCY = registry.register(Histogram("mcp_tool_call_duration_seconds", "LLM tool call execution latency.", ("tool", "status")))
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def confluence_endpoint(path: str) -> str:
+    """`/wiki/rest/api/content/12345/child` 같은 경로를 `/content/{id}/child`로 정규화합니다. (지표 레이블 수 제한)"""
+    index = path.find("/rest/api")
+    if index >= 0:
+        path = path[index + len("/rest/api"):]
+    return _NUMERIC_SEGMENT.sub("/{id}", path) or "/"
+
+
+class LLMCall:
+    def __init__(self, provider: str, model: str, record: Optional[Dict[str, Any]]):
+        self.provider = provider
+        self.model = model
+        self._record = record
+
+    def tokens(self, prompt: Optional[int], completion: Optional[int]) -> None:
+        """응답의 사용량을 지표와 현재 span에 기록합니다."""
+        if prompt:
+            LLM_TOKENS.inc(prompt, provider=self.provider, model=self.model, kind="prompt")
+        if completion:
+            LLM_TOKENS.inc(completion, provider=self.provider, model=self.model, kind="completion")
+        if self._record is not None:
+            self._record["attrs"].update(prompt_tokens=prompt, completion_tokens=completion)
+
+
+@contextmanager
+def track_llm(provider: str, model: str, operation: str) -> Iterator[LLMCall]:
+    """LLM API 호출 하나의 지연 시간, 오류, 토큰 사용량을 기록하고 trace span을 남깁니다."""
+    started = time.perf_counter()
+    with span("llm", provider=provider, model=model, operation=operation) as record:
+        try:
+            yield LLMCall(provider, model, record)
+        except Exception as e:
+            LLM_ERRORS.inc(provider=provider, model=model, error=type(e).__name__)
+            raise
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - started, provider=provider, model=model, operation=operation)
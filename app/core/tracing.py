@@ -0,0 +1,99 @@
+import time
+import uuid
+import logging
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Iterator
+
+from app.core.config import settings
+
+
+class Trace:
+    """요청 하나에서 발생한 span(LLM 호출, 도구 실행, Confluence 요청 등)들의 기록."""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.duration_ms: Optional[float] = None
+
+    def offset_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"trace_id": self.trace_id, "name": self.name, "duration_ms": self.duration_ms, "spans": self.spans}
+
+    def summary(self) -> Dict[str, Any]:
+        """가장 오래 걸린 span과 span 종류별 누적 시간을 요약합니다."""
+        finished = [s for s in self.spans if s.get("duration_ms") is not None]
+        slowest = max(finished, key=lambda s: s["duration_ms"], default=None)
+        by_name: Dict[str, float] = {}
+        for s in finished:
+            by_name[s["name"]] = round(by_name.get(s["name"], 0.0) + s["duration_ms"], 2)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "duration_ms": self.duration_ms,
+            "spans": len(self.spans),
+            "slowest": {k: slowest[k] for k in ("name", "duration_ms", "attrs")} if slowest else None,
+            "total_ms_by_span": by_name,
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+# 최근 완료된 trace (GET /traces)
+recent_traces: deque = deque(maxlen=settings.TRACE_BUFFER_SIZE)
+
+
+@contextmanager
+def start_trace(name: str) -> Iterator[Trace]:
+    """
+    새 trace를 시작합니다. 블록 안에서 (asyncio.gather로 만든 태스크를 포함해) 열리는 span은 이 trace에 기록됩니다.
+    블록이 끝나면 recent_traces에 보관하고 요약을 로그로 남깁니다.
+    """
+    trace = Trace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace.duration_ms = trace.offset_ms()
+        recent_traces.append(trace)
+        logging.info(f"[Tracing] {trace.summary()}")
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    현재 trace에 span을 기록합니다. 진행 중인 trace가 없으면 아무것도 하지 않습니다.
+    yield된 dict의 "attrs"에 값을 추가하여 결과(토큰 수, 상태 코드 등)를 남길 수 있습니다.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    record = {"id": len(trace.spans), "parent": _current_span.get(), "name": name, "start_ms": trace.offset_ms(), "duration_ms": None, "attrs": attrs}
+    trace.spans.append(record)
+    token = _current_span.set(record["id"])
+    started = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        _current_span.reset(token)
+
+
+def get_trace(trace_id: str) -> Optional[Trace]:
+    for trace in recent_traces:
+        if trace.trace_id == trace_id:
+            return trace
+    return None
@@ -1,17 +1,117 @@
-from fastapi import FastAPI, Depends, Response, status
-from typing import Optional
+import json
+import time
+import uuid
+import logging
+import httpx
+from contextlib import asynccontextmanager, nullcontext
+from fastapi import FastAPI, Depends, Request, Response, HTTPException, status
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
+from starlette.datastructures import MutableHeaders
+from starlette.requests import ClientDisconnect
+from typing import Optional, List
 
-from app.models.confluence_models import PageCreate, PageUpdate, LLMQuery, PagePublish
+from app.core.config import settings
+from app.core.metrics import registry, HTTP_REQUESTS, HTTP_LATENCY
+from app.core.tracing import start_trace, get_trace, recent_traces
+from app.models.confluence_models import PageCreate, PageUpdate, LLMQuery, PagePublish, ReportRequest, ReportDraft, BatchOperation, BatchRequest, PageChangeEvent
 from app.services.confluence_service import confluence_service, ConfluenceService
+from app.services.attachment_stream import AttachmentSource
+from app.services.rate_limiter import CircuitOpenError
 from app.services.base_service import BaseLLMService
-from app.services.llm_factory import get_llm_service
+from app.services.llm_factory import get_llm_service, get_llm_router_stats, startup_llm_service, shutdown_llm_services
+from app.services.session_store import get_session_store
+from app.services.report_service import ReportService, get_summary_cache
+from app.services.page_batch_service import PageBatchService
+from app.services.page_tree import PageTreeCrawler
+from app.services.search_index import get_search_index
+from app.services.sync_service import get_sync_worker
+from app.services.llm_cache import bypass_llm_cache, get_llm_cache
+
+async def index_page_changes(events: List[PageChangeEvent]) -> None:
+    """변경 동기화 작업자의 구독자: 바뀐 페이지를 로컬 검색 인덱스에 반영합니다."""
+    embedder = get_llm_service().embed if settings.INDEX_EMBEDDINGS else None
+    await get_search_index().upsert_pages([event.page for event in events], embedder)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 수명 동안 공유 Confluence HTTP 클라이언트와 LLM 서비스를 열고 닫습니다.
+    SYNC_SPACES가 설정되어 있으면 변경 동기화 작업자도 함께 실행합니다.
+    """
+    await confluence_service.startup()
+    await startup_llm_service()
+    sync_worker = get_sync_worker()
+    sync_worker.subscribe(confluence_service.on_page_changes)
+    sync_worker.subscribe(index_page_changes)
+    sync_worker.start()
+    yield
+    await sync_worker.stop()
+    await shutdown_llm_services()
+    await confluence_service.shutdown()
+
 
 app = FastAPI(
     title="MCP Server for Confluence",
     description="Confluence 자동화 및 통합을 위한 미들웨어 서버",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+class TimingMiddleware:
+    """
+    API 요청별 지연 시간과 상태 코드를 지표로 기록하고 `Server-Timing` 헤더를 추가합니다.
+    스트리밍 응답과 요청 본문 읽기를 방해하지 않도록 순수 ASGI 미들웨어로 구현합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+        observed = False
+
+        def observe() -> float:
+            nonlocal observed
+            elapsed = time.perf_counter() - started
+            if not observed:
+                observed = True
+                route = scope.get("route")
+                HTTP_LATENCY.observe(elapsed, method=scope["method"], route=route.path if route else "unmatched")
+            return elapsed
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", f"app;dur={observe() * 1000:.1f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            observe()
+            route = scope.get("route")
+            HTTP_REQUESTS.inc(method=scope["method"], route=route.path if route else "unmatched", status=status_code)
+
+
+app.add_middleware(TimingMiddleware)
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request, exc: CircuitOpenError):
+    """Confluence 회로가 열려 있으면 업스트림을 호출하지 않고 즉시 503을 반환합니다."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_in) + 1)},
+    )
+
+
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to MCP Server for Confluence"}
@@ -36,9 +136,10 @@ async def publish_confluence_page(page_data: PagePublish, service: ConfluenceSer
 
 
 @app.get("/pages/search")
-async def search_confluence_pages(cql: str, expand: Optional[str] = None, service: ConfluenceService = Depends(lambda: confluence_service)):
+async def search_confluence_pages(cql: str, expand: Optional[str] = None, max_results: Optional[int] = None, service: ConfluenceService = Depends(lambda: confluence_service)):
     """
     CQL(Confluence Query Language)을 사용하여 페이지를 검색합니다.
+    결과는 페이지네이션을 따라가며 NDJSON(한 줄에 하나의 JSON 객체)으로 스트리밍됩니다.
 
     **예시 CQL:**
     - `space = "DEV" and title ~ "회의록"`
@@ -47,8 +148,134 @@ async def search_confluence_pages(cql: str, expand: Optional[str] = None, servic
     **확장(expand):**
     - `version,body.storage` 와 같이 추가 정보를 요청할 수 있습니다.
     """
-    search_results = await service.search_pages(cql, expand)
-    return search_results
+    pages = service.search_pages_iter(cql, expand, max_results)
+    # 첫 검색 요청의 실패(잘못된 CQL의 400 등)는 스트리밍을 시작하기 전에 같은 상태 코드로 응답합니다.
+    try:
+        first = await pages.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail="Failed to search pages")
+
+    async def ndjson_lines():
+        if first is None:
+            return
+        try:
+            yield json.dumps(first, ensure_ascii=False) + "\n"
+            async for page in pages:
+                yield json.dumps(page, ensure_ascii=False) + "\n"
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@app.get("/pages/{page_id}/tree")
+async def get_page_tree(
+    page_id: str,
+    include_body: bool = False,
+    max_depth: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    service: ConfluenceService = Depends(lambda: confluence_service),
+):
+    """
+    페이지와 모든 하위 페이지를 레벨 순서(BFS)로 탐색하여 NDJSON으로 스트리밍합니다.
+    각 줄은 `{"id", "title", "parent_id", "depth", "version"}`이며, `include_body=true`이면 `body`(Storage 포맷)를 포함합니다.
+
+    `ancestor = X` CQL 검색과 달리 깊은 트리도 잘리지 않습니다. 동시성은 TREE_CRAWL_CONCURRENCY로 제한됩니다.
+    """
+    nodes = PageTreeCrawler(service, max_depth=max_depth, max_pages=max_pages, include_body=include_body).crawl(page_id)
+    # 루트 페이지 조회 실패(404 등)는 스트리밍을 시작하기 전에 오류로 응답합니다.
+    try:
+        root = await nodes.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Failed to fetch page {page_id}")
+
+    async def ndjson_nodes():
+        try:
+            yield json.dumps(root, ensure_ascii=False) + "\n"
+            async for node in nodes:
+                yield json.dumps(node, ensure_ascii=False) + "\n"
+        finally:
+            await nodes.aclose()
+
+    return StreamingResponse(ndjson_nodes(), media_type="application/x-ndjson")
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽는 도중에 응답을 스트리밍하기 위한 StreamingResponse.
+    기본 구현은 응답 중 연결 종료를 감지하려고 receive()를 소비하므로, 아직 읽지 않은 요청 본문과 충돌합니다.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+@app.post("/pages/batch", summary="Batch Create/Update/Delete Pages")
+async def batch_confluence_pages(request: Request, service: ConfluenceService = Depends(lambda: confluence_service)):
+    """
+    여러 페이지 생성/수정/삭제 작업을 한 번에 처리합니다.
+
+    - `application/json`: `{"operations": [...]}` 본문을 받아 항목별 결과를 순서대로 반환합니다.
+    - `application/x-ndjson`: 한 줄에 하나의 작업을 스트리밍으로 받아, 결과도 완료되는 대로 NDJSON으로 스트리밍합니다.
+      매우 큰 배치도 전체를 메모리에 올리지 않습니다.
+
+    create 항목에 `ref`를 지정하면, 뒤따르는 항목의 `parent_id`(또는 `page_id`)로 그 `ref`를 사용할 수 있습니다.
+    ref는 사용하는 항목보다 앞에 정의해야 하며, 앞서 정의되지 않은 숫자가 아닌 ID는 오류로 처리됩니다.
+    한 항목이 실패해도 나머지 항목은 계속 처리됩니다.
+    """
+    batch_service = PageBatchService(service)
+
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        async def operations():
+            buffer = b""
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield parse_operation(line)
+            if buffer.strip():
+                yield parse_operation(buffer)
+
+        async def ndjson_results():
+            async for result in batch_service.run(operations()):
+                yield result.model_dump_json(exclude_none=True) + "\n"
+
+        return DuplexStreamingResponse(ndjson_results(), media_type="application/x-ndjson")
+
+    try:
+        batch = BatchRequest.model_validate(await request.json())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    async def listed_operations():
+        for operation in batch.operations:
+            yield operation
+
+    results = [result async for result in batch_service.run(listed_operations())]
+    results.sort(key=lambda r: r.index)
+    succeeded = sum(1 for r in results if r.status != "error")
+    return {
+        "results": [r.model_dump(exclude_none=True) for r in results],
+        "summary": {"total": len(results), "succeeded": succeeded, "failed": len(results) - succeeded},
+    }
+
+
+def parse_operation(line: bytes):
+    """NDJSON 한 줄을 작업으로 변환합니다. 잘못된 줄은 예외 객체로 반환하여 해당 항목만 실패 처리합니다."""
+    try:
+        return BatchOperation.model_validate_json(line)
+    except ValueError as e:
+        return e
 
 
 @app.put("/pages/{page_id}")
@@ -65,14 +292,250 @@ async def delete_confluence_page(page_id: str, service: ConfluenceService = Depe
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@app.get("/pages/{page_id}/attachments")
+async def list_page_attachments(page_id: str, filename: Optional[str] = None, service: ConfluenceService = Depends(lambda: confluence_service)):
+    """페이지의 첨부 파일(`id`, `title`, `version`, `extensions.fileSize` 등)을 NDJSON으로 스트리밍합니다."""
+    attachments = service.get_attachments_iter(page_id, filename)
+    try:
+        first = await attachments.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Failed to list attachments of page {page_id}")
+
+    async def ndjson_attachments():
+        if first is None:
+            return
+        try:
+            yield json.dumps(first, ensure_ascii=False) + "\n"
+            async for attachment in attachments:
+                yield json.dumps(attachment, ensure_ascii=False) + "\n"
+        finally:
+            await attachments.aclose()
+
+    return StreamingResponse(ndjson_attachments(), media_type="application/x-ndjson")
+
+
+# 첨부 파일 다운로드 시 Confluence 응답에서 그대로 전달할 헤더
+ATTACHMENT_PASSTHROUGH_HEADERS = ("content-length", "content-encoding", "content-disposition", "etag", "last-modified")
+
+
+@app.get("/pages/{page_id}/attachments/{attachment_id}/download")
+async def download_page_attachment(page_id: str, attachment_id: str, service: ConfluenceService = Depends(lambda: confluence_service)):
+    """첨부 파일 내용을 Confluence에서 받는 대로 조각 단위로 전달합니다. 파일 크기와 관계없이 서버 메모리 사용량이 일정합니다."""
+    try:
+        upstream = await service.download_attachment(page_id, attachment_id)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Failed to download attachment {attachment_id}")
+
+    async def body():
+        try:
+            async for chunk in upstream.aiter_raw(settings.ATTACHMENT_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await upstream.aclose()
+
+    headers = {name: upstream.headers[name] for name in ATTACHMENT_PASSTHROUGH_HEADERS if name in upstream.headers}
+    return StreamingResponse(body(), media_type=upstream.headers.get("content-type", "application/octet-stream"), headers=headers)
+
+
+def request_attachment(request: Request, filename: str) -> AttachmentSource:
+    """요청 본문을 한 번만 읽을 수 있는 첨부 파일 스트림으로 감쌉니다. 파일 형식은 요청의 Content-Type을 사용합니다."""
+    content_type = request.headers.get("content-type")
+    if content_type and content_type.startswith("application/x-www-form-urlencoded"):
+        # curl --data-binary의 기본값이므로 파일 이름으로 추정합니다.
+        content_type = None
+    size = request.headers.get("content-length")
+    return AttachmentSource.from_stream(filename, request.stream(), content_type, int(size) if size else None)
+
+
+@app.post("/pages/{page_id}/attachments", status_code=201, summary="Upload Attachment")
+async def upload_page_attachment(
+    page_id: str,
+    filename: str,
+    request: Request,
+    comment: Optional[str] = None,
+    minor_edit: bool = True,
+    service: ConfluenceService = Depends(lambda: confluence_service),
+):
+    """
+    요청 본문을 그대로 새 첨부 파일로 올립니다.
+    (예: `curl --data-binary @app.log -H "Content-Type: text/plain" ".../pages/12345/attachments?filename=app.log"`)
+
+    본문은 받는 대로 Confluence로 전달되며 서버 메모리나 디스크에 모아 두지 않습니다.
+    본문을 다시 보낼 수 없으므로 Confluence가 429/5xx로 응답해도 재시도하지 않습니다.
+    여러 파일은 요청을 동시에 보내거나 `scripts/upload_attachments.py`를 사용합니다.
+    """
+    try:
+        return await service.upload_attachment(page_id, request_attachment(request, filename), comment, minor_edit)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Failed to upload attachment {filename}")
+
+
+@app.put("/pages/{page_id}/attachments/{attachment_id}", summary="Update Attachment")
+async def update_page_attachment(
+    page_id: str,
+    attachment_id: str,
+    filename: str,
+    request: Request,
+    comment: Optional[str] = None,
+    minor_edit: bool = True,
+    service: ConfluenceService = Depends(lambda: confluence_service),
+):
+    """요청 본문으로 기존 첨부 파일의 새 버전을 올립니다. 본문은 `/pages/{page_id}/attachments`와 같이 스트리밍으로 전달됩니다."""
+    try:
+        return await service.update_attachment(page_id, attachment_id, request_attachment(request, filename), comment, minor_edit)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Failed to update attachment {attachment_id}")
+
+
+@app.post("/reports/draft", response_model=ReportDraft, summary="Draft Summary Report")
+async def draft_summary_report(
+    request: ReportRequest,
+    service: ConfluenceService = Depends(lambda: confluence_service),
+    llm_service: BaseLLMService = Depends(get_llm_service),
+):
+    """
+    CQL로 찾은 페이지들을 요약하여 보고서 초안을 생성합니다.
+    초안은 페이지로 게시되지 않으며, 검토 후 `/pages/publish`로 게시할 수 있습니다.
+    """
+    report_service = ReportService(service, llm_service)
+    return await report_service.draft_summary_report(
+        request.cql, request.space_key, request.report_title, request.summary_prompt, request.parent_id
+    )
+
+
+@app.get("/index/search", summary="Search Local Index")
+async def search_local_index(q: str, limit: int = 10, space_key: Optional[str] = None, semantic: bool = False):
+    """
+    `/index/sync`로 동기화한 로컬 인덱스에서 페이지를 검색합니다. Confluence를 호출하지 않습니다.
+
+    - 기본은 BM25 전문 검색이며, 결과에 일치 부분을 표시한 `snippet`이 포함됩니다.
+    - `semantic=true`이면 임베딩 유사도로 검색합니다. (INDEX_EMBEDDINGS로 동기화한 경우)
+    """
+    index = get_search_index()
+    if semantic:
+        try:
+            return {"results": await index.semantic_search(q, get_llm_service().embed, limit)}
+        except (RuntimeError, NotImplementedError) as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"results": await index.search(q, limit, space_key)}
+
+
+@app.post("/index/sync", summary="Sync Local Index")
+async def sync_local_index(cql: Optional[str] = None, service: ConfluenceService = Depends(lambda: confluence_service)):
+    """
+    마지막 동기화 이후 수정된 페이지를 가져와 로컬 인덱스를 갱신합니다.
+    `cql`을 생략하면 INDEX_SYNC_CQL 범위를 동기화합니다.
+    """
+    embedder = get_llm_service().embed if settings.INDEX_EMBEDDINGS else None
+    return await get_search_index().sync(service, cql, embedder)
+
+
+@app.post("/sync/run", summary="Run Change Sync")
+async def run_change_sync(space_key: Optional[str] = None):
+    """
+    변경 동기화를 즉시 실행합니다. `space_key`를 생략하면 SYNC_SPACES의 모든 스페이스를 동기화합니다.
+    바뀐 페이지는 페이지 캐시에서 제거되고 로컬 검색 인덱스에 반영됩니다.
+    """
+    worker = get_sync_worker()
+    if space_key:
+        return {"results": [await worker.sync_space(space_key)]}
+    if not worker.spaces:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="space_key is required when SYNC_SPACES is empty")
+    return {"results": await worker.sync_all()}
+
+
+@app.get("/stats")
+async def get_stats(service: ConfluenceService = Depends(lambda: confluence_service)):
+    """캐시 적중률 등 서버 내부 통계를 반환합니다."""
+    return {
+        "page_cache": service.page_cache.stats() if service.page_cache else None,
+        "writes": service.write_stats,
+        "write_elision": service.content_hashes.stats() if service.content_hashes else None,
+        "confluence": service.resilience_stats(),
+        "sessions": get_session_store().stats(),
+        "report_summaries": get_summary_cache().stats(),
+        "search_index": get_search_index().stats(),
+        "sync": get_sync_worker().stats(),
+        "llm_cache": get_llm_cache().stats() if settings.LLM_CACHE_ENABLED else None,
+        "llm_router": get_llm_router_stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """API/Confluence/LLM/도구 호출의 지연 시간 히스토그램과 카운터를 Prometheus 텍스트 형식으로 반환합니다."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/traces")
+async def list_traces():
+    """최근 trace의 요약(가장 오래 걸린 단계, 단계별 누적 시간)을 최신순으로 반환합니다."""
+    return {"traces": [trace.summary() for trace in reversed(recent_traces)]}
+
+
+@app.get("/traces/{trace_id}")
+async def get_trace_detail(trace_id: str):
+    """trace 하나의 모든 span(부모 관계, 시작 시점, 소요 시간)을 반환합니다."""
+    trace = get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trace not found")
+    return trace.to_dict()
+
+
 @app.post("/llm/execute")
-async def execute_llm_task(query: LLMQuery, service: BaseLLMService = Depends(get_llm_service)):
+async def execute_llm_task(query: LLMQuery, request: Request, response: Response, service: BaseLLMService = Depends(get_llm_service)):
     """
     LLM을 사용하여 자연어 명령을 처리합니다.
     
     - 일반적인 질문에는 텍스트로 답변합니다.
     - 보고서 생성 요청 시에는, 검토를 위한 'report_draft' 객체를 반환할 수 있습니다.
     - `session_id`를 포함하여 연속적인 대화를 할 수 있습니다. 첫 요청 시 `session_id`는 생략합니다.
+    - `X-Trace: 1` 헤더(또는 TRACE_LLM_REQUESTS)로 LLM/도구/Confluence 호출 단계별 trace를 남기며,
+      응답의 `X-Trace-Id`로 `/traces/{trace_id}`에서 조회할 수 있습니다.
+    - LLM_CACHE_ENABLED일 때 같은 질의는 캐시된 응답(`"cached": true`)을 반환합니다. `bypass_cache`로 우회할 수 있습니다.
     """
-    result = await service.process_query(query.prompt, query.session_id)
+    with bypass_llm_cache() if query.bypass_cache else nullcontext():
+        if not (settings.TRACE_LLM_REQUESTS or request.headers.get("x-trace") == "1"):
+            return await service.process_query(query.prompt, query.session_id)
+        with start_trace("llm.execute") as trace:
+            result = await service.process_query(query.prompt, query.session_id)
+    response.headers["X-Trace-Id"] = trace.trace_id
     return result
+
+
+@app.post("/llm/execute/stream")
+async def stream_llm_task(query: LLMQuery, service: BaseLLMService = Depends(get_llm_service)):
+    """
+    `/llm/execute`와 같지만 응답을 Server-Sent Events로 스트리밍합니다.
+
+    - 첫 이벤트(`event: session`)로 `session_id`를 전달합니다.
+    - 이후 생성되는 텍스트 조각을 `{"delta": "..."}` 형태로 전달합니다.
+    - 마지막 이벤트(`event: done`)에 첫 토큰까지의 시간(ttft_ms)과 전체 시간(total_ms)을 포함합니다.
+    """
+    session_id = query.session_id or uuid.uuid4().hex
+
+    def sse(data: dict, event: Optional[str] = None) -> str:
+        prefix = f"event: {event}\n" if event else ""
+        return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def events():
+        started = time.perf_counter()
+        ttft = None
+        yield sse({"session_id": session_id}, event="session")
+        try:
+            async for delta in service.stream_query(query.prompt, session_id):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                yield sse({"delta": delta})
+        except Exception as e:
+            logging.error(f"[llm/stream] 스트리밍 중 오류 발생: {e}")
+            yield sse({"error": str(e)}, event="error")
+            return
+        total = time.perf_counter() - started
+        ttft_ms = round(ttft * 1000, 1) if ttft is not None else None
+        logging.info(f"[llm/stream] session={session_id} ttft_ms={ttft_ms} total_ms={total * 1000:.1f}")
+        yield sse({"ttft_ms": ttft_ms, "total_ms": round(total * 1000, 1)}, event="done")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 # --- Confluence API 관련 모델 ---
 
@@ -14,6 +14,8 @@ class PageUpdate(BaseModel):
     """페이지 업데이트를 위한 모델"""
     title: str = Field(..., description="새로운 페이지 제목")
     content: str = Field(..., description="새로운 페이지 내용 (HTML 또는 Storage 포맷)")
+    version: Optional[int] = Field(None, description="업데이트의 기반이 되는 현재 버전 번호. 지정하면 버전 조회 없이 바로 업데이트합니다.", examples=[7])
+    force: bool = Field(False, description="내용이 현재 버전과 같아도 새 버전을 만듭니다. (WRITE_ELISION_ENABLED일 때의 생략을 무시)")
 
 class PagePublish(BaseModel):
     """LLM이 생성한 초안을 게시하기 위한 모델"""
@@ -21,12 +23,58 @@ class PagePublish(BaseModel):
     title: str = Field(..., description="페이지 제목")
     content: str = Field(..., description="게시할 페이지 내용")
 
+class BatchOperation(BaseModel):
+    """일괄 처리(/pages/batch)의 개별 작업 모델"""
+    op: Literal["create", "update", "delete"] = Field(..., description="작업 종류")
+    ref: Optional[str] = Field(None, description="배치 안에서 이 항목을 가리키는 임시 참조 ID. 뒤따르는 항목의 parent_id/page_id로 사용할 수 있습니다. (숫자가 아닌 값)", examples=["parent-1"])
+    page_id: Optional[str] = Field(None, description="update/delete 대상 페이지 ID")
+    space_key: Optional[str] = Field(None, description="create 시 스페이스 키")
+    title: Optional[str] = Field(None, description="create/update 시 페이지 제목")
+    content: Optional[str] = Field(None, description="create/update 시 페이지 내용")
+    parent_id: Optional[str] = Field(None, description="부모 페이지 ID 또는 같은 배치 안의 앞선 create 항목의 ref (뒤에 정의된 ref는 오류)")
+    version: Optional[int] = Field(None, description="update 시 알고 있는 현재 버전 번호")
+
+class BatchRequest(BaseModel):
+    """여러 페이지 작업을 한 번에 요청하는 모델"""
+    operations: List[BatchOperation]
+
+class BatchItemResult(BaseModel):
+    """일괄 처리 개별 항목의 결과"""
+    index: int = Field(..., description="요청 내 항목 순번 (0부터)")
+    op: Optional[str] = None
+    ref: Optional[str] = None
+    status: Literal["ok", "skipped", "error"] = Field(..., description="skipped: 내용이 같아 업데이트를 생략함")
+    page_id: Optional[str] = None
+    version: Optional[int] = None
+    error: Optional[str] = None
+
+class AttachmentUploadResult(BaseModel):
+    """여러 첨부 파일 업로드 중 파일 하나의 결과"""
+    filename: str
+    status: Literal["ok", "error"]
+    action: Optional[Literal["created", "updated"]] = Field(None, description="updated: 같은 이름의 첨부 파일에 새 버전을 올림")
+    attachment_id: Optional[str] = None
+    version: Optional[int] = None
+    size: Optional[int] = Field(None, description="업로드한 바이트 수")
+    error: Optional[str] = None
+
+class PageChangeEvent(BaseModel):
+    """변경 동기화 작업자가 구독자에게 전달하는 페이지 변경 이벤트"""
+    page_id: str
+    space_key: str
+    title: str
+    change: Literal["created", "updated"] = Field(..., description="로컬 저장소에 처음 들어온 페이지면 created")
+    version: Optional[int] = None
+    previous_version: Optional[int] = None
+    page: Dict[str, Any] = Field(..., description="body.storage, version, space가 포함된 페이지 원본")
+
 # --- LLM 상호작용 관련 모델 ---
 
 class LLMQuery(BaseModel):
     """LLM에 작업을 요청하는 모델"""
     prompt: str = Field(..., description="LLM에게 전달할 자연어 프롬프트", examples=["어제자 QA팀 주간 보고서를 요약해서 초안을 작성해줘."])
     session_id: Optional[str] = Field(None, description="연속적인 대화를 위한 세션 ID")
+    bypass_cache: bool = Field(False, description="LLM 응답 캐시를 사용하지 않고 항상 새로 생성합니다")
 
 class ReportDraft(BaseModel):
     """LLM이 생성한 보고서 초안 모델"""
@@ -35,6 +83,14 @@ class ReportDraft(BaseModel):
     space_key: Optional[str] = None
     parent_id: Optional[str] = None
 
+class ReportRequest(BaseModel):
+    """여러 페이지를 요약한 보고서 초안 생성을 요청하는 모델"""
+    cql: str = Field(..., description="요약할 페이지들을 찾기 위한 CQL 쿼리", examples=['space = "QA" and label = "weekly"'])
+    space_key: str = Field(..., description="보고서 페이지를 생성할 스페이스 키")
+    report_title: str = Field(..., description="생성될 보고서의 제목")
+    summary_prompt: str = Field(..., description="요약의 세부 요구사항", examples=["각 페이지의 핵심 내용을 글머리 기호 목록으로 요약해줘."])
+    parent_id: Optional[str] = Field(None, description="보고서를 게시할 부모 페이지 ID")
+
 class LLMResponse(BaseModel):
     """LLM의 처리 결과를 담는 모델"""
     response_type: str = Field(..., description="응답 유형 (e.g., 'text', 'report_draft')")
@@ -0,0 +1,104 @@
+import os
+import uuid
+import asyncio
+import mimetypes
+from typing import Optional, Dict, Tuple, AsyncIterable, AsyncIterator, Callable
+
+from app.core.config import settings
+
+
+async def read_file_chunks(path: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """파일을 chunk_size 바이트씩 읽어 반환합니다. 읽기는 스레드에서 실행되어 이벤트 루프를 막지 않습니다."""
+    chunk_size = chunk_size or settings.ATTACHMENT_CHUNK_SIZE
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+class AttachmentSource:
+    """
+    업로드할 첨부 파일 하나. 본문은 조각(bytes)을 차례로 내주는 비동기 이터레이터로만 다룹니다.
+
+    - from_path: 로컬 파일. 열 때마다 처음부터 다시 읽으므로 실패 시 재전송할 수 있습니다.
+    - from_stream: 클라이언트 요청 본문처럼 한 번만 읽을 수 있는 스트림. 재전송할 수 없습니다.
+    size를 알면 Content-Length를 붙여 보내고, 모르면 chunked 전송합니다.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        open_chunks: Callable[[], AsyncIterator[bytes]],
+        content_type: Optional[str] = None,
+        size: Optional[int] = None,
+        replayable: bool = True,
+    ):
+        self.filename = filename
+        self.content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        self.size = size
+        self.replayable = replayable
+        self._open_chunks = open_chunks
+        self._opened = False
+
+    @classmethod
+    def from_path(cls, path: str, filename: Optional[str] = None, content_type: Optional[str] = None) -> "AttachmentSource":
+        return cls(filename or os.path.basename(path), lambda: read_file_chunks(path), content_type, os.path.getsize(path))
+
+    @classmethod
+    def from_stream(cls, filename: str, chunks: AsyncIterable[bytes], content_type: Optional[str] = None, size: Optional[int] = None) -> "AttachmentSource":
+        return cls(filename, lambda: chunks.__aiter__(), content_type, size, replayable=False)
+
+    def open(self) -> AsyncIterator[bytes]:
+        if self._opened and not self.replayable:
+            raise RuntimeError(f"Attachment stream '{self.filename}' can only be read once.")
+        self._opened = True
+        return self._open_chunks()
+
+
+def _quote(value: str) -> str:
+    """Content-Disposition의 따옴표 안에 넣을 수 있도록 바꿉니다. (브라우저의 multipart/form-data 인코딩과 같은 방식)"""
+    return value.replace("\r", "%0D").replace("\n", "%0A").replace('"', "%22")
+
+
+def multipart_body(source: AttachmentSource, fields: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, str], Callable[[], AsyncIterator[bytes]]]:
+    """
+    `file` 파트 하나와 텍스트 필드로 된 multipart/form-data 본문을 만듭니다.
+
+    요청 헤더와, 호출할 때마다 본문을 처음부터 조각 단위로 내주는 함수를 반환합니다.
+    파일 내용은 source에서 받은 조각을 그대로 흘려보내며 메모리에 모으지 않습니다.
+    source.size를 알면 전체 길이를 미리 계산하여 Content-Length를 지정합니다.
+    """
+    boundary = uuid.uuid4().hex
+    head = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{_quote(name)}"\r\n\r\n{value}\r\n'.encode("utf-8")
+        for name, value in (fields or {}).items()
+    )
+    head += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{_quote(source.filename)}"\r\n'
+        f"Content-Type: {source.content_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    if source.size is not None:
+        headers["Content-Length"] = str(len(head) + source.size + len(tail))
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield head
+        stream = source.open()
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            # 업로드가 중간에 실패해도 파일 핸들 등을 바로 정리합니다.
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        yield tail
+
+    return headers, chunks
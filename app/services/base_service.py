@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+import httpx
 
 from app.models.confluence_models import PageCreate, PageUpdate
+from .attachment_stream import AttachmentSource
 
 class BaseConfluenceService(ABC):
     """Confluence 서비스의 기본 인터페이스를 정의하는 추상 클래스."""
@@ -26,6 +29,36 @@ class BaseConfluenceService(ABC):
     async def search_pages(self, cql: str, expand: Optional[str] = None) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def search_pages_iter(self, cql: str, expand: Optional[str] = None, max_results: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_children_iter(self, page_id: str, expand: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_space_root_pages_iter(self, space_key: str, expand: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_attachments_iter(self, page_id: str, filename: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def download_attachment(self, page_id: str, attachment_id: str) -> httpx.Response:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upload_attachment(self, page_id: str, source: AttachmentSource, comment: Optional[str] = None, minor_edit: bool = True) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_attachment(
+        self, page_id: str, attachment_id: str, source: AttachmentSource, comment: Optional[str] = None, minor_edit: bool = True
+    ) -> Dict[str, Any]:
+        raise NotImplementedError
+
 
 class BaseLLMService(ABC):
     """LLM 서비스의 기본 인터페이스를 정의하는 추상 클래스."""
@@ -37,3 +70,35 @@ class BaseLLMService(ABC):
         세션 ID를 사용하여 대화의 연속성을 관리할 수 있습니다.
         """
         raise NotImplementedError
+
+    @abstractmethod
+    def stream_query(self, prompt: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        process_query와 같지만 응답 텍스트를 생성되는 대로 조각(chunk) 단위로 반환합니다.
+        스트림이 끝나면 전체 응답이 세션 기록에 저장됩니다.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        대화 기록 없이 단일 프롬프트에 대한 텍스트 응답을 반환합니다.
+        (일괄 처리나 요약처럼 세션이 필요 없는 내부 호출용)
+        """
+        raise NotImplementedError
+
+    @property
+    def model_name(self) -> str:
+        """응답을 생성하는 모델 이름. (캐시 키, 지표 레이블용)"""
+        return type(self).__name__
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트 목록의 임베딩 벡터를 반환합니다. (로컬 검색 인덱스의 의미 검색용)
+        임베딩을 지원하는 구현체만 재정의합니다.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support embeddings")
+
+    async def shutdown(self) -> None:
+        """서비스가 보유한 클라이언트 등 리소스를 정리합니다. 필요한 구현체만 재정의합니다."""
+        return None
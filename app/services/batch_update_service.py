@@ -0,0 +1,255 @@
+import re
+import json
+import time
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any, Set
+
+from app.core.config import settings
+from app.models.confluence_models import PageUpdate
+from .base_service import BaseConfluenceService, BaseLLMService
+from .storage_format import storage_to_markdown, markdown_to_storage
+from .content_hash import content_hash
+
+MARKDOWN_INSTRUCTION = (
+    "기존 내용은 Markdown으로 변환되어 있습니다. 수정한 본문 전체를 같은 형식의 Markdown으로만 반환하세요. "
+    "{{macro:번호:이름}} 형태의 자리표시자는 Confluence 매크로나 서식이므로 그대로 유지하세요. "
+    "{{macro:번호:이름}}와 {{/macro:번호}} 한 쌍은 레이아웃이나 접기/패널 영역의 시작과 끝이므로 각각 한 줄에 그대로 두고 그 사이의 내용만 수정하세요."
+)
+_OUTER_FENCE = re.compile(r"^```(?:markdown|md)?\s*\n(.*)\n```\s*$", re.DOTALL)
+
+
+class StageStats:
+    """파이프라인 단계별 처리 시간을 기록합니다."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.durations: List[float] = []
+        self.errors = 0
+
+    def record(self, seconds: float) -> None:
+        self.durations.append(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        values = sorted(self.durations)
+        if not values:
+            return {"stage": self.name, "count": 0, "errors": self.errors}
+
+        def pct(p: float) -> float:
+            return values[min(len(values) - 1, int(len(values) * p))]
+
+        return {
+            "stage": self.name,
+            "count": len(values),
+            "errors": self.errors,
+            "avg_ms": round(sum(values) / len(values) * 1000, 1),
+            "p50_ms": round(pct(0.50) * 1000, 1),
+            "p95_ms": round(pct(0.95) * 1000, 1),
+            "max_ms": round(values[-1] * 1000, 1),
+        }
+
+
+class Checkpoint:
+    """
+    처리 완료된 페이지를 JSONL 파일에 append 방식으로 기록합니다.
+    재실행 시 'updated'/'unchanged'로 기록된 페이지는 건너뛰고, 실패했거나 LLM 응답이 비어 건너뛴('skipped') 페이지는 다시 시도합니다.
+    """
+
+    DONE_STATUSES = {"updated", "unchanged"}
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Set[str] = set()
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        entry = json.loads(line)
+                        if entry.get("status") in self.DONE_STATUSES:
+                            self.done.add(entry["page_id"])
+                        else:
+                            self.done.discard(entry["page_id"])
+            except FileNotFoundError:
+                pass
+
+    def record(self, page_id: str, status: str) -> None:
+        if status in self.DONE_STATUSES:
+            self.done.add(page_id)
+        if not self.path:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"page_id": page_id, "status": status, "ts": time.time()}) + "\n")
+
+
+class BatchUpdateService:
+    """
+    CQL로 찾은 페이지들을 LLM으로 일괄 갱신하는 파이프라인.
+
+    조회(fetch) → LLM 생성(generate) → 업데이트(update) 단계를 큐로 연결하여 서로 겹쳐 실행합니다.
+    Confluence 호출(fetch/update)과 LLM 호출은 각각 별도의 동시성 한도를 가집니다.
+    WRITE_ELISION_ENABLED이면 LLM 결과가 기존 본문과 같은(정규화 후 해시 비교) 페이지는 'unchanged'로 처리하고 쓰지 않습니다.
+    dry_run이면 쓰지 않고 바뀔 페이지를 'would_update'로 셉니다.
+    """
+
+    def __init__(
+        self,
+        confluence_service: BaseConfluenceService,
+        llm_service: BaseLLMService,
+        confluence_concurrency: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        dry_run: bool = False,
+    ):
+        self.confluence = confluence_service
+        self.llm = llm_service
+        self.confluence_concurrency = confluence_concurrency or settings.BATCH_CONFLUENCE_CONCURRENCY
+        self.llm_concurrency = llm_concurrency or settings.BATCH_LLM_CONCURRENCY
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.dry_run = dry_run
+
+        self._confluence_semaphore = asyncio.Semaphore(self.confluence_concurrency)
+        self.stats = {name: StageStats(name) for name in ("fetch", "generate", "update")}
+        self.counts = {"found": 0, "resumed": 0, "updated": 0, "would_update": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+
+    def _finish(self, page_id: Optional[str], status: str) -> None:
+        self.counts[status] += 1
+        if not self.dry_run and page_id is not None:
+            self.checkpoint.record(page_id, status)
+
+    async def _fetch_worker(self, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        while True:
+            page_summary = await inbox.get()
+            page_id = None
+            try:
+                # 입력이 잘못되어도 task_done()이 호출되도록 try 안에서 꺼냅니다. (queue.join()이 멈추지 않도록)
+                page_id = page_summary['id']
+                async with self._confluence_semaphore:
+                    started = time.perf_counter()
+                    page = await self.confluence.get_page(page_id, expand="body.storage,version")
+                    self.stats["fetch"].record(time.perf_counter() - started)
+                await outbox.put(page)
+            except Exception as e:
+                self.stats["fetch"].errors += 1
+                logging.error(f"[BatchUpdateService] 페이지 조회 실패 (ID: {page_id}): {e}")
+                self._finish(page_id, "failed")
+            finally:
+                inbox.task_done()
+
+    async def _generate_worker(self, prompt: str, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        while True:
+            page = await inbox.get()
+            page_id = None
+            try:
+                page_id = page['id']
+                current_content = page['body']['storage']['value']
+                # 원본을 그대로 다시 쓰는 경로이므로 본문을 토큰 예산으로 자르지 않습니다.
+                macros: Optional[Dict[str, str]] = None
+                if settings.LLM_BODY_FORMAT == "markdown":
+                    macros = {}
+                    current_content = storage_to_markdown(current_content, macros)
+                    full_prompt = f"{prompt}\n\n{MARKDOWN_INSTRUCTION}\n\n---\n\n기존 내용:\n{current_content}"
+                else:
+                    full_prompt = f"{prompt}\n\n---\n\n기존 내용:\n{current_content}"
+                started = time.perf_counter()
+                new_content = await self.llm.complete(full_prompt)
+                self.stats["generate"].record(time.perf_counter() - started)
+                if new_content and macros is not None:
+                    fenced = _OUTER_FENCE.match(new_content.strip())
+                    markdown = fenced.group(1) if fenced else new_content
+                    # 변경하지 않은 응답은 원본을 그대로 두어 서식 손실 없이 '변경 없음'으로 처리되도록 합니다.
+                    if markdown.split() == current_content.split():
+                        new_content = page['body']['storage']['value']
+                    else:
+                        new_content = markdown_to_storage(markdown, macros)
+                if not new_content:
+                    logging.warning(f"[BatchUpdateService] LLM 응답이 비어 있어 건너뜁니다 (ID: {page_id})")
+                    self._finish(page_id, "skipped")
+                    continue
+                await outbox.put((page, new_content))
+            except Exception as e:
+                self.stats["generate"].errors += 1
+                logging.error(f"[BatchUpdateService] LLM 생성 실패 (ID: {page_id}): {e}")
+                self._finish(page_id, "failed")
+            finally:
+                inbox.task_done()
+
+    async def _update_worker(self, inbox: asyncio.Queue) -> None:
+        while True:
+            page, new_content = await inbox.get()
+            page_id = None
+            try:
+                page_id = page['id']
+                if settings.WRITE_ELISION_ENABLED and content_hash(page['title'], page['body']['storage']['value']) == content_hash(page['title'], new_content):
+                    self._finish(page_id, "unchanged")
+                    logging.info(f"[BatchUpdateService] '{page['title']}' (ID: {page_id}) 변경 없음, 건너뜀")
+                    continue
+                if self.dry_run:
+                    logging.info(f"[BatchUpdateService] [dry-run] '{page['title']}' (ID: {page_id}) 업데이트 예정 ({len(new_content)}자)")
+                    self._finish(page_id, "would_update")
+                    continue
+                update_data = PageUpdate(title=page['title'], content=new_content, version=page['version']['number'])
+                async with self._confluence_semaphore:
+                    started = time.perf_counter()
+                    result = await self.confluence.update_page(page_id, update_data)
+                    self.stats["update"].record(time.perf_counter() - started)
+                if result.get("status") == "skipped":
+                    self._finish(page_id, "unchanged")
+                    logging.info(f"[BatchUpdateService] '{page['title']}' (ID: {page_id}) 변경 없음, 건너뜀")
+                    continue
+                self._finish(page_id, "updated")
+                logging.info(f"[BatchUpdateService] '{page['title']}' (ID: {page_id}) 업데이트 완료")
+            except Exception as e:
+                self.stats["update"].errors += 1
+                logging.error(f"[BatchUpdateService] 페이지 업데이트 실패 (ID: {page_id}): {e}")
+                self._finish(page_id, "failed")
+            finally:
+                inbox.task_done()
+
+    async def run(self, cql: str, prompt: str) -> Dict[str, Any]:
+        """파이프라인을 실행하고 처리량 및 단계별 지연 시간 요약을 반환합니다."""
+        # 큐 크기를 제한하여 앞 단계가 너무 앞서 나가 메모리를 점유하지 않도록 합니다.
+        fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=self.confluence_concurrency * 2)
+        generate_queue: asyncio.Queue = asyncio.Queue(maxsize=self.llm_concurrency * 2)
+        update_queue: asyncio.Queue = asyncio.Queue(maxsize=self.confluence_concurrency * 2)
+
+        stages = [
+            (fetch_queue, [self._fetch_worker(fetch_queue, generate_queue) for _ in range(self.confluence_concurrency)]),
+            (generate_queue, [self._generate_worker(prompt, generate_queue, update_queue) for _ in range(self.llm_concurrency)]),
+            (update_queue, [self._update_worker(update_queue) for _ in range(self.confluence_concurrency)]),
+        ]
+        workers = [[asyncio.create_task(w) for w in coros] for _, coros in stages]
+
+        started = time.perf_counter()
+        try:
+            async for page_summary in self.confluence.search_pages_iter(cql):
+                self.counts["found"] += 1
+                if page_summary.get('id') in self.checkpoint.done:
+                    self.counts["resumed"] += 1
+                    continue
+                await fetch_queue.put(page_summary)
+
+            # 앞 단계부터 차례로 비워지기를 기다린 뒤 워커를 정리합니다.
+            for (queue, _), tasks in zip(stages, workers):
+                await queue.join()
+                for task in tasks:
+                    task.cancel()
+        finally:
+            all_tasks = [task for tasks in workers for task in tasks]
+            for task in all_tasks:
+                task.cancel()
+            await asyncio.gather(*all_tasks, return_exceptions=True)
+
+        elapsed = time.perf_counter() - started
+        processed = sum(self.counts[status] for status in ("updated", "would_update", "unchanged", "skipped", "failed"))
+        return {
+            "dry_run": self.dry_run,
+            "elapsed_s": round(elapsed, 2),
+            "pages_per_s": round(processed / elapsed, 2) if elapsed else 0.0,
+            "counts": dict(self.counts),
+            # LLM 결과가 기존 내용과 같아 Confluence에 쓰지 않은 비율
+            "unchanged_rate": round(self.counts["unchanged"] / processed, 3) if processed else None,
+            "stages": [stats.summary() for stats in self.stats.values()],
+        }
@@ -1,10 +1,27 @@
+import time
 import httpx
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Iterator
 
 from app.core.config import settings
-from app.models.confluence_models import PageCreate, PageUpdate
+from app.core.metrics import CONFLUENCE_LATENCY, CONFLUENCE_ERRORS, confluence_endpoint
+from app.core.tracing import span
+from app.models.confluence_models import PageCreate, PageUpdate, PageChangeEvent, AttachmentUploadResult
 from .base_service import BaseConfluenceService
+from .page_cache import BasePageCache, create_page_cache, make_cache_key
+from .single_flight import SingleFlight
+from .content_hash import ContentHashStore, get_content_hash_store, content_hash
+from .attachment_stream import AttachmentSource, multipart_body
+from .rate_limiter import AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError, parse_retry_after, backoff_delay
+
+# 5xx/연결 오류 시 그대로 다시 보내도 안전한 HTTP 메서드.
+# PUT(update_page)은 버전 번호를 올리므로, 실제로는 성공했지만 응답을 받지 못한 요청을 다시 보내면
+# 409가 되고 충돌 처리 경로에서 내용을 한 번 더 쓰게 됩니다. 그래서 재시도하지 않고 오류를 호출자에게 넘깁니다.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "DELETE"}
+# 일시적인 서버 오류로 보고 재시도하는 상태 코드
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
 
 class ConfluenceService(BaseConfluenceService):
     def _log_error(self, msg: str, exc: Exception):
@@ -20,32 +37,272 @@ class ConfluenceService(BaseConfluenceService):
             "Content-Type": "application/json",
             "X-Atlassian-Token": "no-check" # For PUT/POST requests
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        self.page_cache: Optional[BasePageCache] = create_page_cache()
+        self.write_stats = {"updates": 0, "version_fetch_skipped": 0, "version_fetches": 0, "conflict_retries": 0, "skipped_unchanged": 0}
+        # 내용이 바뀌지 않은 update_page의 PUT을 생략하기 위한 페이지별 내용 해시 (첫 쓰기 때 엽니다)
+        self._content_hashes: Optional[ContentHashStore] = None
+        self.rate_limiter: Optional[AdaptiveRateLimiter] = None
+        if settings.CONFLUENCE_RATE_LIMIT > 0:
+            self.rate_limiter = AdaptiveRateLimiter(
+                settings.CONFLUENCE_RATE_LIMIT, settings.CONFLUENCE_RATE_BURST,
+                settings.CONFLUENCE_RATE_LIMIT_MIN, settings.CONFLUENCE_RATE_LIMIT_MAX,
+            )
+        self.circuit_breaker = CircuitBreaker(settings.CONFLUENCE_CIRCUIT_FAILURE_THRESHOLD, settings.CONFLUENCE_CIRCUIT_RESET_TIMEOUT)
+        self.retry_stats = {"retries": 0, "throttled": 0, "server_errors": 0, "transport_errors": 0}
+        # 동일한 GET 요청이 동시에 들어오면 하나의 호출을 공유합니다. (coalesced = 절약된 호출 수)
+        self.single_flight = SingleFlight()
+        # 캐시를 채우는 중인 페이지별 조회 수와 세대. 조회 중에 쓰기가 있으면 세대가 바뀌어 그 결과를 캐시하지 않습니다.
+        self._page_reads: Dict[str, Dict[str, int]] = {}
 
-    async def _request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+    @property
+    def content_hashes(self) -> Optional[ContentHashStore]:
+        """
+        WRITE_ELISION_ENABLED이면 내용 해시 저장소를 반환합니다.
+        모듈을 import하거나 페이지를 읽기만 해서는 SQLite 파일을 만들지 않도록 처음 사용할 때 엽니다.
+        """
+        if self._content_hashes is None and settings.WRITE_ELISION_ENABLED:
+            self._content_hashes = get_content_hash_store()
+        return self._content_hashes
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """설정값으로 커넥션 풀과 keep-alive가 적용된 공유 클라이언트를 생성합니다."""
+        http2 = settings.CONFLUENCE_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logging.warning("[ConfluenceService] 'h2' 패키지가 없어 HTTP/1.1로 동작합니다.")
+                http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.CONFLUENCE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CONFLUENCE_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.CONFLUENCE_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(settings.CONFLUENCE_TIMEOUT, connect=settings.CONFLUENCE_CONNECT_TIMEOUT)
+        return httpx.AsyncClient(auth=self.auth, headers=self.headers, limits=limits, timeout=timeout, http2=http2)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        공유 HTTP 클라이언트를 반환합니다.
+        FastAPI lifespan 밖(예: scripts/)에서 사용될 경우 첫 호출 시 생성됩니다.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """요청 제한기, 회로 차단기, 재시도 상태를 반환합니다."""
+        return {
+            "rate_limiter": self.rate_limiter.stats() if self.rate_limiter else None,
+            "circuit_breaker": self.circuit_breaker.stats(),
+            "retries": self.retry_stats,
+            "single_flight": self.single_flight.stats(),
+        }
+
+    async def startup(self) -> None:
+        """앱 시작 시 공유 HTTP 클라이언트를 미리 생성합니다."""
+        _ = self.client
+
+    async def shutdown(self) -> None:
+        """공유 HTTP 클라이언트를 닫고 커넥션 풀을 정리합니다."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        stream: bool = False,
+        body: Optional[Callable[[], AsyncIterator[bytes]]] = None,
+        replayable: bool = True,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        회로 차단기와 공유 토큰 버킷을 거쳐 요청을 보내고, 실패 시 재시도합니다.
+
+        - 429(및 Retry-After가 있는 503)는 제한기에 알려 전체 호출 속도를 낮추고, 메서드와 무관하게 재시도합니다.
+        - 5xx와 연결 오류는 IDEMPOTENT_METHODS(PUT 제외)에 한해 jitter가 적용된 지수 백오프로 재시도합니다.
+        - `body`는 시도마다 요청 본문 조각을 처음부터 내주는 함수입니다. `replayable=False`이면 본문을 다시 보낼 수 없으므로
+          재시도하지 않습니다.
+        - `stream=True`이면 응답 본문을 읽지 않고 반환합니다. 호출자가 읽은 뒤 `aclose()`해야 합니다.
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS and replayable
+        endpoint = confluence_endpoint(httpx.URL(url).path)
+        follow_redirects = kwargs.pop("follow_redirects", False)
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+
+            delay = backoff_delay(attempt, settings.CONFLUENCE_BACKOFF_BASE, settings.CONFLUENCE_BACKOFF_MAX)
+            if body is not None:
+                kwargs["content"] = body()
+            started = time.perf_counter()
+            try:
+                request = self.client.build_request(method, url, **kwargs)
+                response = await self.client.send(request, stream=stream, follow_redirects=follow_redirects)
+            except httpx.TransportError as e:
+                CONFLUENCE_LATENCY.observe(time.perf_counter() - started, method=method, endpoint=endpoint, status="error")
+                CONFLUENCE_ERRORS.inc(method=method, endpoint=endpoint, error=type(e).__name__)
+                self.retry_stats["transport_errors"] += 1
+                self.circuit_breaker.record_failure()
+                if not idempotent or attempt >= settings.CONFLUENCE_MAX_RETRIES:
+                    raise
+            else:
+                CONFLUENCE_LATENCY.observe(time.perf_counter() - started, method=method, endpoint=endpoint, status=response.status_code)
+                if response.status_code >= 400:
+                    CONFLUENCE_ERRORS.inc(method=method, endpoint=endpoint, error=f"http_{response.status_code}")
+                    if stream:
+                        # 오류 응답의 본문은 쓰지 않으므로 연결을 바로 풀에 돌려줍니다.
+                        await response.aclose()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                throttled = response.status_code == 429 or (response.status_code == 503 and retry_after is not None)
+                if throttled:
+                    # 서버는 정상 응답 중이므로 회로 차단기 관점에서는 실패로 보지 않습니다.
+                    self.retry_stats["throttled"] += 1
+                    self.circuit_breaker.record_success()
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.on_throttle(retry_after)
+                    if not replayable or attempt >= settings.CONFLUENCE_MAX_RETRIES:
+                        response.raise_for_status()
+                    delay = max(delay, retry_after or 0.0)
+                elif response.status_code in RETRYABLE_STATUS_CODES:
+                    self.retry_stats["server_errors"] += 1
+                    self.circuit_breaker.record_failure()
+                    if not idempotent or attempt >= settings.CONFLUENCE_MAX_RETRIES:
+                        response.raise_for_status()
+                else:
+                    self.circuit_breaker.record_success()
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.on_success()
+                    response.raise_for_status()
+                    return response
+
+            attempt += 1
+            self.retry_stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    @contextmanager
+    def _logged(self, method: str, url: str) -> Iterator[None]:
+        """요청 실패를 종류별로 로그에 남기고 다시 발생시킵니다."""
+        endpoint = confluence_endpoint(httpx.URL(url).path)
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.request(method, url, auth=self.auth, headers=self.headers, **kwargs)
-                response.raise_for_status()
-                if response.status_code == 204:
-                    return {}
-                return response.json()
+            yield
         except httpx.HTTPStatusError as e:
             self._log_error(f"HTTP error {e.response.status_code} for {method} {url}", e)
             raise
         except httpx.RequestError as e:
             self._log_error(f"Request error for {method} {url}", e)
             raise
+        except CircuitOpenError as e:
+            CONFLUENCE_ERRORS.inc(method=method, endpoint=endpoint, error=type(e).__name__)
+            self._log_error(f"Circuit open, rejected {method} {url}", e)
+            raise
         except Exception as e:
             self._log_error(f"Unexpected error for {method} {url}", e)
             raise
 
-    async def get_page(self, page_id: str, expand: Optional[str] = None) -> Dict[str, Any]:
-        """ID로 특정 Confluence 페이지의 정보를 비동기적으로 조회합니다."""
+    async def _request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """
+        공유 클라이언트로 요청을 보냅니다.
+        `timeout` 키워드로 요청별 타임아웃을 재정의할 수 있습니다.
+        """
+        with self._logged(method, url):
+            with span("confluence", method=method, endpoint=confluence_endpoint(httpx.URL(url).path)):
+                response = await self._send(method, url, **kwargs)
+            if response.status_code == 204:
+                return {}
+            return response.json()
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET 요청을 보냅니다. 같은 URL과 파라미터의 요청이 진행 중이면 그 결과를 함께 기다립니다."""
+        key = (url, tuple(sorted((params or {}).items())))
+        return await self.single_flight.do(key, lambda: self._request("GET", url, params=params))
+
+    async def _fetch_page(self, page_id: str, expand: Optional[str] = None) -> Dict[str, Any]:
+        """캐시를 거치지 않고 Confluence에서 페이지를 직접 조회합니다."""
         url = f"{self.base_url}/content/{page_id}"
         params = {}
         if expand:
             params['expand'] = expand
-        return await self._request("GET", url, params=params)
+        return await self._get(url, params)
+
+    async def get_page(self, page_id: str, expand: Optional[str] = None) -> Dict[str, Any]:
+        """
+        ID로 특정 Confluence 페이지의 정보를 비동기적으로 조회합니다.
+
+        페이지 캐시가 켜져 있으면 TTL 안의 항목은 그대로 반환하고,
+        TTL이 지난 항목은 `version.number`만 조회하여 변경이 없으면 재사용합니다.
+        """
+        if self.page_cache is None:
+            page = await self._fetch_page(page_id, expand)
+            await self._remember_content(page)
+            return page
+
+        key = make_cache_key(page_id, expand)
+        entry = await self.page_cache.get(key)
+        if entry is not None:
+            if entry.is_fresh(self.page_cache.ttl):
+                self.page_cache.counters["hits"] += 1
+                return entry.load()
+            if entry.version is not None:
+                latest = await self._fetch_page(page_id, expand="version")
+                if latest.get("version", {}).get("number") == entry.version:
+                    self.page_cache.counters["hits"] += 1
+                    self.page_cache.counters["revalidated"] += 1
+                    await self.page_cache.touch(key)
+                    return entry.load()
+
+        self.page_cache.counters["misses"] += 1
+        # 재검증에 사용할 수 있도록 항상 버전 정보를 함께 받아 둡니다.
+        fields = [f for f in (expand or "").split(",") if f]
+        if "version" not in fields:
+            fields.append("version")
+        reads = self._page_reads.setdefault(page_id, {"count": 0, "generation": 0})
+        reads["count"] += 1
+        generation = reads["generation"]
+        try:
+            page = await self._fetch_page(page_id, ",".join(fields))
+        finally:
+            reads["count"] -= 1
+            if not reads["count"]:
+                self._page_reads.pop(page_id, None)
+        if reads["generation"] == generation:
+            await self.page_cache.set(key, page_id, page)
+        await self._remember_content(page)
+        return page
+
+    async def _remember_content(self, page: Dict[str, Any]) -> None:
+        """
+        조회한 본문의 해시를 기록해 두어, 같은 내용으로 update_page를 호출하면 PUT을 생략할 수 있도록 합니다.
+        읽기 경로에서는 저장소가 이미 열려 있을 때(이 프로세스가 쓴 적이 있을 때)만, 버전이 바뀐 경우에만 기록합니다.
+        """
+        if self._content_hashes is not None:
+            await self._content_hashes.remember(page)
+
+    async def _invalidate_page(self, page_id: Optional[str]) -> None:
+        """
+        페이지가 바뀌었을 때 캐시 항목을 지우고, 바뀌기 전에 시작된 조회를 이후의 조회가 공유하거나 캐시에 쓰지 않도록 합니다.
+        """
+        if not page_id:
+            return
+        prefix = f"{self.base_url}/content/{page_id}"
+        self.single_flight.forget(lambda key: key[0] == prefix or key[0].startswith(prefix + "/"))
+        if page_id in self._page_reads:
+            self._page_reads[page_id]["generation"] += 1
+        if self.page_cache is not None:
+            await self.page_cache.invalidate_page(page_id)
+
+    async def on_page_changes(self, events: List[PageChangeEvent]) -> None:
+        """변경 동기화 작업자의 구독자: 다른 곳에서 수정된 페이지의 캐시 항목을 제거합니다."""
+        for event in events:
+            await self._invalidate_page(event.page_id)
+            await self._remember_content(event.page)
 
     async def create_page(self, page_data: PageCreate) -> Dict[str, Any]:
         """새로운 Confluence 페이지를 비동기적으로 생성합니다."""
@@ -64,17 +321,52 @@ class ConfluenceService(BaseConfluenceService):
         if page_data.parent_id:
             json_data["ancestors"] = [{"id": page_data.parent_id}]
         
-        return await self._request("POST", url, json=json_data)
+        created = await self._request("POST", url, json=json_data)
+        # 부모 페이지의 children 등 캐시된 확장 정보가 바뀌었을 수 있습니다.
+        await self._invalidate_page(page_data.parent_id)
+        await self._invalidate_page(created.get("id"))
+        if self.content_hashes is not None:
+            await self.content_hashes.remember(created)
+        return created
+
+    async def _current_version(self, page_id: str) -> int:
+        self.write_stats["version_fetches"] += 1
+        current_page = await self._fetch_page(page_id, expand="version")
+        return current_page['version']['number']
 
     async def update_page(self, page_id: str, page_data: PageUpdate) -> Dict[str, Any]:
-        """ID로 특정 Confluence 페이지를 비동기적으로 업데이트합니다."""
-        # 최신 버전 정보를 얻기 위해 먼저 페이지 정보를 조회합니다.
-        current_page = await self.get_page(page_id, expand="version")
-        current_version = current_page['version']['number']
+        """
+        ID로 특정 Confluence 페이지를 비동기적으로 업데이트합니다.
+
+        `page_data.version`이 주어지면 버전 조회 없이 바로 PUT합니다.
+        409 Conflict가 발생하면 최신 버전을 다시 조회하여 제한된 횟수만큼 재시도합니다.
+        WRITE_ELISION_ENABLED이면 제목과 정규화한 본문의 해시가 현재 버전에 기록된 해시와 같을 때
+        PUT하지 않고 `"status": "skipped"`와 현재 버전을 반환합니다. (`page_data.force`로 무시)
+        `page_data.version`이 주어진 경우에는 서버의 현재 버전도 같은지 확인한 뒤에만 생략합니다.
+        """
+        self.write_stats["updates"] += 1
+        if page_data.version is not None:
+            current_version = page_data.version
+            self.write_stats["version_fetch_skipped"] += 1
+        else:
+            # 최신 버전 정보를 얻기 위해 먼저 페이지 정보를 조회합니다.
+            current_version = await self._current_version(page_id)
+
+        digest = None
+        if self.content_hashes is not None:
+            digest = content_hash(page_data.title, page_data.content)
+            unchanged = not page_data.force and (await self.content_hashes.is_unchanged(page_id, current_version, digest))[0]
+            if unchanged and page_data.version is not None:
+                # 호출자가 준 버전은 그 사이 다른 곳에서 수정되어 오래되었을 수 있으므로, 서버의 현재 버전이 같을 때만 생략합니다.
+                current_version = await self._current_version(page_id)
+                unchanged = current_version == page_data.version
+            if unchanged:
+                self.content_hashes.counters["skipped"] += 1
+                self.write_stats["skipped_unchanged"] += 1
+                return {"id": page_id, "title": page_data.title, "version": {"number": current_version}, "status": "skipped"}
 
         url = f"{self.base_url}/content/{page_id}"
         json_data = {
-            "version": {"number": current_version + 1},
             "title": page_data.title,
             "type": "page",
             "body": {
@@ -84,12 +376,36 @@ class ConfluenceService(BaseConfluenceService):
                 }
             }
         }
-        return await self._request("PUT", url, json=json_data)
+        try:
+            attempt = 0
+            while True:
+                json_data["version"] = {"number": current_version + 1}
+                try:
+                    updated = await self._request("PUT", url, json=json_data)
+                    break
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code != 409 or attempt >= settings.UPDATE_CONFLICT_RETRIES:
+                        raise
+                    attempt += 1
+                    self.write_stats["conflict_retries"] += 1
+                    current_version = await self._current_version(page_id)
+        finally:
+            await self._invalidate_page(page_id)
+
+        if self.content_hashes is not None:
+            self.content_hashes.counters["written"] += 1
+            await self.content_hashes.set(page_id, updated.get("version", {}).get("number", current_version + 1), digest)
+        return updated
 
     async def delete_page(self, page_id: str) -> None:
         """ID로 특정 Confluence 페이지를 비동기적으로 삭제합니다."""
         url = f"{self.base_url}/content/{page_id}"
-        await self._request("DELETE", url)
+        try:
+            await self._request("DELETE", url)
+        finally:
+            await self._invalidate_page(page_id)
+        if self._content_hashes is not None:
+            await self._content_hashes.delete(page_id)
 
     async def search_pages(self, cql: str, expand: Optional[str] = None) -> Dict[str, Any]:
         """CQL을 사용하여 페이지를 비동기적으로 검색합니다."""
@@ -97,7 +413,143 @@ class ConfluenceService(BaseConfluenceService):
         params = {"cql": cql}
         if expand:
             params['expand'] = expand
-        return await self._request("GET", url, params=params)
+        return await self._get(url, params)
+
+    def search_pages_iter(self, cql: str, expand: Optional[str] = None, max_results: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """CQL 검색 결과를 페이지네이션을 따라가며 하나씩 비동기적으로 반환합니다."""
+        params: Dict[str, Any] = {"cql": cql}
+        if expand:
+            params['expand'] = expand
+        return self._paginate(f"{self.base_url}/content/search", params, max_results)
+
+    def get_children_iter(self, page_id: str, expand: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """페이지의 직속 자식 페이지(`/content/{id}/child/page`)를 페이지네이션을 따라가며 반환합니다."""
+        params: Dict[str, Any] = {}
+        if expand:
+            params['expand'] = expand
+        return self._paginate(f"{self.base_url}/content/{page_id}/child/page", params)
+
+    def get_space_root_pages_iter(self, space_key: str, expand: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """스페이스의 최상위 페이지(`/space/{key}/content/page?depth=root`)를 반환합니다."""
+        params: Dict[str, Any] = {"depth": "root"}
+        if expand:
+            params['expand'] = expand
+        return self._paginate(f"{self.base_url}/space/{space_key}/content/page", params)
+
+    def get_attachments_iter(self, page_id: str, filename: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """페이지의 첨부 파일(`/content/{id}/child/attachment`)을 버전 정보와 함께 반환합니다."""
+        params: Dict[str, Any] = {"expand": "version"}
+        if filename:
+            params["filename"] = filename
+        return self._paginate(f"{self.base_url}/content/{page_id}/child/attachment", params)
+
+    async def download_attachment(self, page_id: str, attachment_id: str) -> httpx.Response:
+        """
+        첨부 파일 다운로드 응답을 본문을 읽지 않은 상태로 반환합니다. (미디어 서버로의 리다이렉트를 따라갑니다)
+        호출자는 `aiter_raw()`/`aiter_bytes()`로 조각 단위로 읽은 뒤 반드시 `aclose()`해야 합니다.
+        """
+        url = f"{self.base_url}/content/{page_id}/child/attachment/{attachment_id}/download"
+        with self._logged("GET", url):
+            with span("confluence", method="GET", endpoint=confluence_endpoint(httpx.URL(url).path)):
+                return await self._send("GET", url, stream=True, follow_redirects=True, headers={"Accept": "*/*"})
+
+    async def _post_attachment(self, url: str, source: AttachmentSource, comment: Optional[str], minor_edit: bool) -> Dict[str, Any]:
+        fields = {"minorEdit": "true" if minor_edit else "false"}
+        if comment:
+            fields["comment"] = comment
+        headers, body = multipart_body(source, fields)
+        return await self._request("POST", url, body=body, replayable=source.replayable, headers=headers)
+
+    async def upload_attachment(self, page_id: str, source: AttachmentSource, comment: Optional[str] = None, minor_edit: bool = True) -> Dict[str, Any]:
+        """
+        페이지에 새 첨부 파일을 올립니다. 같은 이름의 첨부 파일이 있으면 Confluence가 400으로 거절합니다.
+        파일 내용은 source에서 조각 단위로 읽어 multipart 본문으로 바로 흘려보냅니다.
+        """
+        created = await self._post_attachment(f"{self.base_url}/content/{page_id}/child/attachment", source, comment, minor_edit)
+        await self._invalidate_page(page_id)
+        return created.get("results", [created])[0]
+
+    async def update_attachment(
+        self, page_id: str, attachment_id: str, source: AttachmentSource, comment: Optional[str] = None, minor_edit: bool = True
+    ) -> Dict[str, Any]:
+        """기존 첨부 파일의 내용을 새 버전으로 올립니다."""
+        url = f"{self.base_url}/content/{page_id}/child/attachment/{attachment_id}/data"
+        updated = await self._post_attachment(url, source, comment, minor_edit)
+        await self._invalidate_page(page_id)
+        return updated
+
+    async def upload_attachments(
+        self,
+        page_id: str,
+        sources: List[AttachmentSource],
+        comment: Optional[str] = None,
+        replace: bool = False,
+        concurrency: Optional[int] = None,
+    ) -> List[AttachmentUploadResult]:
+        """
+        여러 파일을 ATTACHMENT_UPLOAD_CONCURRENCY개씩 동시에 올리고 입력 순서대로 파일별 결과를 반환합니다.
+        `replace=True`이면 같은 이름의 첨부 파일이 이미 있는 파일은 새 버전으로 올립니다.
+        한 파일의 실패는 나머지 파일에 영향을 주지 않습니다.
+        """
+        existing: Dict[str, str] = {}
+        if replace:
+            existing = {attachment["title"]: attachment["id"] async for attachment in self.get_attachments_iter(page_id)}
+        semaphore = asyncio.Semaphore(concurrency or settings.ATTACHMENT_UPLOAD_CONCURRENCY)
+
+        async def upload(source: AttachmentSource) -> AttachmentUploadResult:
+            attachment_id = existing.get(source.filename)
+            action = "updated" if attachment_id else "created"
+            try:
+                async with semaphore:
+                    if attachment_id:
+                        attachment = await self.update_attachment(page_id, attachment_id, source, comment)
+                    else:
+                        attachment = await self.upload_attachment(page_id, source, comment)
+            except Exception as e:
+                self._log_error(f"Attachment upload failed for {source.filename}", e)
+                return AttachmentUploadResult(filename=source.filename, status="error", attachment_id=attachment_id, size=source.size, error=str(e))
+            return AttachmentUploadResult(
+                filename=source.filename, status="ok", action=action, attachment_id=attachment.get("id"),
+                version=attachment.get("version", {}).get("number"), size=source.size,
+            )
+
+        return list(await asyncio.gather(*(upload(source) for source in sources)))
+
+    async def _paginate(self, url: str, params: Dict[str, Any], max_results: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        목록 API의 결과를 하나씩 반환합니다.
+
+        `_links.next` 커서를 우선 따르고, 없으면 `start`+`limit`로 다음 페이지를 요청합니다.
+        호출자가 현재 페이지를 처리하는 동안 다음 페이지를 미리 가져오며,
+        메모리에는 최대 두 페이지 분량의 결과만 유지됩니다.
+        """
+        limit = settings.CONFLUENCE_SEARCH_PAGE_SIZE
+        params = {**params, "start": 0, "limit": limit}
+
+        pending = asyncio.ensure_future(self._get(url, params))
+        returned = 0
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                results = data.get("results", [])
+
+                next_link = data.get("_links", {}).get("next")
+                if next_link:
+                    base = data["_links"].get("base", settings.CONFLUENCE_URL)
+                    pending = asyncio.ensure_future(self._get(f"{base}{next_link}"))
+                elif "_links" not in data and len(results) >= limit:
+                    params = {**params, "start": params["start"] + limit}
+                    pending = asyncio.ensure_future(self._get(url, params))
+
+                for result in results:
+                    if max_results is not None and returned >= max_results:
+                        return
+                    returned += 1
+                    yield result
+        finally:
+            if pending is not None:
+                pending.cancel()
 
 # FastAPI의 Depends에서 사용할 수 있도록 서비스 인스턴스 생성
-confluence_service = ConfluenceService()
\ No newline at end of file
+confluence_service = ConfluenceService()
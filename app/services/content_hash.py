@@ -0,0 +1,217 @@
+import os
+import re
+import html
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from html.parser import HTMLParser
+from typing import Optional, List, Dict, Any, Tuple
+
+from app.core.config import settings
+
+# 저장할 때마다 Confluence가 새로 부여하거나 편집기에 따라 달라지는, 내용과 무관한 속성
+VOLATILE_ATTRIBUTES = {"ac:macro-id", "ac:local-id", "local-id", "ac:schema-version", "data-layout-id"}
+VOID_TAGS = {"br", "hr", "img", "col", "input", "meta", "link", "wbr"}
+_SPACES = re.compile(r"[ \t\r\n]+")  # &nbsp;(U+00A0)는 내용이므로 합치지 않습니다.
+
+
+class _StorageNormalizer(HTMLParser):
+    """태그/속성/공백 표현 차이를 없앤 Storage 포맷 문자열을 만듭니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.out: List[str] = []
+        self._text: List[str] = []
+        self._pre = 0
+
+    def _flush_text(self) -> None:
+        if not self._text:
+            return
+        text = html.unescape("".join(self._text))
+        self._text = []
+        if not self._pre:
+            text = _SPACES.sub(" ", text)
+            # 블록 태그 사이의 들여쓰기/줄바꿈만 있는 텍스트는 버립니다.
+            if text == " ":
+                return
+        self.out.append(html.escape(text, quote=False))
+
+    def _start(self, tag: str, attrs: List[Tuple[str, Optional[str]]], closed: bool) -> None:
+        self._flush_text()
+        pairs = sorted((name, value or "") for name, value in attrs if name not in VOLATILE_ATTRIBUTES)
+        rendered = "".join(f' {name}="{html.escape(html.unescape(value))}"' for name, value in pairs)
+        self.out.append(f"<{tag}{rendered}/>" if closed or tag in VOID_TAGS else f"<{tag}{rendered}>")
+        if tag == "pre" and not closed:
+            self._pre += 1
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, True)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in VOID_TAGS:
+            return
+        if tag == "pre":
+            self._pre = max(self._pre - 1, 0)
+        self.out.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def handle_entityref(self, name):
+        self._text.append(f"&{name};")
+
+    def handle_charref(self, name):
+        self._text.append(f"&#{name};")
+
+    def unknown_decl(self, data):
+        # CDATA(코드 매크로 본문 등)는 공백까지 내용이므로 그대로 둡니다.
+        self._flush_text()
+        self.out.append(f"<![{data}]]>")
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+
+def normalize_storage(storage: str) -> str:
+    """
+    Storage 포맷 본문을 비교용으로 정규화합니다.
+
+    - 연속 공백을 하나로 합치고 블록 사이의 공백만 있는 텍스트를 제거합니다. (pre, CDATA 안은 유지)
+    - 속성을 이름순으로 정렬하고 매크로 ID 등 저장 시마다 달라지는 속성을 제거합니다.
+    - `<br>`/`<br/>`, 엔티티(`&nbsp;`/`&#160;`) 표기 차이를 없앱니다.
+    """
+    normalizer = _StorageNormalizer()
+    normalizer.feed(storage)
+    normalizer.close()
+    normalizer._flush_text()
+    return "".join(normalizer.out).strip()
+
+
+def content_hash(title: str, storage: str) -> str:
+    """제목과 정규화한 본문의 SHA-256 해시. 같으면 PUT해도 내용이 바뀌지 않습니다."""
+    digest = hashlib.sha256(title.strip().encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_storage(storage).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def page_content_hash(page: Dict[str, Any]) -> Optional[str]:
+    """Confluence 응답(body.storage 포함)의 해시. 본문이 없으면 None."""
+    storage = page.get("body", {}).get("storage", {}).get("value")
+    if storage is None or "title" not in page:
+        return None
+    return content_hash(page["title"], storage)
+
+
+class ContentHashStore:
+    """
+    페이지별로 마지막으로 확인한 (버전, 내용 해시)를 SQLite에 보관합니다.
+
+    update_page는 보낼 내용의 해시가 현재 버전의 해시와 같으면 PUT을 생략합니다.
+    파일에 남으므로 매일 같은 일괄 작업을 다시 실행해도 바뀐 페이지만 Confluence에 씁니다.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_hashes ("
+            " page_id TEXT PRIMARY KEY, version INTEGER NOT NULL, hash TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self.counters = {"checks": 0, "skipped": 0, "written": 0, "unknown": 0}
+
+    def _get(self, page_id: str) -> Optional[Tuple[int, str]]:
+        with self._lock:
+            row = self._conn.execute("SELECT version, hash FROM page_hashes WHERE page_id = ?", (page_id,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _set(self, page_id: str, version: int, digest: str) -> None:
+        with self._lock:
+            # 늦게 도착한 이전 버전의 기록이 최신 기록을 덮어쓰지 않도록 합니다.
+            self._conn.execute(
+                "INSERT INTO page_hashes (page_id, version, hash, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(page_id) DO UPDATE SET version = excluded.version, hash = excluded.hash, updated_at = excluded.updated_at "
+                "WHERE excluded.version >= page_hashes.version",
+                (page_id, version, digest, time.time()),
+            )
+
+    def _remember(self, page_id: str, version: int, digest: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM page_hashes WHERE page_id = ?", (page_id,)).fetchone()
+        if row is not None and row[0] >= version:
+            return False
+        self._set(page_id, version, digest)
+        return True
+
+    def _delete(self, page_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM page_hashes WHERE page_id = ?", (page_id,))
+
+    async def get(self, page_id: str) -> Optional[Tuple[int, str]]:
+        return await asyncio.to_thread(self._get, page_id)
+
+    async def set(self, page_id: str, version: int, digest: str) -> None:
+        await asyncio.to_thread(self._set, page_id, version, digest)
+
+    async def delete(self, page_id: str) -> None:
+        await asyncio.to_thread(self._delete, page_id)
+
+    async def remember(self, page: Dict[str, Any]) -> bool:
+        """
+        본문과 버전이 포함된 페이지 응답의 해시를 기록하고, 기록했는지 반환합니다.
+        이미 같거나 더 최신 버전이 기록되어 있으면 해시 계산과 쓰기를 모두 생략합니다.
+        """
+        version = page.get("version", {}).get("number")
+        if not page.get("id") or version is None:
+            return False
+        stored = await self.get(str(page["id"]))
+        if stored is not None and stored[0] >= version:
+            return False
+        digest = page_content_hash(page)
+        if digest is None:
+            return False
+        return await asyncio.to_thread(self._remember, str(page["id"]), version, digest)
+
+    async def is_unchanged(self, page_id: str, version: Optional[int], digest: str) -> Tuple[bool, Optional[int]]:
+        """
+        digest가 기록된 최신 내용과 같은지 확인하고 (같은지, 기록된 버전)을 반환합니다.
+        version이 주어졌는데 기록된 버전과 다르면 그 사이에 다른 곳에서 수정된 것이므로 같지 않은 것으로 봅니다.
+        """
+        self.counters["checks"] += 1
+        stored = await self.get(page_id)
+        if stored is None:
+            self.counters["unknown"] += 1
+            return False, None
+        stored_version, stored_digest = stored
+        unchanged = stored_digest == digest and (version is None or version == stored_version)
+        return unchanged, stored_version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM page_hashes").fetchone()[0]
+        checks = self.counters["checks"]
+        return {
+            "entries": entries,
+            "skip_rate": round(self.counters["skipped"] / checks, 3) if checks else None,
+            **self.counters,
+        }
+
+
+_content_hash_store: Optional[ContentHashStore] = None
+
+
+def get_content_hash_store() -> ContentHashStore:
+    global _content_hash_store
+    if _content_hash_store is None:
+        _content_hash_store = ContentHashStore(settings.WRITE_ELISION_PATH)
+    return _content_hash_store
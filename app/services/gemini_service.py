@@ -1,39 +1,146 @@
+import uuid
 import google.generativeai as genai
-from typing import Optional, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 
 from app.core.config import settings
-from .base_service import BaseLLMService
+from app.core.metrics import track_llm
+from .base_service import BaseLLMService, BaseConfluenceService
+from .session_store import BaseSessionStore, get_session_store
+from .tool_dispatcher import ToolDispatcher
+from .tool_definitions import confluence_tools
+
+# 도구 호출 없이 텍스트로만 답하도록 강제하는 설정
+NO_TOOLS = {"function_calling_config": {"mode": "NONE"}}
+MODEL_NAME = "gemini-1.5-flash"  # 최신 모델 사용
+EMBEDDING_MODEL_NAME = "models/text-embedding-004"
+
+
+def _record_usage(call, response) -> None:
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        call.tokens(usage.prompt_token_count, usage.candidates_token_count)
 
 class GeminiService(BaseLLMService):
     """
     Google Gemini 모델을 사용하여 LLM 기능을 제공하는 서비스.
     """
-    def __init__(self):
+    def __init__(self, session_store: Optional[BaseSessionStore] = None, confluence_service: Optional[BaseConfluenceService] = None):
         if not settings.GOOGLE_API_KEY:
             raise ValueError("Google API key is not set in the environment.")
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-flash') # 최신 모델 사용
-        # TODO: 세션 관리를 위한 chat 객체 구현 (여기서는 간단한 예시)
-        self.chat_sessions = {}
+        client_options = {"api_endpoint": settings.GEMINI_API_ENDPOINT} if settings.GEMINI_API_ENDPOINT else None
+        genai.configure(api_key=settings.GOOGLE_API_KEY, client_options=client_options)
+        self.model = genai.GenerativeModel(MODEL_NAME, tools=[confluence_tools])
+        self.session_store = session_store or get_session_store()
+        if confluence_service is None:
+            from .confluence_service import confluence_service
+        self.confluence_service = confluence_service
+
+    @property
+    def model_name(self) -> str:
+        return MODEL_NAME
+
+    @staticmethod
+    def _to_gemini_history(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """저장소의 공통 메시지 형식을 Gemini의 history 형식으로 변환합니다."""
+        return [
+            {"role": "user" if m["role"] == "user" else "model", "parts": [m["content"]]}
+            for m in messages
+        ]
+
+    @staticmethod
+    def _response_text(response) -> str:
+        """텍스트 파트만 모아서 반환합니다. (함수 호출 파트만 있는 경우 response.text는 예외를 던집니다.)"""
+        parts = response.candidates[0].content.parts if response.candidates else []
+        return "".join(part.text for part in parts if part.text)
 
     async def process_query(self, prompt: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Gemini 모델을 사용하여 사용자의 프롬프트를 처리하고 응답을 생성합니다.
-        (현재는 간단한 텍스트 생성만 구현)
+        모델이 함수 호출을 요청하면 Confluence 작업을 수행하고 그 결과를 다시 전달하며,
+        반복 횟수(LLM_MAX_TOOL_ITERATIONS)와 누적 토큰(LLM_MAX_TOTAL_TOKENS)을 넘으면 도구 없이 답하게 합니다.
         """
-        # TODO: 실제로는 여기서 프롬프트를 분석하여 Confluence API 호출 등
-        #       더 복잡한 작업을 수행해야 함 (예: Function Calling)
-        
-        # 임시 세션 처리
-        if session_id and session_id in self.chat_sessions:
-            chat = self.chat_sessions[session_id]
-        else:
-            chat = self.model.start_chat(history=[])
-            if session_id:
-                self.chat_sessions[session_id] = chat
-
-        response = await chat.send_message_async(prompt)
+        # 세션 저장소에서 이전 대화 기록을 불러와 chat 객체를 구성합니다.
+        session_id = session_id or uuid.uuid4().hex
+        history = await self.session_store.get_history(session_id)
+        chat = self.model.start_chat(history=self._to_gemini_history(history))
+        dispatcher = ToolDispatcher(self.confluence_service, self)
+
+        with track_llm("gemini", MODEL_NAME, "chat") as call:
+            response = await chat.send_message_async(prompt)
+            _record_usage(call, response)
+        iterations = 0
+        total_tokens = 0
+        limit_reached = False
+        while True:
+            if response.usage_metadata:
+                total_tokens += response.usage_metadata.total_token_count
+            parts = response.candidates[0].content.parts if response.candidates else []
+            calls = [part.function_call for part in parts if part.function_call.name]
+            if not calls or limit_reached:
+                break
+
+            # 한 턴에 요청된 함수 호출들을 동시에 실행합니다.
+            results = await dispatcher.execute_many([(call.name, dict(call.args)) for call in calls])
+            function_responses = [
+                genai.protos.Part(function_response=genai.protos.FunctionResponse(name=call.name, response={"result": result}))
+                for call, result in zip(calls, results)
+            ]
+
+            iterations += 1
+            limit_reached = iterations >= settings.LLM_MAX_TOOL_ITERATIONS or total_tokens >= settings.LLM_MAX_TOTAL_TOKENS
+            with track_llm("gemini", MODEL_NAME, "chat") as call:
+                response = await chat.send_message_async(function_responses, tool_config=NO_TOOLS if limit_reached else None)
+                _record_usage(call, response)
         
-        # Gemini API의 응답 구조에 따라 실제 텍스트를 추출
-        # response.text 또는 다른 필드를 확인해야 할 수 있습니다.
-        return {"response": response.text}
+        text = self._response_text(response)
+        await self.session_store.append(session_id, [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": text},
+        ])
+        result = {"response": text, "session_id": session_id}
+        if dispatcher.report_draft is not None:
+            result["response_type"] = "report_draft"
+            result["report_draft"] = dispatcher.report_draft.model_dump()
+        return result
+
+    async def stream_query(self, prompt: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """`send_message_async(stream=True)` 응답을 조각 단위로 반환합니다."""
+        session_id = session_id or uuid.uuid4().hex
+        history = await self.session_store.get_history(session_id)
+        chat = self.model.start_chat(history=self._to_gemini_history(history))
+
+        parts = []
+        with track_llm("gemini", MODEL_NAME, "stream") as call:
+            # 스트리밍 응답은 텍스트 전용이므로 함수 호출을 끕니다.
+            response = await chat.send_message_async(prompt, stream=True, tool_config=NO_TOOLS)
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # 텍스트 파트가 없는 조각(예: 종료 신호)은 건너뜁니다.
+                    continue
+                if text:
+                    parts.append(text)
+                    yield text
+            # 사용량은 마지막 조각까지 받은 뒤 집계된 값을 사용합니다.
+            _record_usage(call, response)
+
+        await self.session_store.append(session_id, [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": "".join(parts)},
+        ])
+
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """세션 없이 단일 프롬프트에 대한 응답 텍스트를 반환합니다."""
+        if system_prompt:
+            prompt = f"{system_prompt}\n\n{prompt}"
+        with track_llm("gemini", MODEL_NAME, "complete") as call:
+            response = await self.model.generate_content_async(prompt, tool_config=NO_TOOLS)
+            _record_usage(call, response)
+        return response.text
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 목록의 임베딩을 한 번의 요청으로 생성합니다."""
+        with track_llm("gemini", EMBEDDING_MODEL_NAME, "embed"):
+            result = await genai.embed_content_async(model=EMBEDDING_MODEL_NAME, content=texts)
+        return result["embedding"]
@@ -0,0 +1,241 @@
+import os
+import re
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator
+
+from app.core.config import settings
+from .base_service import BaseLLMService
+from .session_store import get_session_store
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 요청 단위 캐시 우회 플래그와, 한 호출 안에서 실행된 쓰기 도구 수를 기록하는 컨텍스트
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+_side_effects: ContextVar[Optional[Dict[str, int]]] = ContextVar("llm_cache_side_effects", default=None)
+
+
+@contextmanager
+def bypass_llm_cache() -> Iterator[None]:
+    """블록 안의 LLM 호출은 캐시를 읽지도 쓰지도 않습니다."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def record_side_effect() -> None:
+    """
+    페이지 생성/수정처럼 부수 효과가 있는 도구가 실행되었음을 알립니다.
+    이런 응답을 캐시에서 돌려주면 작업이 실제로 수행되지 않으므로 저장하지 않습니다.
+    """
+    effects = _side_effects.get()
+    if effects is not None:
+        effects["writes"] += 1
+
+
+@contextmanager
+def track_side_effects() -> Iterator[Dict[str, int]]:
+    """
+    블록 안에서 실행된 쓰기 도구 수를 세는 dict를 반환합니다.
+    바깥에서도 세고 있으면 블록이 끝날 때 그 수를 더해 줍니다.
+    """
+    outer = _side_effects.get()
+    effects = {"writes": 0}
+    token = _side_effects.set(effects)
+    try:
+        yield effects
+    finally:
+        _side_effects.reset(token)
+        if outer is not None:
+            outer["writes"] += effects["writes"]
+
+
+def normalize_text(text: str) -> str:
+    """공백 차이로 캐시 키가 달라지지 않도록 연속 공백을 하나로 합치고 양끝을 정리합니다."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def make_cache_key(provider: str, model: str, operation: str, system_prompt: str, prompt: str, history: Optional[List[Dict[str, str]]] = None) -> str:
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "operation": operation,
+            "system": normalize_text(system_prompt),
+            "prompt": normalize_text(prompt),
+            "history": [{"role": m["role"], "content": normalize_text(m["content"])} for m in history or []],
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LLM 응답을 저장하는 SQLite 캐시.
+
+    - 항목은 LLM_CACHE_TTL이 지나면 만료됩니다.
+    - 전체 크기가 LLM_CACHE_MAX_BYTES를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.counters = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "not_cacheable": 0, "expired": 0, "evictions": 0}
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.counters["expired"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # 오래 사용되지 않은 항목부터 초과분만큼 제거합니다.
+                excess = total - self.max_bytes
+                for old_key, old_size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                    if excess <= 0:
+                        break
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    excess -= old_size
+                    self.counters["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await asyncio.to_thread(self._get, key)
+        self.counters["hits" if value is not None else "misses"] += 1
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self._set, key, json.dumps(value, ensure_ascii=False))
+        self.counters["stores"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else None,
+            **self.counters,
+        }
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache(settings.LLM_CACHE_PATH, settings.LLM_CACHE_TTL, settings.LLM_CACHE_MAX_BYTES)
+    return _llm_cache
+
+
+class CachedLLMService(BaseLLMService):
+    """
+    다른 LLM 서비스를 감싸 process_query/complete 응답을 캐시합니다. (LLM_CACHE_ENABLED일 때 llm_factory가 사용)
+
+    - 키는 프로바이더, 모델, 시스템 프롬프트, 정규화한 프롬프트와 대화 기록의 해시입니다.
+    - 캐시 적중 시에도 대화 기록은 세션 저장소에 남겨 이후 대화가 이어지도록 합니다.
+    - 페이지 생성/수정 도구가 실행된 응답은 저장하지 않습니다.
+    - 스트리밍과 임베딩은 그대로 전달합니다.
+    """
+
+    def __init__(self, inner: BaseLLMService, provider: str, cache: Optional[LLMResponseCache] = None):
+        self.inner = inner
+        self.provider = provider
+        self.cache = cache or get_llm_cache()
+
+    @property
+    def model_name(self) -> str:
+        return self.inner.model_name
+
+    def _key(self, operation: str, system_prompt: Optional[str], prompt: str, history: Optional[List[Dict[str, str]]] = None) -> str:
+        system_prompt = system_prompt if system_prompt is not None else getattr(self.inner, "system_prompt", "")
+        return make_cache_key(self.provider, self.model_name, operation, system_prompt, prompt, history)
+
+    async def process_query(self, prompt: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        if _bypass.get():
+            self.cache.counters["bypassed"] += 1
+            return await self.inner.process_query(prompt, session_id)
+
+        session_store = getattr(self.inner, "session_store", None) or get_session_store()
+        history = await session_store.get_history(session_id) if session_id else []
+        key = self._key("process_query", None, prompt, history)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            session_id = session_id or uuid.uuid4().hex
+            await session_store.append(session_id, [
+                {"role": "user", "content": prompt},
+                {"role": "assistant", "content": cached["response"]},
+            ])
+            return {**cached, "session_id": session_id, "cached": True}
+
+        with track_side_effects() as effects:
+            result = await self.inner.process_query(prompt, session_id)
+        if effects["writes"]:
+            self.cache.counters["not_cacheable"] += 1
+        else:
+            await self.cache.set(key, {k: v for k, v in result.items() if k != "session_id"})
+        return result
+
+    def stream_query(self, prompt: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        return self.inner.stream_query(prompt, session_id)
+
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        if _bypass.get():
+            self.cache.counters["bypassed"] += 1
+            return await self.inner.complete(prompt, system_prompt)
+        key = self._key("complete", system_prompt, prompt)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+        text = await self.inner.complete(prompt, system_prompt)
+        await self.cache.set(key, text)
+        return text
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return await self.inner.embed(texts)
+
+    async def shutdown(self) -> None:
+        await self.inner.shutdown()
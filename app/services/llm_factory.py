@@ -1,16 +1,67 @@
+import logging
+from typing import Optional, Dict, Any
+
 from app.core.config import settings
 from .base_service import BaseLLMService
-from .gemini_service import GeminiService
-from .openai_service import OpenAIService
 
-def get_llm_service() -> BaseLLMService:
-    """
-    설정에 따라 적절한 LLM 서비스 인스턴스를 반환합니다.
-    """
-    provider = settings.LLM_PROVIDER.lower()
+# 프로바이더별 서비스 인스턴스를 프로세스 수명 동안 재사용합니다.
+_llm_services: Dict[str, BaseLLMService] = {}
+
+def _create_llm_service(provider: str) -> BaseLLMService:
+    # 선택된 프로바이더의 SDK만 로드되도록 모듈을 지연 import 합니다.
     if provider == "gemini":
+        from .gemini_service import GeminiService
         return GeminiService()
     elif provider == "openai":
+        from .openai_service import OpenAIService
         return OpenAIService()
+    elif provider == "router":
+        from .llm_router import LLMRouter
+        services = {}
+        for name in (name.strip().lower() for name in settings.LLM_ROUTER_PROVIDERS.split(",")):
+            if not name or name in services or name == "router":
+                continue
+            try:
+                services[name] = _create_llm_service(name)
+            except ValueError as e:
+                # API 키가 없는 프로바이더는 제외하고 나머지로 라우팅합니다.
+                logging.warning(f"[llm_factory] 라우터에서 '{name}' 프로바이더를 제외합니다: {e}")
+        return LLMRouter(services)
     else:
-        raise ValueError(f"Unsupported LLM provider: {settings.LLM_PROVIDER}")
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+
+def get_llm_service() -> BaseLLMService:
+    """
+    설정에 따라 적절한 LLM 서비스 인스턴스를 반환합니다.
+    인스턴스(및 내부 HTTP 클라이언트)는 첫 호출 시 생성되어 이후 요청에서 재사용됩니다.
+    """
+    provider = settings.LLM_PROVIDER.lower()
+    service = _llm_services.get(provider)
+    if service is None:
+        service = _create_llm_service(provider)
+        if settings.LLM_CACHE_ENABLED:
+            from .llm_cache import CachedLLMService
+            service = CachedLLMService(service, provider)
+        _llm_services[provider] = service
+    return service
+
+def get_llm_router_stats() -> Optional[Dict[str, Any]]:
+    """LLM_PROVIDER='router'일 때 프로바이더별 지연 시간/오류율, 라우팅 결정, 중복 요청 승률을 반환합니다."""
+    service = _llm_services.get("router")
+    # 응답 캐시를 켜면 라우터가 CachedLLMService 안에 있습니다.
+    service = getattr(service, "inner", service)
+    return service.stats() if service is not None else None
+
+async def startup_llm_service() -> None:
+    """앱 시작 시 LLM 서비스를 미리 생성하여 첫 요청의 지연을 줄입니다."""
+    try:
+        get_llm_service()
+    except ValueError as e:
+        # API 키가 없는 환경에서도 Confluence 기능은 사용할 수 있도록 서버는 계속 기동합니다.
+        logging.warning(f"[llm_factory] LLM 서비스를 미리 생성하지 못했습니다: {e}")
+
+async def shutdown_llm_services() -> None:
+    """생성된 LLM 서비스의 클라이언트를 정리합니다."""
+    for service in _llm_services.values():
+        await service.shutdown()
+    _llm_services.clear()
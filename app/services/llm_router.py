@@ -0,0 +1,288 @@
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Deque, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import LLM_ROUTED, LLM_HEDGE_WINS
+from .base_service import BaseLLMService
+from .llm_cache import track_side_effects
+
+T = TypeVar("T")
+
+# 오류율을 판단하기 전에 필요한 최소 호출 수
+MIN_ERROR_SAMPLES = 5
+
+
+def _quantile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class ProviderHealth:
+    """
+    프로바이더 하나의 최근 호출 기록.
+
+    - 작업(process_query/complete/stream_query)별로 최근 window개의 성공 지연 시간을 보관합니다.
+      stream_query는 첫 조각까지의 시간(TTFT)입니다.
+    - 최근 window개의 성공/실패로 오류율을 계산하며, max_error_rate를 넘으면 cooldown 동안 라우팅에서 제외합니다.
+      제외가 풀리면 오류 기록을 비우고 새로 판단합니다.
+    """
+
+    def __init__(self, window: int, max_error_rate: float, cooldown: float):
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.suspended_until = 0.0
+        self.counters = {"calls": 0, "errors": 0, "suspensions": 0, "hedges_won": 0, "hedges_lost": 0}
+
+    def record_success(self, operation: str, latency: float) -> None:
+        self.counters["calls"] += 1
+        self.latencies.setdefault(operation, deque(maxlen=self.window)).append(latency)
+        self.outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self.counters["calls"] += 1
+        self.counters["errors"] += 1
+        self.outcomes.append(False)
+        if len(self.outcomes) >= MIN_ERROR_SAMPLES and self.error_rate() > self.max_error_rate:
+            self.suspended_until = time.monotonic() + self.cooldown
+            self.outcomes.clear()
+            self.counters["suspensions"] += 1
+
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.suspended_until
+
+    def latency(self, operation: str, q: float) -> Optional[float]:
+        return _quantile(list(self.latencies.get(operation, ())), q)
+
+    def samples(self, operation: str) -> int:
+        return len(self.latencies.get(operation, ()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available(),
+            "error_rate": round(self.error_rate(), 3),
+            "latency_ms": {
+                operation: {
+                    "p50": round(self.latency(operation, 0.5) * 1000, 1),
+                    "p95": round(self.latency(operation, 0.95) * 1000, 1),
+                    "samples": len(values),
+                }
+                for operation, values in self.latencies.items() if values
+            },
+            **self.counters,
+        }
+
+
+class LLMRouter(BaseLLMService):
+    """
+    여러 LLM 서비스 중 최근 지연 시간이 가장 짧은 정상 프로바이더로 요청을 보냅니다. (LLM_PROVIDER='router')
+
+    - 순서: 제외되지 않은 프로바이더를 작업별 p50 지연 시간 순으로 정렬합니다. 기록이 없는 프로바이더를 먼저 시도하며,
+      LLM_ROUTER_EXPLORE_RATIO 비율의 요청은 두 번째 프로바이더로 보내 지연 시간 기록을 최신으로 유지합니다.
+    - complete/stream_query: 첫 프로바이더가 p95 지연 시간(LLM_ROUTER_HEDGE_QUANTILE) 안에 답하지 않으면 다음 프로바이더에
+      같은 요청을 보내고(hedge) 먼저 도착한 응답을 사용하며 나머지는 취소합니다. 스트리밍은 첫 조각 기준입니다.
+      중복 요청은 전체 요청의 LLM_ROUTER_HEDGE_BUDGET 비율을 넘지 않습니다.
+    - process_query: 도구 호출로 페이지를 쓸 수 있으므로 중복 요청하지 않습니다. 실패하면 쓰기 도구가 실행되지 않은 경우에만
+      다음 프로바이더로 다시 시도합니다.
+    - embed: 프로바이더마다 벡터 공간이 다르므로 항상 첫 번째로 설정된 프로바이더를 사용합니다.
+    """
+
+    def __init__(self, services: Dict[str, BaseLLMService]):
+        if not services:
+            raise ValueError("LLM router needs at least one provider.")
+        self.services = services
+        self.health = {
+            name: ProviderHealth(settings.LLM_ROUTER_WINDOW, settings.LLM_ROUTER_MAX_ERROR_RATE, settings.LLM_ROUTER_COOLDOWN)
+            for name in services
+        }
+        self.counters = {"requests": 0, "fallbacks": 0, "explored": 0, "hedges_sent": 0, "hedges_won": 0, "hedges_over_budget": 0}
+        self.routed: Dict[str, Dict[str, int]] = {name: {} for name in services}
+
+    @property
+    def model_name(self) -> str:
+        return f"router({','.join(service.model_name for service in self.services.values())})"
+
+    @property
+    def system_prompt(self) -> str:
+        # 응답 캐시 키에 사용됩니다.
+        return getattr(next(iter(self.services.values())), "system_prompt", "")
+
+    def _order(self, operation: str) -> List[str]:
+        """이번 요청에서 시도할 프로바이더 순서."""
+        names = list(self.services)
+        available = [name for name in names if self.health[name].available()]
+        if not available:
+            # 모두 제외된 상태면 가장 먼저 제외가 풀리는 프로바이더부터 시도합니다.
+            return sorted(names, key=lambda name: self.health[name].suspended_until)
+        available.sort(key=lambda name: self.health[name].latency(operation, 0.5) or 0.0)
+        if len(available) > 1 and random.random() < settings.LLM_ROUTER_EXPLORE_RATIO:
+            available[0], available[1] = available[1], available[0]
+            self.counters["explored"] += 1
+        return available
+
+    def _hedge_delay(self, name: str, operation: str) -> Optional[float]:
+        """중복 요청을 보내기까지 기다릴 시간. 기록이 부족하면 None(중복 요청하지 않음)."""
+        health = self.health[name]
+        if not settings.LLM_ROUTER_HEDGE or health.samples(operation) < max(settings.LLM_ROUTER_HEDGE_MIN_SAMPLES, 1):
+            return None
+        return max(health.latency(operation, settings.LLM_ROUTER_HEDGE_QUANTILE), settings.LLM_ROUTER_HEDGE_MIN_DELAY)
+
+    def _take_hedge_budget(self) -> bool:
+        if self.counters["hedges_sent"] + 1 > self.counters["requests"] * settings.LLM_ROUTER_HEDGE_BUDGET:
+            self.counters["hedges_over_budget"] += 1
+            return False
+        self.counters["hedges_sent"] += 1
+        return True
+
+    def _route(self, name: str, operation: str, role: str) -> BaseLLMService:
+        self.routed[name][role] = self.routed[name].get(role, 0) + 1
+        LLM_ROUTED.inc(provider=name, operation=operation, role=role)
+        if role == "fallback":
+            self.counters["fallbacks"] += 1
+        return self.services[name]
+
+    async def _timed(self, name: str, operation: str, call: Callable[[BaseLLMService], Awaitable[T]], role: str) -> T:
+        service = self._route(name, operation, role)
+        started = time.perf_counter()
+        try:
+            result = await call(service)
+        except Exception as e:
+            self.health[name].record_failure()
+            logging.warning(f"[LLMRouter] {name} {operation} 실패: {e}")
+            raise
+        self.health[name].record_success(operation, time.perf_counter() - started)
+        return result
+
+    def _record_hedge(self, operation: str, hedge: str, winner: str) -> None:
+        """중복 요청을 받은 프로바이더가 먼저 답했는지 기록합니다."""
+        if winner != hedge:
+            self.health[hedge].counters["hedges_lost"] += 1
+            return
+        self.counters["hedges_won"] += 1
+        self.health[hedge].counters["hedges_won"] += 1
+        LLM_HEDGE_WINS.inc(provider=hedge, operation=operation)
+
+    async def _hedged(
+        self,
+        operation: str,
+        call: Callable[[BaseLLMService], Awaitable[T]],
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    ) -> T:
+        """
+        첫 프로바이더의 응답이 늦으면 다음 프로바이더에도 요청하고 먼저 성공한 결과를 반환합니다.
+        늦게 성공한 나머지 결과는 discard로 정리합니다. (예: 열린 스트림 닫기)
+        """
+        self.counters["requests"] += 1
+        remaining = self._order(operation)
+        primary = remaining[0]
+        pending: Dict[asyncio.Task, str] = {}
+        hedge: Optional[str] = None
+        hedge_delay = self._hedge_delay(primary, operation) if len(remaining) > 1 else None
+        last_error: Optional[BaseException] = None
+
+        def launch(role: str) -> str:
+            name = remaining.pop(0)
+            pending[asyncio.create_task(self._timed(name, operation, call, role))] = name
+            return name
+
+        launch("primary")
+        try:
+            while pending:
+                timeout = hedge_delay if hedge is None and remaining else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge_delay = None
+                    if self._take_hedge_budget():
+                        hedge = launch("hedge")
+                    continue
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    name = pending.pop(winner)
+                    if hedge is not None:
+                        self._record_hedge(operation, hedge, name)
+                    return winner.result()
+                for task in done:
+                    pending.pop(task)
+                    last_error = task.exception()
+                if not pending and remaining:
+                    launch("fallback")
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            if discard is not None:
+                for result in results:
+                    if not isinstance(result, BaseException):
+                        await discard(result)
+
+    async def process_query(self, prompt: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        self.counters["requests"] += 1
+        order = self._order("process_query")
+        for i, name in enumerate(order):
+            with track_side_effects() as effects:
+                try:
+                    return await self._timed(name, "process_query", lambda service: service.process_query(prompt, session_id), "primary" if i == 0 else "fallback")
+                except Exception:
+                    # 페이지를 쓴 뒤 실패했다면 다른 프로바이더로 다시 실행하면 같은 쓰기가 반복될 수 있습니다.
+                    if effects["writes"] or i == len(order) - 1:
+                        raise
+
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        return await self._hedged("complete", lambda service: service.complete(prompt, system_prompt))
+
+    async def _first_chunk(self, stream: AsyncIterator[str]) -> Tuple[AsyncIterator[str], Optional[str]]:
+        try:
+            return stream, await stream.__anext__()
+        except StopAsyncIteration:
+            return stream, None
+        except BaseException:
+            # 중복 요청에서 져서 취소되었거나 첫 조각 전에 실패한 스트림은 여기서 닫아야 연결이 남지 않습니다.
+            await stream.aclose()
+            raise
+
+    async def stream_query(self, prompt: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """첫 조각이 먼저 도착한 프로바이더의 스트림을 이어서 반환합니다. 나머지 스트림은 닫습니다."""
+        # 중복 요청과 재시도가 같은 세션 기록을 이어가도록 세션 ID를 미리 정합니다.
+        session_id = session_id or uuid.uuid4().hex
+        stream, first = await self._hedged(
+            "stream_query",
+            lambda service: self._first_chunk(service.stream_query(prompt, session_id)),
+            discard=lambda result: result[0].aclose(),
+        )
+        try:
+            if first is None:
+                return
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return await next(iter(self.services.values())).embed(texts)
+
+    async def shutdown(self) -> None:
+        for service in self.services.values():
+            await service.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        sent = self.counters["hedges_sent"]
+        return {
+            **self.counters,
+            "hedge_win_rate": round(self.counters["hedges_won"] / sent, 3) if sent else None,
+            "routed": self.routed,
+            "providers": {name: health.stats() for name, health in self.health.items()},
+        }
@@ -1,37 +1,147 @@
+import uuid
 from openai import AsyncOpenAI
-from typing import Optional, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 
 from app.core.config import settings
-from .base_service import BaseLLMService
+from app.core.metrics import track_llm
+from .base_service import BaseLLMService, BaseConfluenceService
+from .session_store import BaseSessionStore, get_session_store
+from .tool_dispatcher import ToolDispatcher
+from .openai_tool_definitions import confluence_tools_openai
 
 class OpenAIService(BaseLLMService):
     """
     OpenAI 모델을 사용하여 LLM 기능을 제공하는 서비스.
     """
-    def __init__(self):
+    def __init__(self, session_store: Optional[BaseSessionStore] = None, confluence_service: Optional[BaseConfluenceService] = None):
         if not settings.OPENAI_API_KEY:
             raise ValueError("OpenAI API key is not set in the environment.")
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
         self.model = "gpt-4o"  # 최신 모델 사용
+        self.embedding_model = "text-embedding-3-small"
+        self.system_prompt = "You are a helpful assistant."
+        self.session_store = session_store or get_session_store()
+        if confluence_service is None:
+            from .confluence_service import confluence_service
+        self.confluence_service = confluence_service
+
+    @property
+    def model_name(self) -> str:
+        return self.model
 
     async def process_query(self, prompt: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         OpenAI 모델을 사용하여 사용자의 프롬프트를 처리하고 응답을 생성합니다.
-        (현재는 간단한 텍스트 생성만 구현)
+        모델이 도구 호출을 요청하면 Confluence 작업을 수행하고 그 결과로 다시 요청하며,
+        반복 횟수(LLM_MAX_TOOL_ITERATIONS)와 누적 토큰(LLM_MAX_TOTAL_TOKENS)을 넘으면 도구 없이 답하게 합니다.
         """
-        # TODO: 실제로는 여기서 프롬프트를 분석하여 Confluence API 호출 등
-        #       더 복잡한 작업을 수행해야 함 (예: Function Calling)
-        
-        # 대화 기록을 포함하여 요청 (세션 관리 필요 시)
+        # 세션 저장소의 대화 기록을 포함하여 요청
+        session_id = session_id or uuid.uuid4().hex
+        history = await self.session_store.get_history(session_id)
         messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "system", "content": self.system_prompt},
+            *history,
             {"role": "user", "content": prompt}
         ]
+        dispatcher = ToolDispatcher(self.confluence_service, self)
+
+        iterations = 0
+        total_tokens = 0
+        tool_choice = "auto"
+        while True:
+            with track_llm("openai", self.model, "chat") as call:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    tools=confluence_tools_openai,
+                    tool_choice=tool_choice,
+                    max_tokens=2000
+                )
+                if response.usage:
+                    call.tokens(response.usage.prompt_tokens, response.usage.completion_tokens)
+            if response.usage:
+                total_tokens += response.usage.total_tokens
+            message = response.choices[0].message
+            if not message.tool_calls or tool_choice == "none":
+                break
+
+            # 한 턴에 요청된 도구 호출들을 동시에 실행합니다.
+            messages.append(message.model_dump(exclude_none=True))
+            results = await dispatcher.execute_many([(call.function.name, call.function.arguments) for call in message.tool_calls])
+            for call, result in zip(message.tool_calls, results):
+                messages.append({"role": "tool", "tool_call_id": call.id, "content": result})
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_tokens=2000
-        )
+            iterations += 1
+            if iterations >= settings.LLM_MAX_TOOL_ITERATIONS or total_tokens >= settings.LLM_MAX_TOTAL_TOKENS:
+                tool_choice = "none"
         
-        return {"response": response.choices[0].message.content.strip()}
+        content = (message.content or "").strip()
+        await self.session_store.append(session_id, [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": content},
+        ])
+        result = {"response": content, "session_id": session_id}
+        if dispatcher.report_draft is not None:
+            result["response_type"] = "report_draft"
+            result["report_draft"] = dispatcher.report_draft.model_dump()
+        return result
+
+    async def stream_query(self, prompt: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """OpenAI 스트리밍(stream=True) 응답을 토큰 조각 단위로 반환합니다."""
+        session_id = session_id or uuid.uuid4().hex
+        history = await self.session_store.get_history(session_id)
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            *history,
+            {"role": "user", "content": prompt}
+        ]
+
+        parts = []
+        with track_llm("openai", self.model, "stream") as call:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=2000,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                if chunk.usage:
+                    call.tokens(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        await self.session_store.append(session_id, [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": "".join(parts).strip()},
+        ])
+
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """세션 없이 단일 프롬프트에 대한 응답 텍스트를 반환합니다."""
+        with track_llm("openai", self.model, "complete") as call:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt or self.system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=2000
+            )
+            if response.usage:
+                call.tokens(response.usage.prompt_tokens, response.usage.completion_tokens)
+        return response.choices[0].message.content.strip()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 목록의 임베딩을 한 번의 요청으로 생성합니다."""
+        with track_llm("openai", self.embedding_model, "embed") as call:
+            response = await self.client.embeddings.create(model=self.embedding_model, input=texts)
+            call.tokens(response.usage.prompt_tokens, None)
+        return [item.embedding for item in response.data]
+
+    async def shutdown(self) -> None:
+        """AsyncOpenAI 클라이언트의 커넥션 풀을 닫습니다."""
+        await self.client.close()
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Set, Union, AsyncIterable, AsyncIterator
+
+from app.core.config import settings
+from app.models.confluence_models import BatchOperation, BatchItemResult, PageCreate, PageUpdate
+from .base_service import BaseConfluenceService
+
+
+class PageBatchService:
+    """
+    여러 페이지 생성/수정/삭제 작업을 제한된 동시성으로 실행합니다.
+
+    - 작업은 입력 순서대로 시작되지만 결과는 완료되는 순서대로 반환됩니다(`index`로 구분).
+    - create 항목의 `parent_id`(또는 update/delete의 `page_id`)가 앞선 create 항목의 `ref`를 가리키면,
+      그 페이지가 생성된 뒤 실제 ID로 바꿔 실행합니다. ref는 그것을 사용하는 항목보다 앞에 있어야 하며,
+      숫자가 아닌 ID가 앞서 정의된 ref가 아니면 Confluence에 보내지 않고 오류로 처리합니다.
+    - 한 항목의 실패는 나머지 항목에 영향을 주지 않습니다. (단, 부모 생성에 실패한 자식은 실패로 처리됩니다.)
+    - 동시에 진행 중인 항목 수를 제한하므로 입력을 스트리밍으로 받으면 전체 배치를 메모리에 올리지 않습니다.
+      끝난 ref는 생성된 페이지 ID(또는 오류 메시지) 문자열만 남깁니다.
+    """
+
+    def __init__(self, confluence_service: BaseConfluenceService, concurrency: Optional[int] = None):
+        self.confluence = confluence_service
+        self.concurrency = concurrency or settings.BATCH_WRITE_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # 진행 중인 create 항목의 ref -> 생성된 페이지 ID (실패 시 예외)를 담는 future
+        self._pending_refs: Dict[str, asyncio.Future] = {}
+        # 끝난 ref -> 생성된 페이지 ID / 오류 메시지
+        self._created_refs: Dict[str, str] = {}
+        self._failed_refs: Dict[str, str] = {}
+
+    def _known_ref(self, ref: str) -> bool:
+        return ref in self._pending_refs or ref in self._created_refs or ref in self._failed_refs
+
+    def _check_ref(self, page_id: Optional[str]) -> Optional[str]:
+        """숫자가 아닌 ID가 앞서 정의된 ref가 아니면 오류 메시지를 반환합니다. (뒤에 정의된 ref도 여기에 해당합니다)"""
+        if page_id and not page_id.isdigit() and not self._known_ref(page_id):
+            return f"unknown ref '{page_id}' (a ref must be defined by an earlier create item)"
+        return None
+
+    async def _resolve_ref(self, page_id: Optional[str]) -> Optional[str]:
+        """앞선 create 항목의 ref이면 생성된 실제 페이지 ID를 기다려 반환하고, 아니면 그대로 반환합니다."""
+        if not page_id:
+            return page_id
+        if page_id in self._created_refs:
+            return self._created_refs[page_id]
+        if page_id in self._failed_refs:
+            raise ValueError(f"ref '{page_id}' failed: {self._failed_refs[page_id]}")
+        future = self._pending_refs.get(page_id)
+        if future is None:
+            return page_id
+        try:
+            return await asyncio.shield(future)
+        except Exception as e:
+            raise ValueError(f"ref '{page_id}' failed: {e}")
+
+    def _settle_ref(self, ref: str, page_id: Optional[str] = None, error: Optional[Exception] = None) -> None:
+        """ref를 기다리는 항목을 깨우고, future 대신 결과 문자열만 남깁니다."""
+        future = self._pending_refs.pop(ref, None)
+        if error is not None:
+            self._failed_refs[ref] = str(error)
+            if future is not None and not future.done():
+                future.set_exception(error)
+                future.exception()  # 기다리는 자식이 없어도 경고가 남지 않도록 예외를 소비합니다.
+        else:
+            self._created_refs[ref] = page_id
+            if future is not None and not future.done():
+                future.set_result(page_id)
+
+    async def _execute(self, operation: BatchOperation) -> Dict[str, Any]:
+        if operation.op == "create":
+            if not (operation.space_key and operation.title and operation.content is not None):
+                raise ValueError("create requires space_key, title and content")
+            parent_id = await self._resolve_ref(operation.parent_id)
+            async with self._semaphore:
+                return await self.confluence.create_page(PageCreate(
+                    space_key=operation.space_key, title=operation.title,
+                    content=operation.content, parent_id=parent_id,
+                ))
+
+        page_id = await self._resolve_ref(operation.page_id)
+        if not page_id:
+            raise ValueError(f"{operation.op} requires page_id")
+        if operation.op == "update":
+            if not (operation.title and operation.content is not None):
+                raise ValueError("update requires title and content")
+            async with self._semaphore:
+                return await self.confluence.update_page(page_id, PageUpdate(
+                    title=operation.title, content=operation.content, version=operation.version,
+                ))
+        async with self._semaphore:
+            await self.confluence.delete_page(page_id)
+        return {"id": page_id}
+
+    async def _run_item(self, index: int, operation: BatchOperation) -> BatchItemResult:
+        ref = operation.ref if operation.op == "create" else None
+        try:
+            page = await self._execute(operation)
+        except Exception as e:
+            logging.error(f"[PageBatchService] 항목 {index} ({operation.op}) 실패: {e}")
+            if ref:
+                self._settle_ref(ref, error=e)
+            return BatchItemResult(index=index, op=operation.op, ref=operation.ref, status="error", page_id=operation.page_id, error=str(e))
+
+        page_id = page.get("id", operation.page_id)
+        if ref:
+            self._settle_ref(ref, page_id)
+        return BatchItemResult(
+            index=index, op=operation.op, ref=operation.ref, status="skipped" if page.get("status") == "skipped" else "ok",
+            page_id=page_id, version=page.get("version", {}).get("number"),
+        )
+
+    async def run(self, operations: AsyncIterable[Union[BatchOperation, Exception]]) -> AsyncIterator[BatchItemResult]:
+        """
+        작업들을 실행하며 결과를 완료되는 대로 반환합니다.
+        입력 항목이 예외(예: 잘못된 NDJSON 줄)이면 해당 항목을 오류 결과로 반환합니다.
+        """
+        max_in_flight = self.concurrency * 4
+        pending: Set[asyncio.Task] = set()
+        index = -1
+        try:
+            async for operation in operations:
+                index += 1
+                if isinstance(operation, Exception):
+                    yield BatchItemResult(index=index, status="error", error=f"invalid operation: {operation}")
+                    continue
+                error = self._check_ref(operation.parent_id if operation.op == "create" else operation.page_id)
+                if error is None and operation.op == "create" and operation.ref:
+                    if operation.ref.isdigit():
+                        error = f"ref '{operation.ref}' must not be numeric (numeric values are page IDs)"
+                    elif self._known_ref(operation.ref):
+                        error = f"duplicate ref '{operation.ref}'"
+                    else:
+                        self._pending_refs[operation.ref] = asyncio.get_running_loop().create_future()
+                if error is not None:
+                    yield BatchItemResult(index=index, op=operation.op, ref=operation.ref, status="error", page_id=operation.page_id, error=error)
+                    continue
+                pending.add(asyncio.create_task(self._run_item(index, operation)))
+
+                # 진행 중인 항목이 너무 많으면 일부가 끝날 때까지 입력을 더 읽지 않습니다.
+                while len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
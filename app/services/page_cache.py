@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+from app.core.config import settings
+
+
+def make_cache_key(page_id: str, expand: Optional[str] = None) -> str:
+    """페이지 ID와 expand 집합(순서 무관)으로 캐시 키를 만듭니다."""
+    fields = sorted({f.strip() for f in (expand or "").split(",") if f.strip()})
+    return f"{page_id}|{','.join(fields)}"
+
+
+class CacheEntry:
+    """캐시된 페이지 응답과 그 시점의 버전 번호."""
+
+    __slots__ = ("page_id", "value", "version", "stored_at", "size")
+
+    def __init__(self, page_id: str, value: str, version: Optional[int], stored_at: float):
+        self.page_id = page_id
+        self.value = value  # 직렬화된 JSON 문자열 (호출자 간 객체 공유를 막기 위함)
+        self.version = version
+        self.stored_at = stored_at
+        self.size = len(value)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.stored_at < ttl
+
+    def load(self) -> Dict[str, Any]:
+        return json.loads(self.value)
+
+
+class BasePageCache(ABC):
+    """get_page 응답 캐시의 공통 인터페이스."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0, "invalidations": 0}
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, page_id: str, value: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def touch(self, key: str) -> None:
+        """버전 확인으로 재검증된 항목의 TTL을 갱신합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invalidate_page(self, page_id: str) -> None:
+        """해당 페이지의 모든 expand 변형 항목을 제거합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _usage(self) -> Tuple[int, int]:
+        """(항목 수, 바이트 수)를 반환합니다."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self._usage()
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            "backend": type(self).__name__,
+            "entries": entries,
+            "bytes": size,
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+class InMemoryPageCache(BasePageCache):
+    """항목 수와 바이트 수 한도를 가진 프로세스 내 LRU 캐시."""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._keys_by_page: Dict[str, set] = {}
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        keys = self._keys_by_page.get(entry.page_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_page[entry.page_id]
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, page_id: str, value: Dict[str, Any]) -> None:
+        version = (value.get("version") or {}).get("number")
+        entry = CacheEntry(page_id, json.dumps(value, ensure_ascii=False), version, time.monotonic())
+        if entry.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._keys_by_page.setdefault(page_id, set()).add(key)
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.counters["evictions"] += 1
+
+    async def touch(self, key: str) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.stored_at = time.monotonic()
+
+    async def invalidate_page(self, page_id: str) -> None:
+        for key in list(self._keys_by_page.get(page_id, ())):
+            self._remove(key)
+            self.counters["invalidations"] += 1
+
+    def _usage(self) -> Tuple[int, int]:
+        return len(self._entries), self._bytes
+
+
+class SQLitePageCache(BasePageCache):
+    """
+    디스크(SQLite)에 저장되는 캐시. 프로세스 재시작 후에도 유지되며 여러 워커가 공유할 수 있습니다.
+    TTL은 벽시계 시간(time.time) 기준이며, 한도를 넘으면 가장 오래 접근하지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int, max_bytes: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_cache ("
+            " key TEXT PRIMARY KEY, page_id TEXT NOT NULL, version INTEGER,"
+            " value TEXT NOT NULL, size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_page_cache_page ON page_cache(page_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_page_cache_accessed ON page_cache(accessed_at)")
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        rows = self._execute("SELECT page_id, value, version, stored_at FROM page_cache WHERE key = ?", (key,))
+        if not rows:
+            return None
+        self._execute("UPDATE page_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        page_id, value, version, stored_at = rows[0]
+        # CacheEntry.is_fresh는 monotonic 기준이므로 경과 시간으로 환산합니다.
+        return CacheEntry(page_id, value, version, time.monotonic() - (time.time() - stored_at))
+
+    def _set(self, key: str, page_id: str, value: Dict[str, Any]) -> None:
+        serialized = json.dumps(value, ensure_ascii=False)
+        if len(serialized) > self.max_bytes:
+            return
+        now = time.time()
+        version = (value.get("version") or {}).get("number")
+        self._execute(
+            "INSERT OR REPLACE INTO page_cache (key, page_id, version, value, size, stored_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, page_id, version, serialized, len(serialized), now, now),
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        entries, size = self._usage()
+        while entries > self.max_entries or size > self.max_bytes:
+            rows = self._execute("SELECT key, size FROM page_cache ORDER BY accessed_at LIMIT 1")
+            if not rows:
+                break
+            key, entry_size = rows[0]
+            self._execute("DELETE FROM page_cache WHERE key = ?", (key,))
+            self.counters["evictions"] += 1
+            entries -= 1
+            size -= entry_size
+
+    def _touch(self, key: str) -> None:
+        self._execute("UPDATE page_cache SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def _invalidate_page(self, page_id: str) -> None:
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM page_cache WHERE page_id = ?", (page_id,)).rowcount
+        self.counters["invalidations"] += max(deleted, 0)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, page_id: str, value: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set, key, page_id, value)
+
+    async def touch(self, key: str) -> None:
+        await asyncio.to_thread(self._touch, key)
+
+    async def invalidate_page(self, page_id: str) -> None:
+        await asyncio.to_thread(self._invalidate_page, page_id)
+
+    def _usage(self) -> Tuple[int, int]:
+        entries, size = self._execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM page_cache")[0]
+        return entries, size
+
+
+def create_page_cache() -> Optional[BasePageCache]:
+    """설정(PAGE_CACHE_BACKEND)에 따라 페이지 캐시를 생성합니다. 'none'이면 None을 반환합니다."""
+    backend = settings.PAGE_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return InMemoryPageCache(settings.PAGE_CACHE_TTL, settings.PAGE_CACHE_MAX_ENTRIES, settings.PAGE_CACHE_MAX_BYTES)
+    if backend == "sqlite":
+        return SQLitePageCache(
+            settings.PAGE_CACHE_SQLITE_PATH, settings.PAGE_CACHE_TTL,
+            settings.PAGE_CACHE_MAX_ENTRIES, settings.PAGE_CACHE_MAX_BYTES,
+        )
+    raise ValueError(f"Unsupported page cache backend: {settings.PAGE_CACHE_BACKEND}")
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any, AsyncIterator, Set
+
+from app.core.config import settings
+from .base_service import BaseConfluenceService
+
+_DONE = object()
+
+
+class PageTreeCrawler:
+    """
+    `/content/{id}/child/page`를 따라 페이지 트리를 레벨 단위(BFS)로 내려가며 노드를 스트리밍합니다.
+
+    - 한 레벨의 부모들은 최대 `concurrency`개씩 동시에 자식 목록을 조회합니다. (자식 목록은 페이지네이션을 따름)
+    - `childTypes.page`로 자식이 없다고 알려진 페이지(대부분의 잎 노드)는 자식 목록을 조회하지 않습니다.
+    - 이미 방문한 페이지는 다시 내려가지 않으므로 순환이나 중복 링크가 있어도 끝납니다.
+    - 소비자가 느리면 출력 큐가 차서 조회도 함께 멈춥니다. 소비를 중단하면 조회도 취소됩니다.
+    - 자식 목록 조회에 실패한 부모는 건너뛰고 `errors`에 기록합니다.
+    """
+
+    def __init__(
+        self,
+        confluence_service: BaseConfluenceService,
+        concurrency: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        include_body: bool = False,
+    ):
+        self.confluence = confluence_service
+        self.concurrency = max(1, concurrency or settings.TREE_CRAWL_CONCURRENCY)
+        self.max_depth = max_depth if max_depth is not None else settings.TREE_CRAWL_MAX_DEPTH
+        self.max_pages = max_pages
+        self.expand = "version,childTypes.page,body.storage" if include_body else "version,childTypes.page"
+        self.counters = {"pages": 0, "levels": 0, "listings": 0, "leaves_skipped": 0, "duplicates": 0, "errors": 0}
+
+    @staticmethod
+    def _node(page: Dict[str, Any], parent_id: Optional[str], depth: int) -> Dict[str, Any]:
+        node = {
+            "id": page["id"],
+            "title": page.get("title"),
+            "parent_id": parent_id,
+            "depth": depth,
+            "version": page.get("version", {}).get("number"),
+        }
+        body = page.get("body", {}).get("storage", {}).get("value")
+        if body is not None:
+            node["body"] = body
+        return node
+
+    def crawl(self, page_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """page_id(깊이 0)와 그 모든 하위 페이지를 반환합니다."""
+        async def roots():
+            yield await self.confluence.get_page(page_id, expand=self.expand)
+
+        return self._walk(roots())
+
+    def crawl_space(self, space_key: str) -> AsyncIterator[Dict[str, Any]]:
+        """스페이스의 최상위 페이지들(깊이 0)과 그 모든 하위 페이지를 반환합니다."""
+        return self._walk(self.confluence.get_space_root_pages_iter(space_key, expand=self.expand))
+
+    @staticmethod
+    def _may_have_children(page: Dict[str, Any]) -> bool:
+        # childTypes를 지원하지 않는 Confluence 버전에서는 항상 조회합니다.
+        return page.get("childTypes", {}).get("page", {}).get("value", True)
+
+    async def _walk(self, roots: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        output: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 4)
+        seen: Set[str] = set()
+        stop = asyncio.Event()
+
+        async def emit(page: Dict[str, Any], parent_id: Optional[str], depth: int) -> bool:
+            """새 페이지를 출력하고, 자식 목록을 조회해야 하면 True를 반환합니다."""
+            if page["id"] in seen:
+                self.counters["duplicates"] += 1
+                return False
+            if self.max_pages is not None and len(seen) >= self.max_pages:
+                stop.set()
+                return False
+            seen.add(page["id"])
+            self.counters["pages"] += 1
+            await output.put(self._node(page, parent_id, depth))
+            if not self._may_have_children(page):
+                self.counters["leaves_skipped"] += 1
+                return False
+            return True
+
+        async def list_children(parent_id: str, depth: int, next_level: List[str]) -> None:
+            self.counters["listings"] += 1
+            try:
+                async for child in self.confluence.get_children_iter(parent_id, expand=self.expand):
+                    if stop.is_set():
+                        return
+                    if await emit(child, parent_id, depth):
+                        next_level.append(child["id"])
+            except Exception as e:
+                self.counters["errors"] += 1
+                logging.error(f"[PageTreeCrawler] 자식 페이지 조회 실패 (ID: {parent_id}): {e}")
+
+        async def produce() -> None:
+            try:
+                level: List[str] = []
+                async for page in roots:
+                    if await emit(page, None, 0):
+                        level.append(page["id"])
+                depth = 0
+                while level and depth < self.max_depth and not stop.is_set():
+                    self.counters["levels"] += 1
+                    next_level: List[str] = []
+                    parents = iter(level)
+
+                    async def worker() -> None:
+                        for parent_id in parents:
+                            if stop.is_set():
+                                return
+                            await list_children(parent_id, depth + 1, next_level)
+
+                    await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(level)))))
+                    level = next_level
+                    depth += 1
+            except Exception as e:
+                # 루트 조회 실패 등은 소비자 쪽에서 다시 발생시킵니다.
+                await output.put(e)
+                return
+            await output.put(_DONE)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                node = await output.get()
+                if node is _DONE:
+                    break
+                if isinstance(node, Exception):
+                    raise node
+                yield node
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.counters)
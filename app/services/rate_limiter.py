@@ -0,0 +1,157 @@
+import time
+import random
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any
+
+
+class CircuitOpenError(Exception):
+    """Confluence 호출이 연속으로 실패하여 회로 차단기가 열려 있을 때 발생합니다."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Confluence circuit is open; retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기할 초로 변환합니다."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """지수 백오프에 full jitter를 적용한 대기 시간을 반환합니다."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """
+    모든 Confluence 호출이 공유하는 토큰 버킷.
+
+    성공할 때마다 허용 속도를 조금씩 올리고(additive increase),
+    429를 받으면 속도를 절반으로 줄이며(multiplicative decrease) Retry-After 동안 모든 호출을 멈춥니다.
+    서버 한도 바로 아래에서 안정적으로 유지하는 것이 목적입니다.
+    """
+
+    def __init__(self, rate: float, burst: float, min_rate: float, max_rate: float, increase: float = 0.1, decrease_interval: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_interval = decrease_interval
+        self._last_decrease = 0.0
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self.counters = {"acquired": 0, "waited": 0, "throttled": 0}
+        self.total_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """요청 하나를 보낼 수 있을 때까지 기다립니다."""
+        async with self._lock:
+            waited = 0.0
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = self._blocked_until - now
+                if delay <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+            self.counters["acquired"] += 1
+            if waited:
+                self.counters["waited"] += 1
+                self.total_wait += waited
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float]) -> None:
+        self.counters["throttled"] += 1
+        now = time.monotonic()
+        # 동시에 보낸 요청들이 한꺼번에 429를 받아도 속도는 한 번만 줄입니다.
+        if now - self._last_decrease >= self.decrease_interval:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._last_decrease = now
+        self._tokens = 0.0
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate_per_s": round(self.rate, 2),
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "blocked_for_s": round(max(self._blocked_until - time.monotonic(), 0.0), 2),
+            "total_wait_s": round(self.total_wait, 2),
+            **self.counters,
+        }
+
+
+class CircuitBreaker:
+    """
+    연속 실패(5xx, 연결 오류)가 임계값을 넘으면 회로를 열어 일정 시간 동안 즉시 실패시킵니다.
+    대기 시간이 지나면 요청 하나만 시험적으로 허용(half-open)하고, 성공하면 다시 닫습니다.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self.counters = {"opened": 0, "rejected": 0}
+
+    def before_request(self) -> None:
+        if self.state == "closed":
+            return
+        elapsed = time.monotonic() - self._opened_at
+        if self.state == "open" and elapsed >= self.reset_timeout:
+            self.state = "half_open"
+        # 시험 요청이 취소 등으로 결과를 남기지 못한 경우를 대비해 일정 시간이 지나면 다시 허용합니다.
+        if self.state == "half_open" and (not self._trial_in_flight or time.monotonic() - self._trial_started > self.reset_timeout):
+            self._trial_in_flight = True
+            self._trial_started = time.monotonic()
+            return
+        self.counters["rejected"] += 1
+        raise CircuitOpenError(max(self.reset_timeout - elapsed, 0.0))
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.counters["opened"] += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, **self.counters}
@@ -0,0 +1,195 @@
+import re
+import asyncio
+import hashlib
+import logging
+from typing import Optional, List, Dict, Any, Tuple
+
+from app.core.config import settings
+from app.models.confluence_models import ReportDraft
+from .base_service import BaseConfluenceService, BaseLLMService
+from .llm_cache import LLMResponseCache
+from .session_store import estimate_tokens
+from .storage_format import storage_to_markdown
+from .token_counter import split_to_budget
+
+# 청크를 나눌 때 우선적으로 사용하는 블록 단위 경계 (닫는 태그 직후)
+_BLOCK_BOUNDARY = re.compile(r"(?<=</p>)|(?<=</li>)|(?<=</tr>)|(?<=</table>)|(?<=</h[1-6]>)|(?<=<br/>)|(?<=</ac:structured-macro>)")
+
+MAP_SYSTEM_PROMPT = "You summarize fragments of Confluence pages for a report. Answer in the language of the source text."
+REDUCE_SYSTEM_PROMPT = "You merge partial summaries into a single coherent report. Answer in the language of the summaries."
+
+
+def chunk_storage_html(html: str, max_tokens: int) -> List[str]:
+    """
+    Storage 포맷 HTML을 토큰 예산 이하의 청크로 나눕니다.
+    가능하면 블록 태그 경계에서 자르고, 하나의 블록이 예산보다 크면 글자 수 기준으로 자릅니다.
+    """
+    max_chars = max_tokens * 4
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for block in _BLOCK_BOUNDARY.split(html):
+        if not block:
+            continue
+        pieces = [block[i:i + max_chars] for i in range(0, len(block), max_chars)] if estimate_tokens(block) > max_tokens else [block]
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class SummaryCache(LLMResponseCache):
+    """
+    내용 해시를 키로 요약 결과를 저장하는 SQLite 캐시.
+    주간 보고서를 다시 생성할 때 바뀌지 않은 페이지의 청크는 LLM을 호출하지 않습니다.
+    LLM 응답 캐시와 같이 REPORT_SUMMARY_CACHE_TTL이 지나면 만료되고, REPORT_SUMMARY_CACHE_MAX_BYTES를 넘으면
+    가장 오래 사용되지 않은 요약부터 제거합니다.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        super().__init__(
+            path,
+            settings.REPORT_SUMMARY_CACHE_TTL if ttl is None else ttl,
+            settings.REPORT_SUMMARY_CACHE_MAX_BYTES if max_bytes is None else max_bytes,
+        )
+        # 크기와 시각 정보가 없던 이전 형식의 테이블은 정리할 수 없으므로 지웁니다.
+        self._conn.execute("DROP TABLE IF EXISTS summaries")
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> SummaryCache:
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = SummaryCache(settings.REPORT_SUMMARY_CACHE_PATH)
+    return _summary_cache
+
+
+class ReportService:
+    """
+    여러 페이지를 요약하여 보고서 초안을 만드는 map-reduce 요약기.
+
+    1. CQL로 찾은 페이지 본문을 동시에 조회합니다.
+    2. 본문을 토큰 예산 단위의 청크로 나눕니다. (LLM_BODY_FORMAT이 'markdown'이면 Markdown으로 변환한 뒤 나눕니다.)
+    3. (map) 각 청크를 제한된 동시성으로 요약합니다. 결과는 내용 해시로 캐시됩니다.
+    4. (reduce) 요약들을 묶음 단위로 합치는 과정을 하나가 남을 때까지 반복합니다.
+    """
+
+    def __init__(self, confluence_service: BaseConfluenceService, llm_service: BaseLLMService, cache: Optional[SummaryCache] = None):
+        self.confluence = confluence_service
+        self.llm = llm_service
+        self.cache = cache or get_summary_cache()
+        self._llm_semaphore = asyncio.Semaphore(settings.REPORT_MAP_CONCURRENCY)
+        self.counters = {"pages": 0, "chunks": 0, "llm_calls": 0, "cached_summaries": 0}
+
+    async def _summarize(self, prompt: str, system_prompt: str, *key_parts: str) -> str:
+        key = self.cache.make_key(self.llm.model_name, system_prompt, *key_parts)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            self.counters["cached_summaries"] += 1
+            return cached
+        async with self._llm_semaphore:
+            self.counters["llm_calls"] += 1
+            summary = await self.llm.complete(prompt, system_prompt=system_prompt)
+        await self.cache.set(key, summary)
+        return summary
+
+    async def _fetch_pages(self, cql: str) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(settings.REPORT_FETCH_CONCURRENCY)
+
+        async def fetch(page_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self.confluence.get_page(page_id, expand="body.storage,version")
+                except Exception as e:
+                    logging.error(f"[ReportService] 페이지 조회 실패 (ID: {page_id}): {e}")
+                    return None
+
+        tasks = []
+        async for page in self.confluence.search_pages_iter(cql, max_results=settings.REPORT_MAX_PAGES):
+            tasks.append(asyncio.create_task(fetch(page['id'])))
+        pages = await asyncio.gather(*tasks)
+        return [page for page in pages if page is not None]
+
+    async def _map(self, pages: List[Dict[str, Any]], summary_prompt: str) -> List[Tuple[str, str]]:
+        """각 청크를 요약하여 (페이지 ID, 요약) 목록을 반환합니다."""
+        jobs = []
+        for page in pages:
+            title = page['title']
+            body = page['body']['storage']['value']
+            if settings.LLM_BODY_FORMAT == "markdown":
+                chunks = split_to_budget(storage_to_markdown(body), settings.REPORT_CHUNK_TOKENS, self.llm.model_name)
+            else:
+                chunks = chunk_storage_html(body, settings.REPORT_CHUNK_TOKENS)
+            self.counters["chunks"] += len(chunks)
+            for index, chunk in enumerate(chunks, start=1):
+                part = f" ({index}/{len(chunks)})" if len(chunks) > 1 else ""
+                prompt = (
+                    f"요약 요구사항: {summary_prompt}\n\n"
+                    f"아래는 Confluence 페이지 '{title}'{part}의 내용입니다. 요구사항에 맞게 핵심을 요약하세요.\n\n{chunk}"
+                )
+                jobs.append((page['id'], self._summarize(prompt, MAP_SYSTEM_PROMPT, summary_prompt, title, chunk)))
+        summaries = await asyncio.gather(*(job for _, job in jobs))
+        return [(page_id, summary) for (page_id, _), summary in zip(jobs, summaries)]
+
+    async def _reduce(self, summaries: List[str], summary_prompt: str, report_title: str) -> str:
+        """
+        요약들을 REPORT_REDUCE_FANIN개씩 묶어 합치는 과정을 하나가 남을 때까지 반복합니다.
+        마지막 단계(묶음이 하나일 때)는 요약이 하나뿐이어도 보고서 형식으로 다듬습니다.
+        """
+        fanin = max(2, settings.REPORT_REDUCE_FANIN)
+        while True:
+            groups = [summaries[i:i + fanin] for i in range(0, len(summaries), fanin)]
+            final = len(groups) == 1
+            jobs = []
+            for group in groups:
+                joined = "\n\n---\n\n".join(group)
+                if final:
+                    instruction = (
+                        f"'{report_title}' 보고서의 본문을 Confluence Storage 포맷(HTML)으로 작성하세요. "
+                        "제목(h1)은 포함하지 말고 본문만 반환하세요."
+                    )
+                else:
+                    instruction = "아래 요약들을 중복 없이 하나의 요약으로 합치세요."
+                prompt = f"요약 요구사항: {summary_prompt}\n\n{instruction}\n\n{joined}"
+                jobs.append(self._summarize(prompt, REDUCE_SYSTEM_PROMPT, summary_prompt, instruction, joined))
+            summaries = list(await asyncio.gather(*jobs))
+            if final:
+                return summaries[0]
+
+    async def draft_summary_report(
+        self, cql: str, space_key: str, report_title: str, summary_prompt: str, parent_id: Optional[str] = None
+    ) -> ReportDraft:
+        """CQL로 찾은 페이지들을 요약한 보고서 초안을 생성합니다. 페이지를 직접 만들지는 않습니다."""
+        pages = await self._fetch_pages(cql)
+        self.counters["pages"] = len(pages)
+        if not pages:
+            return ReportDraft(title=report_title, content="<p>조건에 맞는 페이지가 없습니다.</p>", space_key=space_key, parent_id=parent_id)
+
+        mapped = await self._map(pages, summary_prompt)
+        # 같은 페이지의 청크 요약은 페이지 제목 아래에 모아서 reduce 단계로 넘깁니다.
+        by_page: Dict[str, List[str]] = {}
+        for page_id, summary in mapped:
+            by_page.setdefault(page_id, []).append(summary)
+        titles = {page['id']: page['title'] for page in pages}
+        page_summaries = [f"[{titles[page_id]}]\n" + "\n".join(parts) for page_id, parts in by_page.items()]
+
+        content = await self._reduce(page_summaries, summary_prompt, report_title)
+        logging.info(f"[ReportService] '{report_title}' 초안 생성: {self.counters}")
+        return ReportDraft(title=report_title, content=content, space_key=space_key, parent_id=parent_id)
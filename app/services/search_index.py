@@ -0,0 +1,333 @@
+import os
+import re
+import html
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Set
+
+from app.core.config import settings
+from .base_service import BaseConfluenceService
+from .sync_service import parse_when, format_cql_date
+
+try:
+    import numpy as np
+except ImportError:  # 임베딩(의미 검색)은 numpy가 설치된 경우에만 사용합니다.
+    np = None
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+
+Embedder = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def storage_to_text(storage: str) -> str:
+    """Storage 포맷 HTML에서 태그를 제거하고 검색용 평문을 만듭니다."""
+    return _SPACE.sub(" ", html.unescape(_TAG.sub(" ", storage))).strip()
+
+
+def to_match_query(query: str) -> str:
+    """사용자 입력을 FTS5 MATCH 구문으로 안전하게 변환합니다. (모든 단어 포함, 따옴표로 특수문자 무력화)"""
+    return " ".join(f'"{word}"' for word in _WORD.findall(query))
+
+
+class SearchIndex:
+    """
+    Confluence 페이지의 로컬 전문 검색(SQLite FTS5) 및 선택적 의미 검색 인덱스.
+
+    - 페이지별 버전을 기록하여 바뀐 페이지만 다시 색인합니다.
+    - 동기화 범위(CQL)별로 받은 페이지 ID를 기록해 두고, 범위에서 사라진(삭제/이동된) 페이지를 인덱스에서 뺍니다.
+    - 임베딩은 float16 NumPy 배열로 BLOB에 저장하며, 검색 시 메모리의 행렬과 코사인 유사도로 비교합니다.
+    """
+
+    def __init__(self, path: str, tokenizer: str = "unicode61"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS indexed_pages ("
+            " id INTEGER PRIMARY KEY, page_id TEXT NOT NULL UNIQUE, space_key TEXT,"
+            " title TEXT NOT NULL, version INTEGER, indexed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(title, body, tokenize='{tokenizer}')")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS page_vectors (id INTEGER PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scope_pages (scope TEXT NOT NULL, page_id TEXT NOT NULL, PRIMARY KEY (scope, page_id))"
+        )
+        self._matrix = None  # (ids, 정규화된 벡터 행렬) 캐시. 인덱스가 바뀌면 비웁니다.
+        self.counters = {"indexed": 0, "unchanged": 0, "removed": 0, "searches": 0}
+
+    # --- 쓰기 ---
+
+    def _changed(self, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """이미 같은 버전으로 색인된 페이지를 걸러냅니다."""
+        if not pages:
+            return []
+        with self._lock:
+            placeholders = ",".join("?" * len(pages))
+            known = dict(self._conn.execute(
+                f"SELECT page_id, version FROM indexed_pages WHERE page_id IN ({placeholders})",
+                [p["id"] for p in pages],
+            ).fetchall())
+        return [p for p in pages if known.get(p["id"]) != p.get("version", {}).get("number")]
+
+    def _write(self, pages: List[Dict[str, Any]], vectors: Optional[List[List[float]]] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for i, page in enumerate(pages):
+                    body = storage_to_text(page.get("body", {}).get("storage", {}).get("value", ""))
+                    row = self._conn.execute(
+                        "INSERT INTO indexed_pages (page_id, space_key, title, version, indexed_at) VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT(page_id) DO UPDATE SET space_key = excluded.space_key, title = excluded.title,"
+                        " version = excluded.version, indexed_at = excluded.indexed_at RETURNING id",
+                        (page["id"], page.get("space", {}).get("key"), page["title"], page.get("version", {}).get("number"), now),
+                    ).fetchone()
+                    self._conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (row[0],))
+                    self._conn.execute("INSERT INTO pages_fts (rowid, title, body) VALUES (?, ?, ?)", (row[0], page["title"], body))
+                    if vectors is not None:
+                        blob = np.asarray(vectors[i], dtype=np.float16).tobytes()
+                        self._conn.execute("INSERT OR REPLACE INTO page_vectors (id, vector) VALUES (?, ?)", (row[0], blob))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._matrix = None
+
+    def _delete_locked(self, page_id: str) -> bool:
+        row = self._conn.execute("SELECT id FROM indexed_pages WHERE page_id = ?", (page_id,)).fetchone()
+        self._conn.execute("DELETE FROM scope_pages WHERE page_id = ?", (page_id,))
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (row[0],))
+        self._conn.execute("DELETE FROM page_vectors WHERE id = ?", (row[0],))
+        self._conn.execute("DELETE FROM indexed_pages WHERE id = ?", (row[0],))
+        return True
+
+    def _delete(self, page_id: str) -> None:
+        with self._lock:
+            self._delete_locked(page_id)
+        self._matrix = None
+
+    def _add_to_scope(self, scope: str, page_ids: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO scope_pages (scope, page_id) VALUES (?, ?)", [(scope, i) for i in page_ids])
+
+    def _prune(self, scope: str, live_ids: Set[str]) -> int:
+        """
+        범위에 기록된 페이지 중 live_ids에 없는 페이지를 범위에서 빼고, 다른 범위에도 속하지 않으면 인덱스에서 지웁니다.
+        지운 페이지 수를 반환합니다.
+        """
+        removed = 0
+        with self._lock:
+            known = [row[0] for row in self._conn.execute("SELECT page_id FROM scope_pages WHERE scope = ?", (scope,))]
+            gone = [page_id for page_id in known if page_id not in live_ids]
+            if not gone:
+                return 0
+            self._conn.execute("BEGIN")
+            try:
+                for page_id in gone:
+                    self._conn.execute("DELETE FROM scope_pages WHERE scope = ? AND page_id = ?", (scope, page_id))
+                    if self._conn.execute("SELECT 1 FROM scope_pages WHERE page_id = ? LIMIT 1", (page_id,)).fetchone() is None:
+                        removed += self._delete_locked(page_id)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._matrix = None
+        return removed
+
+    async def upsert_pages(self, pages: List[Dict[str, Any]], embedder: Optional[Embedder] = None) -> int:
+        """
+        페이지(본문·버전·스페이스 포함)를 색인하고, 실제로 다시 색인한 페이지 수를 반환합니다.
+        embedder가 주어지고 numpy가 설치되어 있으면 임베딩도 함께 저장합니다.
+        """
+        changed = await asyncio.to_thread(self._changed, pages)
+        self.counters["unchanged"] += len(pages) - len(changed)
+        if not changed:
+            return 0
+        vectors = None
+        if embedder is not None and np is not None:
+            texts = [
+                f"{p['title']}\n{storage_to_text(p.get('body', {}).get('storage', {}).get('value', ''))}"[:settings.INDEX_EMBED_CHARS]
+                for p in changed
+            ]
+            vectors = await embedder(texts)
+        await asyncio.to_thread(self._write, changed, vectors)
+        self.counters["indexed"] += len(changed)
+        return len(changed)
+
+    async def delete_page(self, page_id: str) -> None:
+        await asyncio.to_thread(self._delete, page_id)
+
+    # --- 검색 ---
+
+    def _search(self, query: str, limit: int, space_key: Optional[str]) -> List[Dict[str, Any]]:
+        match = to_match_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT p.page_id, p.title, p.space_key, p.version,"
+            " snippet(pages_fts, 1, '[', ']', '…', 16), bm25(pages_fts, 5.0, 1.0) AS score"
+            " FROM pages_fts JOIN indexed_pages p ON p.id = pages_fts.rowid WHERE pages_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if space_key:
+            sql += " AND p.space_key = ?"
+            params.append(space_key)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"id": r[0], "title": r[1], "space_key": r[2], "version": r[3], "snippet": r[4], "score": round(-r[5], 4)}
+            for r in rows
+        ]
+
+    async def search(self, query: str, limit: int = 10, space_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """BM25 순위로 전문 검색합니다. (제목 일치에 가중치를 둡니다)"""
+        self.counters["searches"] += 1
+        return await asyncio.to_thread(self._search, query, limit, space_key)
+
+    def _load_matrix(self):
+        if self._matrix is None:
+            with self._lock:
+                rows = self._conn.execute("SELECT id, vector FROM page_vectors ORDER BY id").fetchall()
+            if not rows:
+                self._matrix = (np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32))
+            else:
+                ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+                matrix = np.vstack([np.frombuffer(r[1], dtype=np.float16) for r in rows]).astype(np.float32)
+                matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+                self._matrix = (ids, matrix)
+        return self._matrix
+
+    def _semantic_search(self, vector: List[float], limit: int) -> List[Dict[str, Any]]:
+        ids, matrix = self._load_matrix()
+        if not len(ids):
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) + 1e-8
+        scores = matrix @ query
+        top = np.argpartition(-scores, min(limit, len(scores) - 1))[:limit]
+        top = top[np.argsort(-scores[top])]
+        with self._lock:
+            placeholders = ",".join("?" * len(top))
+            meta = {r[0]: r[1:] for r in self._conn.execute(
+                f"SELECT id, page_id, title, space_key, version FROM indexed_pages WHERE id IN ({placeholders})",
+                [int(ids[i]) for i in top],
+            ).fetchall()}
+        results = []
+        for i in top:
+            row = meta.get(int(ids[i]))
+            if row:
+                results.append({"id": row[0], "title": row[1], "space_key": row[2], "version": row[3], "score": round(float(scores[i]), 4)})
+        return results
+
+    async def semantic_search(self, query: str, embedder: Embedder, limit: int = 10) -> List[Dict[str, Any]]:
+        """임베딩 코사인 유사도로 검색합니다. numpy가 없으면 RuntimeError를 발생시킵니다."""
+        if np is None:
+            raise RuntimeError("numpy is required for semantic search")
+        self.counters["searches"] += 1
+        vector = (await embedder([query]))[0]
+        return await asyncio.to_thread(self._semantic_search, vector, limit)
+
+    # --- 동기화 ---
+
+    def _get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    async def sync(self, confluence_service: BaseConfluenceService, scope_cql: Optional[str] = None, embedder: Optional[Embedder] = None) -> Dict[str, Any]:
+        """
+        마지막 동기화 이후 수정된 페이지만 `lastmodified >= X` CQL로 가져와 색인합니다.
+        커서는 범위(CQL)별로 받은 페이지의 `version.when` 중 가장 최근 값(서버 시각)으로 저장하며,
+        조회할 때는 CONFLUENCE_TIMEZONE 기준으로 표기하고 INDEX_SYNC_OVERLAP_MINUTES만큼 겹치게 조회합니다.
+        (겹쳐 조회된 페이지는 버전이 같으면 다시 색인하지 않습니다.)
+
+        증분 조회로는 삭제된 페이지를 알 수 없으므로, 마지막 정리 후 INDEX_SYNC_PRUNE_HOURS가 지났으면 범위의 페이지 ID 전체(본문 제외)를
+        조회하여 더 이상 보이지 않는 페이지를 인덱스에서 뺍니다. (전체 동기화는 받은 페이지 목록으로 바로 정리합니다)
+        """
+        scope_cql = scope_cql or settings.INDEX_SYNC_CQL
+        cursor_key = f"cursor:{scope_cql}"
+        cursor = parse_when(await asyncio.to_thread(self._get_state, cursor_key))
+        started_at = datetime.now(timezone.utc)
+        cql = scope_cql
+        if cursor is not None:
+            since = cursor - timedelta(minutes=settings.INDEX_SYNC_OVERLAP_MINUTES)
+            cql = f'({scope_cql}) and lastmodified >= "{format_cql_date(since)}"'
+
+        started = time.perf_counter()
+        seen = indexed = 0
+        seen_ids: Set[str] = set()
+        newest: Optional[datetime] = None
+        batch: List[Dict[str, Any]] = []
+        async for page in confluence_service.search_pages_iter(cql, expand="body.storage,version,space"):
+            seen += 1
+            if cursor is None:
+                seen_ids.add(page["id"])
+            when = parse_when(page.get("version", {}).get("when"))
+            if when is not None and (newest is None or when > newest):
+                newest = when
+            batch.append(page)
+            if len(batch) >= settings.CONFLUENCE_SEARCH_PAGE_SIZE:
+                indexed += await self.upsert_pages(batch, embedder)
+                await asyncio.to_thread(self._add_to_scope, scope_cql, [p["id"] for p in batch])
+                batch = []
+        if batch:
+            indexed += await self.upsert_pages(batch, embedder)
+            await asyncio.to_thread(self._add_to_scope, scope_cql, [p["id"] for p in batch])
+
+        # 전체 동기화는 받은 페이지가 곧 범위 전체이므로 그대로 정리하고, 증분 동기화는 주기마다 ID만 따로 조회합니다.
+        removed = 0
+        prune_key = f"pruned:{scope_cql}"
+        pruned_at = parse_when(await asyncio.to_thread(self._get_state, prune_key))
+        prune_due = pruned_at is None or started_at - pruned_at >= timedelta(hours=settings.INDEX_SYNC_PRUNE_HOURS)
+        if cursor is None or prune_due:
+            if cursor is None:
+                live_ids = seen_ids
+            else:
+                live_ids = {page["id"] async for page in confluence_service.search_pages_iter(scope_cql)}
+            removed = await asyncio.to_thread(self._prune, scope_cql, live_ids)
+            self.counters["removed"] += removed
+            await asyncio.to_thread(self._set_state, prune_key, started_at.isoformat())
+
+        # 받은 페이지에 수정 시각이 없으면 동기화 시작 시각을 커서로 사용합니다.
+        if newest is None and (seen or cursor is None):
+            newest = started_at
+        if newest is not None and (cursor is None or newest > cursor):
+            await asyncio.to_thread(self._set_state, cursor_key, newest.isoformat())
+        result = {"cql": cql, "seen": seen, "indexed": indexed, "removed": removed, "elapsed_s": round(time.perf_counter() - started, 2)}
+        logging.info(f"[SearchIndex] 동기화 완료: {result}")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM indexed_pages").fetchone()[0]
+            vectors = self._conn.execute("SELECT COUNT(*) FROM page_vectors").fetchone()[0]
+        return {"pages": pages, "vectors": vectors, "semantic_available": np is not None, **self.counters}
+
+
+_search_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> SearchIndex:
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex(settings.INDEX_PATH, settings.INDEX_TOKENIZER)
+    return _search_index
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any
+
+from app.core.config import settings
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 사용할 수 있는 대략적인 토큰 수 추정치 (약 4자당 1토큰)."""
+    return len(text) // 4 + 1
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+class BaseSessionStore(ABC):
+    """
+    프로바이더에 독립적인 대화 기록 저장소.
+
+    메시지는 `{"role": "user" | "assistant", "content": str}` 형식으로 저장되며,
+    세션별 토큰 한도를 넘으면 오래된 메시지부터 잘라냅니다.
+    """
+
+    def __init__(self, ttl: float, max_sessions: int, max_history_tokens: int, max_total_tokens: int):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_history_tokens = max_history_tokens
+        self.max_total_tokens = max_total_tokens
+        self.counters = {"evictions": 0, "expired": 0, "truncations": 0}
+
+    def _truncate(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """토큰 한도를 넘으면 가장 오래된 메시지부터 제거합니다. 마지막 한 턴(2개)은 항상 유지합니다."""
+        tokens = count_message_tokens(messages)
+        start = 0
+        while tokens > self.max_history_tokens and len(messages) - start > 2:
+            tokens -= estimate_tokens(messages[start]["content"])
+            start += 1
+        if start:
+            self.counters["truncations"] += 1
+        return messages[start:]
+
+    @abstractmethod
+    async def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class InMemorySessionStore(BaseSessionStore):
+    """프로세스 내 LRU/TTL 세션 저장소."""
+
+    def __init__(self, ttl: float, max_sessions: int, max_history_tokens: int, max_total_tokens: int):
+        super().__init__(ttl, max_sessions, max_history_tokens, max_total_tokens)
+        # session_id -> (messages, tokens, bytes, updated_at)
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_tokens = 0
+        self._total_bytes = 0
+
+    def _remove(self, session_id: str) -> None:
+        _, tokens, size, _ = self._sessions.pop(session_id)
+        self._total_tokens -= tokens
+        self._total_bytes -= size
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._sessions:
+            oldest = next(iter(self._sessions))
+            if now - self._sessions[oldest][3] < self.ttl:
+                break
+            self._remove(oldest)
+            self.counters["expired"] += 1
+
+    async def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        self._expire()
+        session = self._sessions.get(session_id)
+        return list(session[0]) if session else []
+
+    async def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        self._expire()
+        history = list(self._sessions[session_id][0]) if session_id in self._sessions else []
+        if session_id in self._sessions:
+            self._remove(session_id)
+        history = self._truncate(history + messages)
+        tokens = count_message_tokens(history)
+        size = sum(len(m["content"].encode("utf-8")) for m in history)
+        self._sessions[session_id] = (history, tokens, size, time.monotonic())
+        self._total_tokens += tokens
+        self._total_bytes += size
+
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self._total_tokens > self.max_total_tokens
+        ):
+            self._remove(next(iter(self._sessions)))
+            self.counters["evictions"] += 1
+
+    async def delete(self, session_id: str) -> None:
+        if session_id in self._sessions:
+            self._remove(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "sessions": len(self._sessions),
+            "total_tokens": self._total_tokens,
+            "bytes": self._total_bytes,
+            **self.counters,
+        }
+
+
+class SQLiteSessionStore(BaseSessionStore):
+    """
+    SQLite 파일 기반 세션 저장소.
+    같은 파일을 가리키면 여러 uvicorn 워커가 대화 기록을 공유할 수 있습니다.
+    """
+
+    def __init__(self, path: str, ttl: float, max_sessions: int, max_history_tokens: int, max_total_tokens: int):
+        super().__init__(ttl, max_sessions, max_history_tokens, max_total_tokens)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, messages TEXT NOT NULL,"
+            " tokens INTEGER NOT NULL, size INTEGER NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at)")
+
+    def _get_history(self, session_id: str) -> List[Dict[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT messages FROM sessions WHERE session_id = ? AND updated_at > ?",
+                (session_id, time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def _append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        with self._lock:
+            # 여러 워커가 동시에 같은 세션을 갱신하더라도 읽기-수정-쓰기가 원자적으로 이루어지도록 합니다.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT messages FROM sessions WHERE session_id = ? AND updated_at > ?",
+                    (session_id, time.time() - self.ttl),
+                ).fetchone()
+                history = self._truncate((json.loads(row[0]) if row else []) + messages)
+                serialized = json.dumps(history, ensure_ascii=False)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, messages, tokens, size, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (session_id, serialized, count_message_tokens(history), len(serialized.encode("utf-8")), time.time()),
+                )
+                self.counters["expired"] += self._conn.execute(
+                    "DELETE FROM sessions WHERE updated_at <= ?", (time.time() - self.ttl,)
+                ).rowcount
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        count, tokens = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM sessions").fetchone()
+        while count > 1 and (count > self.max_sessions or tokens > self.max_total_tokens):
+            session_id, session_tokens = self._conn.execute(
+                "SELECT session_id, tokens FROM sessions ORDER BY updated_at LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self.counters["evictions"] += 1
+            count -= 1
+            tokens -= session_tokens
+
+    def _delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    async def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        return await asyncio.to_thread(self._get_history, session_id)
+
+    async def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        await asyncio.to_thread(self._append, session_id, messages)
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(self._delete, session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions, tokens, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tokens), 0), COALESCE(SUM(size), 0) FROM sessions"
+            ).fetchone()
+        return {
+            "backend": type(self).__name__,
+            "sessions": sessions,
+            "total_tokens": tokens,
+            "bytes": size,
+            **self.counters,
+        }
+
+
+_session_store: Optional[BaseSessionStore] = None
+
+
+def get_session_store() -> BaseSessionStore:
+    """설정(SESSION_BACKEND)에 따라 프로세스 전체에서 공유되는 세션 저장소를 반환합니다."""
+    global _session_store
+    if _session_store is None:
+        backend = settings.SESSION_BACKEND.lower()
+        limits = (settings.SESSION_TTL, settings.SESSION_MAX_SESSIONS,
+                  settings.SESSION_MAX_HISTORY_TOKENS, settings.SESSION_MAX_TOTAL_TOKENS)
+        if backend == "memory":
+            _session_store = InMemorySessionStore(*limits)
+        elif backend == "sqlite":
+            _session_store = SQLiteSessionStore(settings.SESSION_SQLITE_PATH, *limits)
+        else:
+            raise ValueError(f"Unsupported session backend: {settings.SESSION_BACKEND}")
+    return _session_store
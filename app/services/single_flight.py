@@ -0,0 +1,68 @@
+import copy
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+        self.shared = False
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청들이 진행 중인 호출 하나를 공유하도록 합니다. (request coalescing)
+
+    - 호출이 끝나면 키를 바로 지우므로 결과를 캐시하지 않습니다. (캐시는 PageCache의 역할)
+    - 예외도 기다리던 모든 호출자에게 전달됩니다.
+    - 기다리던 호출자가 모두 취소되면 공유 호출도 취소합니다.
+    - 결과를 여럿이 공유한 경우 각 호출자에게 복사본을 반환하여 서로의 수정이 영향을 주지 않도록 합니다.
+    - 쓰기 이후의 호출이 쓰기 이전에 시작된 호출을 공유하지 않도록 forget으로 진행 중인 키를 목록에서 뺄 수 있습니다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.counters = {"calls": 0, "coalesced": 0, "forgotten": 0}
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            call.task.exception()  # 기다리는 호출자가 없어도 경고가 남지 않도록 예외를 소비합니다.
+
+    def forget(self, match: Callable[[Hashable], bool]) -> int:
+        """
+        match(key)가 참인 진행 중인 호출을 목록에서 뺍니다.
+        이미 기다리던 호출자는 그대로 결과를 받고, 이후의 호출자는 새로 요청합니다.
+        """
+        keys = [key for key in self._calls if match(key)]
+        for key in keys:
+            del self._calls[key]
+        self.counters["forgotten"] += len(keys)
+        return len(keys)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.counters["calls"] += 1
+        else:
+            call.shared = True
+            self.counters["coalesced"] += 1
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+        return copy.deepcopy(result) if call.shared else result
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._calls), **self.counters}
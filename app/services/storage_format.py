@@ -0,0 +1,944 @@
+import re
+import html
+from html.parser import HTMLParser
+from typing import Optional, List, Dict, Any, Tuple
+
+# 본문 내용을 그대로 렌더링하는 컨테이너 매크로
+CONTAINER_MACROS = {"expand", "details", "section", "column", "excerpt", "excerpt-include", "div"}
+# 인용 블록(> **Info:** ...)으로 표현하는 강조 매크로
+ADMONITION_MACROS = {"info": "Info", "note": "Note", "warning": "Warning", "tip": "Tip", "panel": "Panel"}
+CODE_MACROS = {"code", "noformat"}
+# 내용 없이 건너뛰는 요소
+SKIP_TAGS = {"style", "script", "ac:placeholder", "ac:task-id", "ac:emoticon"}
+INLINE_MARKS = {"strong": "**", "b": "**", "em": "*", "i": "*", "s": "~~", "del": "~~", "code": "`"}
+
+_SPACES = re.compile(r"[ \t\r\n]+")
+# 본문 글자가 Markdown 서식으로 읽히지 않도록 역슬래시로 이스케이프하는 문자
+_ESCAPED = re.compile(r"([\\`*_\[\]~])")
+# 줄 처음에 오면 제목/목록/인용/표/구분선으로 읽히는 기호
+_LEADING_MARKER = re.compile(r"^(\s*)(?:([-+#>|])|(\d+)\.)")
+_PLACEHOLDER = re.compile(r"\{\{macro:(\d+)(?::[\w.-]*)?\}\}")
+
+
+def _placeholder(index: int, name: str) -> str:
+    return f"{{{{macro:{index}:{name}}}}}"
+
+
+class StorageToMarkdown(HTMLParser):
+    """
+    Confluence Storage 포맷(XHTML)을 LLM 프롬프트용 간결한 Markdown으로 변환하는 스트리밍 변환기.
+
+    - `feed()`로 본문을 조각 단위로 넣을 수 있고, 완성된 블록의 Markdown을 바로 반환합니다.
+    - 스타일, `ac:` 속성 등 표시와 무관한 마크업은 버립니다.
+    - 코드/강조/컨테이너 매크로, 페이지 링크, 이미지, 작업 목록, 표는 Markdown으로 표현합니다.
+    - 그 밖의 매크로는 `{{이름}}` 자리표시자로 줄입니다. `macros` dict를 넘기면 원본 XML을 보관하고
+      `{{macro:번호:이름}}` 자리표시자를 사용하므로 markdown_to_storage로 되돌릴 때 그대로 복원됩니다.
+    - 되돌려 쓸 본문은 storage_to_markdown(storage, macros)으로 변환하세요. 표현할 수 없는 요소를 먼저 보관합니다.
+    - 본문 글자 속의 Markdown 기호(`* _ \\ ` [ ] ~`, 줄 처음의 `- + # > |`와 `1.`)는 역슬래시로 이스케이프하여
+      markdown_to_storage로 되돌릴 때 서식으로 바뀌지 않도록 합니다. (코드 안의 글자는 제외)
+    """
+
+    def __init__(self, macros: Optional[Dict[str, str]] = None):
+        super().__init__(convert_charrefs=False)
+        self.macros = macros
+        self._out: List[str] = []
+        self._started = False
+        self._inline: List[str] = []
+        self._marks: List[Tuple[str, int, Any]] = []  # (종류, inline 위치, 부가 정보)
+        self._heading = 0
+        self._pre = 0
+        self._quote = 0
+        self._label: Optional[str] = None
+        self._lists: List[List[Any]] = []  # [태그, 번호]
+        self._li_prefix: Optional[str] = None
+        self._list_start = False  # 최상위 목록의 첫 항목은 앞 블록과 빈 줄로 구분합니다.
+        self._tables: List[Dict[str, Any]] = []
+        self._frames: List[Dict[str, Any]] = []  # 처리 중인 매크로
+        self._capture: Optional[List[str]] = None
+        self._skip = 0
+        self._raw: Optional[List[str]] = None
+        self._raw_depth = 0
+        self._raw_name = ""
+        self._link: Optional[Dict[str, Any]] = None
+        self._image: Optional[Dict[str, str]] = None
+
+    # --- 출력 ---
+
+    def _emit(self, text: str, tight: bool = False) -> None:
+        if self._tables and self._tables[-1]["cell"] is not None:
+            self._tables[-1]["cell"].append(text)
+            return
+        if self._quote:
+            text = "\n".join(("> " * self._quote + line).rstrip() for line in text.split("\n"))
+        if self._started:
+            self._out.append("\n" if tight else "\n\n")
+        self._out.append(text)
+        self._started = True
+
+    def _flush(self) -> None:
+        raw = "".join(self._inline)
+        self._inline = []
+        self._marks = []
+        text = "\n".join(_SPACES.sub(" ", line).strip() for line in raw.split("\n")).strip()
+        if not text:
+            return
+        if self._heading:
+            text = "#" * self._heading + " " + text.replace("\n", " ")
+        if self._label:
+            text = f"**{self._label}:** {text}"
+            self._label = None
+        tight = False
+        if self._lists:
+            indent = "  " * (len(self._lists) - 1)
+            prefix = self._li_prefix or indent + "  "
+            self._li_prefix = None
+            text = prefix + text.replace("\n", "\n" + indent + "  ")
+            tight = not self._list_start
+            self._list_start = False
+        self._emit(text, tight)
+
+    def _text(self, text: str) -> None:
+        if self._raw is not None:
+            self._raw.append(text)
+        elif self._capture is not None:
+            self._capture.append(text)
+        elif self._skip:
+            return
+        elif self._pre or any(mark[0] == "code" for mark in self._marks):
+            self._inline.append(text)
+        else:
+            text = _ESCAPED.sub(r"\\\1", text.replace("\n", " "))
+            if self._at_line_start():
+                text = _LEADING_MARKER.sub(lambda m: m.group(1) + (f"\\{m.group(2)}" if m.group(2) else f"{m.group(3)}\\."), text, count=1)
+            self._inline.append(text)
+
+    def _at_line_start(self) -> bool:
+        """지금까지 모은 인라인 내용이 비었거나 줄바꿈(<br>)으로 끝나는지 확인합니다."""
+        for piece in reversed(self._inline):
+            piece = piece.rstrip(" \t")
+            if piece:
+                return piece.endswith("\n")
+        return True
+
+    def feed(self, data: str) -> str:
+        """본문 조각을 처리하고, 지금까지 완성된 블록의 Markdown을 반환합니다."""
+        super().feed(data)
+        return self._drain()
+
+    def close(self) -> str:
+        super().close()
+        self._flush()
+        return self._drain()
+
+    def _drain(self) -> str:
+        text = "".join(self._out)
+        self._out = []
+        return text
+
+    # --- HTMLParser 콜백 ---
+
+    def handle_data(self, data: str) -> None:
+        self._text(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self._text(f"&{name};" if self._raw is not None else html.unescape(f"&{name};"))
+
+    def handle_charref(self, name: str) -> None:
+        self._text(f"&#{name};" if self._raw is not None else html.unescape(f"&#{name};"))
+
+    def unknown_decl(self, data: str) -> None:
+        if self._raw is not None:
+            self._raw.append(f"<![{data}]]>")
+        elif data.startswith("CDATA["):
+            self._text(data[len("CDATA["):])
+
+    def handle_startendtag(self, tag, attrs):
+        if self._raw is not None:
+            self._raw.append(self.get_starttag_text())
+            return
+        self.handle_starttag(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._raw is not None:
+            self._raw.append(self.get_starttag_text())
+            if tag == "ac:structured-macro":
+                self._raw_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._skip += 1
+            return
+        attr = dict(attrs)
+
+        if tag == "ac:structured-macro":
+            self._start_macro(attr.get("ac:name") or "macro")
+        elif tag == "ac:parameter":
+            self._capture = []
+            self._marks.append(("param", 0, attr.get("ac:name") or ""))
+        elif tag in ("ac:plain-text-body", "ac:task-status", "ac:plain-text-link-body"):
+            self._capture = []
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._flush()
+            self._heading = int(tag[1])
+        elif tag in ("p", "div", "ac:task-body", "ac:layout-cell"):
+            if not (self._lists and tag == "ac:task-body"):
+                self._flush()
+        elif tag == "br":
+            self._inline.append("\n")
+        elif tag == "hr":
+            self._flush()
+            self._emit("---")
+        elif tag == "blockquote":
+            self._flush()
+            self._quote += 1
+        elif tag == "pre":
+            self._flush()
+            self._pre += 1
+        elif tag in ("ul", "ol", "ac:task-list"):
+            self._flush()
+            self._lists.append([tag, 0])
+            self._list_start = self._list_start or len(self._lists) == 1
+        elif tag in ("li", "ac:task"):
+            self._flush()
+            if self._lists:
+                current = self._lists[-1]
+                current[1] += 1
+                indent = "  " * (len(self._lists) - 1)
+                self._li_prefix = indent + (f"{current[1]}. " if current[0] == "ol" else "- ")
+        elif tag == "table":
+            self._flush()
+            self._tables.append({"rows": [], "row": None, "cell": None})
+        elif tag == "tr" and self._tables:
+            self._tables[-1]["row"] = []
+        elif tag in ("td", "th") and self._tables:
+            self._flush()
+            self._tables[-1]["cell"] = []
+        elif tag in INLINE_MARKS and not self._pre:
+            self._marks.append((tag, len(self._inline), None))
+        elif tag == "a":
+            self._marks.append(("a", len(self._inline), attr.get("href")))
+        elif tag == "img":
+            self._inline.append(f"![{attr.get('alt') or ''}]({attr.get('src') or ''})")
+        elif tag == "time":
+            self._inline.append(attr.get("datetime") or "")
+        elif tag == "ac:link":
+            self._link = {"target": None, "label": None, "start": len(self._inline)}
+        elif tag == "ac:image":
+            self._image = {"src": "", "alt": attr.get("ac:alt") or ""}
+        elif tag in ("ri:page", "ri:blog-post"):
+            if self._link is not None:
+                self._link["target"] = attr.get("ri:content-title")
+        elif tag == "ri:attachment":
+            if self._image is not None:
+                self._image["src"] = attr.get("ri:filename") or ""
+            elif self._link is not None:
+                self._link["target"] = attr.get("ri:filename")
+        elif tag == "ri:url" and self._image is not None:
+            self._image["src"] = attr.get("ri:value") or ""
+        elif tag == "ri:user" and self._link is not None:
+            self._link["target"] = "@" + (attr.get("ri:username") or attr.get("ri:account-id") or attr.get("ri:userkey") or "user")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._raw is not None:
+            self._raw.append(f"</{tag}>")
+            if tag == "ac:structured-macro":
+                self._raw_depth -= 1
+                if self._raw_depth == 0:
+                    self._end_raw_macro()
+            return
+        if tag in SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+            return
+
+        if tag == "ac:structured-macro":
+            self._end_macro()
+        elif tag == "ac:parameter":
+            value = "".join(self._capture or [])
+            self._capture = None
+            mark = self._marks.pop() if self._marks and self._marks[-1][0] == "param" else None
+            if mark and self._frames:
+                self._frames[-1]["params"][mark[2]] = value
+        elif tag == "ac:plain-text-body":
+            body = "".join(self._capture or [])
+            self._capture = None
+            if self._frames:
+                self._frames[-1]["body"] = body
+        elif tag == "ac:plain-text-link-body":
+            if self._link is not None:
+                self._link["label"] = "".join(self._capture or [])
+            self._capture = None
+        elif tag == "ac:task-status":
+            status = "".join(self._capture or []).strip()
+            self._capture = None
+            self._inline.append("[x] " if status == "complete" else "[ ] ")
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._flush()
+            self._heading = 0
+        elif tag in ("p", "div", "ac:layout-cell"):
+            self._flush()
+        elif tag == "blockquote":
+            self._flush()
+            self._quote = max(self._quote - 1, 0)
+        elif tag == "pre":
+            code = "".join(self._inline).strip("\n")
+            self._inline = []
+            self._pre = max(self._pre - 1, 0)
+            self._emit(f"```\n{code}\n```")
+        elif tag in ("ul", "ol", "ac:task-list"):
+            self._flush()
+            if self._lists:
+                self._lists.pop()
+        elif tag in ("li", "ac:task"):
+            self._flush()
+        elif tag in ("td", "th") and self._tables:
+            self._flush()
+            table = self._tables[-1]
+            cell = " <br> ".join(part.replace("\n", " <br> ") for part in table["cell"] or [])
+            table["cell"] = None
+            if table["row"] is not None:
+                table["row"].append(re.sub(r"(?<!\\)\|", r"\\|", cell))
+        elif tag == "tr" and self._tables:
+            table = self._tables[-1]
+            if table["row"]:
+                table["rows"].append(table["row"])
+            table["row"] = None
+        elif tag == "table" and self._tables:
+            self._flush()
+            self._emit_table(self._tables.pop())
+        elif tag in INLINE_MARKS and not self._pre:
+            self._close_mark(tag, lambda text, _: f"{INLINE_MARKS[tag]}{text}{INLINE_MARKS[tag]}")
+        elif tag == "a":
+            self._close_mark("a", lambda text, href: f"[{text}]({href})" if href else text)
+        elif tag == "ac:link" and self._link is not None:
+            link = self._link
+            self._link = None
+            label = link["label"] or "".join(self._inline[link["start"]:]).strip()
+            del self._inline[link["start"]:]
+            target = link["target"] or label
+            if target and target.startswith("@"):
+                self._inline.append(target)
+            elif target:
+                self._inline.append(f"[[{target}|{label}]]" if label and label != target else f"[[{target}]]")
+        elif tag == "ac:image" and self._image is not None:
+            self._inline.append(f"![{self._image['alt']}]({self._image['src']})")
+            self._image = None
+
+    def _close_mark(self, kind: str, render) -> None:
+        for i in range(len(self._marks) - 1, -1, -1):
+            if self._marks[i][0] == kind:
+                _, start, extra = self._marks.pop(i)
+                text = "".join(self._inline[start:])
+                del self._inline[start:]
+                stripped = text.strip()
+                if stripped:
+                    lead = " " if text[:1].isspace() else ""
+                    trail = " " if text[-1:].isspace() else ""
+                    self._inline.append(lead + render(stripped, extra) + trail)
+                else:
+                    self._inline.append(text)
+                return
+
+    # --- 매크로 ---
+
+    def _start_macro(self, name: str) -> None:
+        if name in CODE_MACROS:
+            self._frames.append({"name": name, "kind": "code", "params": {}, "body": ""})
+        elif name in ADMONITION_MACROS:
+            self._flush()
+            self._frames.append({"name": name, "kind": "admonition", "params": {}, "body": ""})
+            self._quote += 1
+            self._label = ADMONITION_MACROS[name]
+        elif name in CONTAINER_MACROS:
+            self._frames.append({"name": name, "kind": "container", "params": {}, "body": ""})
+        else:
+            self._raw = [self.get_starttag_text()]
+            self._raw_depth = 1
+            self._raw_name = name
+
+    def _end_macro(self) -> None:
+        if not self._frames:
+            return
+        frame = self._frames.pop()
+        if frame["kind"] == "code":
+            self._flush()
+            language = frame["params"].get("language", "")
+            self._emit(f"```{language}\n{frame['body'].strip(chr(10))}\n```")
+        elif frame["kind"] == "admonition":
+            self._flush()
+            self._label = None
+            self._quote = max(self._quote - 1, 0)
+
+    def _end_raw_macro(self) -> None:
+        raw = "".join(self._raw or [])
+        self._raw = None
+        if self.macros is not None:
+            index = len(self.macros) + 1
+            self.macros[str(index)] = raw
+            self._inline.append(_placeholder(index, self._raw_name))
+        else:
+            self._inline.append(f"{{{{{self._raw_name}}}}}")
+
+    def _emit_table(self, table: Dict[str, Any]) -> None:
+        rows = table["rows"]
+        if not rows:
+            return
+        width = max(len(row) for row in rows)
+        lines = []
+        for index, row in enumerate(rows):
+            lines.append("| " + " | ".join(row + [""] * (width - len(row))) + " |")
+            if index == 0:
+                lines.append("|" + "---|" * width)
+        self._emit("\n".join(lines))
+
+
+# --- 되돌려 쓰기용 보존 처리 (macros를 넘긴 경우) ---
+
+LAYOUT_TAGS = {"ac:layout", "ac:layout-section", "ac:layout-cell"}
+LIST_TAGS = {"ul", "ol", "ac:task-list"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+VOID_TAGS = {"br", "hr", "img", "col"}
+# 최상위에 있어도 문단을 나누지 않고 자리표시자를 앞뒤 글과 이어 붙이는 요소
+INLINE_TAGS = set(INLINE_MARKS) | {"a", "span", "font", "u", "sup", "sub", "time", "img", "ac:link", "ac:image", "ac:emoticon", "ac:placeholder", "ac:inline-comment-marker"}
+# 본문(ac:rich-text-body)이 있어 Markdown 블록 단위로만 다룰 수 있는 매크로
+BLOCK_MACROS = CODE_MACROS | CONTAINER_MACROS | set(ADMONITION_MACROS)
+# 목록 항목이나 표 칸 안에 있으면 Markdown 한 줄로 표현할 수 없는 요소
+NESTED_BLOCK_TAGS = {"table", "pre", "blockquote", "hr", "div"} | HEADING_TAGS | LAYOUT_TAGS
+# 되돌려 쓸 때 없어져도 표시에 영향이 없는 속성
+IGNORED_ATTRS = {"ac:local-id", "local-id"}
+IGNORED_CLASSES = {"auto-cursor-target"}
+MACRO_ATTRS = {"ac:name", "ac:schema-version", "ac:macro-id"}
+
+_CLOSE_PLACEHOLDER = re.compile(r"\{\{/macro:(\d+)\}\}")
+
+
+def _close_placeholder(index: int) -> str:
+    return f"{{{{/macro:{index}}}}}"
+
+
+def _macro_label(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "-", name.split(":")[-1]) or "macro"
+
+
+class _Element:
+    """_ElementTree가 만드는 요소. 원본 시작/끝 태그 문자열을 그대로 보관하여 raw()로 원문을 복원합니다."""
+
+    __slots__ = ("tag", "attrs", "start", "end", "children")
+
+    def __init__(self, tag: str, attrs: Dict[str, Optional[str]], start: str):
+        self.tag = tag
+        self.attrs = attrs
+        self.start = start
+        self.end = ""
+        self.children: List[Any] = []  # 원문 문자열 또는 _Element
+
+    def raw(self) -> str:
+        return self.start + "".join(child if isinstance(child, str) else child.raw() for child in self.children) + self.end
+
+    def elements(self) -> List["_Element"]:
+        return [child for child in self.children if isinstance(child, _Element)]
+
+    def has_text(self) -> bool:
+        return any(isinstance(child, str) and child.strip() for child in self.children)
+
+
+class _ElementTree(HTMLParser):
+    """Storage 포맷 본문을 원문 조각을 잃지 않는 간단한 요소 트리로 읽습니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.root = _Element("", {}, "")
+        self._stack = [self.root]
+
+    def _append(self, item: Any) -> None:
+        self._stack[-1].children.append(item)
+
+    def handle_starttag(self, tag, attrs):
+        element = _Element(tag, dict(attrs), self.get_starttag_text())
+        self._append(element)
+        if tag not in VOID_TAGS:
+            self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self._append(_Element(tag, dict(attrs), self.get_starttag_text()))
+
+    def handle_endtag(self, tag):
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                self._stack[i].end = f"</{tag}>"
+                del self._stack[i:]
+                return
+        self._append(f"</{tag}>")
+
+    def handle_data(self, data):
+        self._append(data)
+
+    def handle_entityref(self, name):
+        self._append(f"&{name};")
+
+    def handle_charref(self, name):
+        self._append(f"&#{name};")
+
+    def handle_comment(self, data):
+        self._append(f"<!--{data}-->")
+
+    def unknown_decl(self, data):
+        self._append(f"<![{data}]]>")
+
+
+def _significant(attrs: Dict[str, Optional[str]], classes: frozenset = frozenset()) -> Dict[str, Optional[str]]:
+    """되돌려 쓸 때 잃으면 안 되는 속성만 남깁니다."""
+    result = {}
+    for name, value in attrs.items():
+        if name in IGNORED_ATTRS:
+            continue
+        if name == "class" and set((value or "").split()) <= IGNORED_CLASSES | classes:
+            continue
+        result[name] = value
+    return result
+
+
+def _contains(children: List[Any], tags: set) -> bool:
+    """children 아래에 tags 요소나 본문이 있는 매크로가 있는지 확인합니다."""
+    for child in children:
+        if not isinstance(child, _Element):
+            continue
+        if child.tag in tags:
+            return True
+        if child.tag == "ac:structured-macro":
+            if (child.attrs.get("ac:name") or "") in BLOCK_MACROS:
+                return True
+            continue  # 그 밖의 매크로는 통째로 보관되므로 안쪽은 보지 않습니다.
+        if _contains(child.children, tags):
+            return True
+    return False
+
+
+def _plain_code(element: _Element) -> bool:
+    """language 외의 매개변수가 없는 code 매크로인지 확인합니다. (```언어 블록으로 그대로 되돌릴 수 있음)"""
+    if element.attrs.get("ac:name") != "code" or set(element.attrs) - MACRO_ATTRS or element.has_text():
+        return False
+    for child in element.elements():
+        if child.tag == "ac:parameter" and child.attrs.get("ac:name") == "language":
+            continue
+        if child.tag != "ac:plain-text-body":
+            return False
+    return True
+
+
+def _plain_link(element: _Element) -> bool:
+    """현재 스페이스의 페이지를 가리키는 [[제목|라벨]] 형태의 링크인지 확인합니다."""
+    children = element.elements()
+    if _significant(element.attrs) or element.has_text() or not 1 <= len(children) <= 2:
+        return False
+    page = children[0]
+    if page.tag != "ri:page" or set(page.attrs) != {"ri:content-title"} or re.search(r"[|\[\]]", page.attrs["ri:content-title"] or ""):
+        return False
+    if len(children) == 2:
+        body = children[1]
+        return body.tag == "ac:plain-text-link-body" and not body.elements() and not re.search(r"[|\]]", body.raw())
+    return True
+
+
+def _plain_image(element: _Element) -> bool:
+    """크기, 정렬 등의 속성이 없는 ![](파일명 또는 URL) 형태의 이미지인지 확인합니다."""
+    children = element.elements()
+    if _significant(element.attrs) or element.has_text() or len(children) != 1:
+        return False
+    target = children[0]
+    if target.tag == "ri:attachment" and set(target.attrs) == {"ri:filename"}:
+        value, external = target.attrs["ri:filename"] or "", False
+    elif target.tag == "ri:url" and set(target.attrs) == {"ri:value"}:
+        value, external = target.attrs["ri:value"] or "", True
+    else:
+        return False
+    return bool(value) and ("://" in value) == external and not re.search(r"[\s()]", value)
+
+
+def _plain_list(element: _Element) -> bool:
+    """항목마다 한 줄로 표현할 수 있는 목록인지 확인합니다. (중첩 목록 허용)"""
+    if _significant(element.attrs):
+        return False
+    item_tag = "ac:task" if element.tag == "ac:task-list" else "li"
+    if element.has_text():
+        return False
+    for item in element.elements():
+        if item.tag != item_tag or _significant(item.attrs):
+            return False
+        contents = item.children
+        if item_tag == "ac:task":
+            parts = item.elements()
+            if any(part.tag not in ("ac:task-id", "ac:task-status", "ac:task-body") for part in parts):
+                return False
+            body = next((part for part in parts if part.tag == "ac:task-body"), None)
+            contents = body.children if body is not None else []
+        for child in contents:
+            if not isinstance(child, _Element):
+                continue
+            if child.tag in LIST_TAGS:
+                if not _plain_list(child):
+                    return False
+            elif _contains([child], NESTED_BLOCK_TAGS | LIST_TAGS):
+                return False
+    return True
+
+
+def _plain_table(element: _Element) -> bool:
+    """첫 행이 머리글이고 병합 칸, 열 너비, 칸 속성이 없는 표인지 확인합니다. (Markdown 표로 그대로 되돌릴 수 있음)"""
+    attrs = _significant(element.attrs, frozenset({"confluenceTable"}))
+    if attrs.get("data-layout") == "default":
+        del attrs["data-layout"]
+    if attrs or element.has_text():
+        return False
+    rows: List[_Element] = []
+    for child in element.elements():
+        if child.tag in ("thead", "tbody", "tfoot") and not _significant(child.attrs) and not child.has_text():
+            rows.extend(child.elements())
+        elif child.tag == "tr":
+            rows.append(child)
+        else:
+            return False  # colgroup, caption 등
+    if not rows:
+        return False
+    width = None
+    for index, row in enumerate(rows):
+        if row.tag != "tr" or _significant(row.attrs) or row.has_text():
+            return False
+        cells = row.elements()
+        cell_tag = "th" if index == 0 else "td"
+        for cell in cells:
+            if cell.tag != cell_tag or _significant(cell.attrs, frozenset({"confluenceTh", "confluenceTd"})):
+                return False
+            if _contains(cell.children, NESTED_BLOCK_TAGS | LIST_TAGS):
+                return False
+        if not cells or (width is not None and len(cells) != width):
+            return False
+        width = len(cells)
+    return True
+
+
+class _Preserver:
+    """
+    Markdown으로 바꾸면 잃게 되는 요소를 변환 전에 `macros`에 원본 그대로 보관하고 자리표시자로 바꿉니다.
+
+    - 레이아웃, 컨테이너/강조 매크로: 여는 부분(매개변수 포함)과 닫는 부분을 보관하고, 본문은
+      `{{macro:번호:이름}}` ... `{{/macro:번호}}` 사이에 Markdown으로 남겨 LLM이 수정할 수 있게 합니다.
+    - 병합 칸이나 속성이 있는 표와 목록, 속성이 있는 문단과 인라인 요소, 사용자 멘션, 날짜(time),
+      pre, 매개변수가 있는 코드 매크로, 알 수 없는 요소: 통째로 `{{macro:번호:이름}}` 하나로 바꿉니다.
+    """
+
+    def __init__(self, macros: Dict[str, str]):
+        self.macros = macros
+
+    def preserve(self, storage: str) -> str:
+        tree = _ElementTree()
+        tree.feed(storage)
+        tree.close()
+        return self._children(tree.root.children, True)
+
+    def _stash(self, element: _Element, name: str, block: bool) -> str:
+        index = len(self.macros) + 1
+        self.macros[str(index)] = element.raw()
+        text = _placeholder(index, _macro_label(name))
+        return f"<p>{text}</p>" if block and element.tag not in INLINE_TAGS else text
+
+    def _wrap(self, name: str, opening: str, closing: str, body: List[Any]) -> str:
+        index = len(self.macros) + 1
+        self.macros[str(index)] = opening
+        self.macros[f"/{index}"] = closing
+        return f"<p>{_placeholder(index, _macro_label(name))}</p>{self._children(body, True)}<p>{_close_placeholder(index)}</p>"
+
+    def _children(self, children: List[Any], block: bool) -> str:
+        return "".join(child if isinstance(child, str) else self._element(child, block) for child in children)
+
+    def _keep(self, element: _Element, block: bool) -> str:
+        return element.start + self._children(element.children, block) + element.end
+
+    def _element(self, element: _Element, block: bool) -> str:
+        tag, attrs = element.tag, element.attrs
+        if tag == "ac:structured-macro":
+            return self._macro(element, block)
+        if tag in LAYOUT_TAGS:
+            if block and element.end:
+                return self._wrap(tag, element.start, element.end, element.children)
+            return self._stash(element, tag, block)
+        if tag in LIST_TAGS:
+            return self._keep(element, False) if _plain_list(element) else self._stash(element, tag, block)
+        if tag == "table":
+            return self._keep(element, False) if _plain_table(element) else self._stash(element, tag, block)
+        if tag in HEADING_TAGS or tag in ("p", "blockquote"):
+            return self._stash(element, tag, block) if _significant(attrs) else self._keep(element, tag == "blockquote")
+        if tag in ("thead", "tbody", "tfoot", "tr", "td", "th", "li", "ac:task", "ac:task-body"):
+            # 구조는 _plain_table, _plain_list에서 이미 확인했습니다.
+            return self._keep(element, False)
+        if tag in INLINE_MARKS or tag == "span":
+            return self._stash(element, tag, block) if _significant(attrs) else self._keep(element, False)
+        if tag == "a":
+            return self._keep(element, False) if set(attrs) == {"href"} else self._stash(element, tag, block)
+        if tag in ("br", "hr", "ac:task-id", "ac:task-status"):
+            return element.raw()
+        if tag == "ac:link":
+            if _plain_link(element):
+                return element.raw()
+            return self._stash(element, "user" if any(child.tag == "ri:user" for child in element.elements()) else "link", block)
+        if tag == "ac:image":
+            return element.raw() if _plain_image(element) else self._stash(element, "image", block)
+        return self._stash(element, tag, block)
+
+    def _macro(self, element: _Element, block: bool) -> str:
+        name = element.attrs.get("ac:name") or "macro"
+        if name in CODE_MACROS:
+            return element.raw() if _plain_code(element) else self._stash(element, name, block)
+        if name in CONTAINER_MACROS or name in ADMONITION_MACROS:
+            body = next((child for child in element.elements() if child.tag == "ac:rich-text-body"), None)
+            if block and body is not None and body.end and element.end:
+                at = element.children.index(body)
+                opening = element.start + "".join(c if isinstance(c, str) else c.raw() for c in element.children[:at]) + body.start
+                closing = body.end + "".join(c if isinstance(c, str) else c.raw() for c in element.children[at + 1:]) + element.end
+                return self._wrap(name, opening, closing, body.children)
+            return self._stash(element, name, block)
+        # 그 밖의 매크로는 StorageToMarkdown이 원본 그대로 보관합니다.
+        return element.raw()
+
+
+def storage_to_markdown(storage: str, macros: Optional[Dict[str, str]] = None) -> str:
+    """
+    Storage 포맷 본문 전체를 간결한 Markdown으로 변환합니다. (자세한 규칙은 StorageToMarkdown 참고)
+
+    `macros`를 넘기면 되돌려 쓰기용으로 변환합니다. Markdown으로 표현할 수 없는 요소(레이아웃, 매크로 매개변수,
+    사용자 멘션, 스타일, 병합된 표 등)는 원본 XML을 보관하고 자리표시자로 바꾸므로(_Preserver)
+    markdown_to_storage로 되돌려도 사라지지 않습니다.
+    """
+    if macros is not None:
+        storage = _Preserver(macros).preserve(storage)
+    converter = StorageToMarkdown(macros)
+    return converter.feed(storage) + converter.close()
+
+
+# --- Markdown -> Storage ---
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+\.)\s+(.*)$")
+_TABLE_SEPARATOR = re.compile(r"^\|?[\s:|-]+\|?$")
+_ADMONITION = re.compile(r"^\*\*(Info|Note|Warning|Tip|Panel):\*\*\s*")
+_CODE_SPAN = re.compile(r"`([^`]+)`")
+# 이스케이프된 기호 또는 코드 조각. 왼쪽부터 찾으므로 이스케이프된 `는 코드 조각을 시작하지 않습니다.
+_ESCAPE_OR_CODE_SPAN = re.compile(r"\\([\\`*_\[\]~|\-+#>.])|`([^`]+)`")
+_PAGE_LINK = re.compile(r"\[\[([^\]|]+)(?:\|([^\]]+))?\]\]")
+_IMAGE = re.compile(r"!\[([^\]]*)\]\(([^)\s]*)\)")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC = re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])")
+_STRIKE = re.compile(r"~~(.+?)~~")
+
+
+def _cdata(text: str) -> str:
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def _inline_to_storage(text: str, macros: Dict[str, str]) -> str:
+    """인라인 Markdown(강조, 코드, 링크, 이미지, 자리표시자)을 Storage 포맷으로 변환합니다. 역슬래시로 이스케이프된 기호는 글자 그대로 둡니다."""
+    stash: List[str] = []
+
+    def keep(fragment: str) -> str:
+        stash.append(fragment)
+        return f"\x00{len(stash) - 1}\x00"
+
+    text = _PLACEHOLDER.sub(lambda m: keep(macros[m.group(1)]) if m.group(1) in macros else m.group(0), text)
+    text = _CLOSE_PLACEHOLDER.sub(lambda m: keep(macros["/" + m.group(1)]) if "/" + m.group(1) in macros else m.group(0), text)
+    text = _ESCAPE_OR_CODE_SPAN.sub(
+        lambda m: keep(html.escape(m.group(1), quote=False) if m.group(1) else f"<code>{html.escape(m.group(2), quote=False)}</code>"),
+        text,
+    )
+    text = html.escape(text, quote=False)
+
+    def page_link(m: re.Match) -> str:
+        title = html.escape(html.unescape(m.group(1)))
+        body = f"<ac:plain-text-link-body>{_cdata(html.unescape(m.group(2)))}</ac:plain-text-link-body>" if m.group(2) else ""
+        return keep(f'<ac:link><ri:page ri:content-title="{title}" />{body}</ac:link>')
+
+    def image(m: re.Match) -> str:
+        src = html.escape(html.unescape(m.group(2)))
+        target = f'<ri:url ri:value="{src}" />' if "://" in src else f'<ri:attachment ri:filename="{src}" />'
+        return keep(f"<ac:image>{target}</ac:image>")
+
+    text = _PAGE_LINK.sub(page_link, text)
+    text = _IMAGE.sub(image, text)
+    text = _LINK.sub(lambda m: keep(f'<a href="{html.escape(html.unescape(m.group(2)))}">{m.group(1)}</a>'), text)
+    text = _BOLD.sub(r"<strong>\1</strong>", text)
+    text = _ITALIC.sub(r"<em>\1</em>", text)
+    text = _STRIKE.sub(r"<del>\1</del>", text)
+    text = text.replace(" &lt;br&gt; ", "<br/>").replace("&lt;br&gt;", "<br/>")
+    # 링크 글자처럼 보관된 조각 안에 다시 보관된 조각이 있을 수 있습니다.
+    while "\x00" in text:
+        text = re.sub(r"\x00(\d+)\x00", lambda m: stash[int(m.group(1))], text)
+    return text
+
+
+def _split_row(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip() for cell in re.split(r"(?<!\\)\|", line)]
+
+
+def _list_to_storage(items: List[Tuple[int, str, str]], macros: Dict[str, str]) -> str:
+    """(들여쓰기, 기호, 내용) 목록을 중첩 목록으로 변환합니다."""
+    out: List[str] = []
+    stack: List[Tuple[int, str]] = []  # (들여쓰기, 닫는 태그)
+    for indent, marker, text in items:
+        while stack and indent < stack[-1][0]:
+            out.append(f"</li>{stack.pop()[1]}")
+        task = text.startswith(("[ ] ", "[x] ", "[X] "))
+        if task:
+            tag = ("<ac:task-list>", "</ac:task-list>")
+        elif marker[0].isdigit():
+            tag = ("<ol>", "</ol>")
+        else:
+            tag = ("<ul>", "</ul>")
+        if not stack or indent > stack[-1][0]:
+            out.append(tag[0])
+            stack.append((indent, tag[1]))
+        else:
+            out.append("</li>" if stack[-1][1] != "</ac:task-list>" else "")
+        if stack[-1][1] == "</ac:task-list>":
+            status = "incomplete" if text.startswith("[ ] ") else "complete"
+            body = _inline_to_storage(text[4:], macros) if task else _inline_to_storage(text, macros)
+            out.append(f"<ac:task><ac:task-status>{status}</ac:task-status><ac:task-body>{body}</ac:task-body></ac:task>")
+        else:
+            out.append(f"<li>{_inline_to_storage(text, macros)}")
+    while stack:
+        closing = stack.pop()[1]
+        out.append(closing if closing == "</ac:task-list>" else f"</li>{closing}")
+    return "".join(out)
+
+
+def _is_block(fragment: Optional[str]) -> bool:
+    """자리표시자 하나만 있는 줄을 문단으로 감싸지 않고 보관된 원본 그대로 둘지 판단합니다."""
+    if fragment is None:
+        return False
+    tag = re.match(r"\s*<([\w:-]+)", fragment)
+    return not (tag and tag.group(1).lower() in INLINE_TAGS)
+
+
+def _check_wrappers(markdown: str, macros: Dict[str, str]) -> None:
+    """
+    여는/닫는 자리표시자 쌍(`{{macro:번호}}` ... `{{/macro:번호}}`)이 각각 한 줄을 차지하고 순서대로 짝지어져 있는지 확인합니다.
+    짝이 깨진 채로 복원하면 태그가 어긋난 본문이 만들어지므로 ValueError를 발생시킵니다.
+    """
+    for key in macros:
+        if not key.startswith("/"):
+            continue
+        index = key[1:]
+        opens = [m for m in _PLACEHOLDER.finditer(markdown) if m.group(1) == index]
+        closes = [m for m in _CLOSE_PLACEHOLDER.finditer(markdown) if m.group(1) == index]
+        paired = len(opens) == len(closes) and all(o.start() < c.start() for o, c in zip(opens, closes))
+        alone = all(
+            re.fullmatch(r"[\s>]*", markdown[markdown.rfind("\n", 0, m.start()) + 1:m.start()])
+            and not markdown[m.end():].split("\n", 1)[0].strip()
+            for m in opens + closes
+        )
+        if not paired or not alone:
+            raise ValueError(f"자리표시자 {{{{macro:{index}}}}}와 {{{{/macro:{index}}}}}의 짝이 맞지 않거나 한 줄에 단독으로 있지 않습니다.")
+
+
+def markdown_to_storage(markdown: str, macros: Optional[Dict[str, str]] = None) -> str:
+    """
+    storage_to_markdown이 만드는 Markdown(또는 LLM이 그 형식으로 작성한 글)을 Storage 포맷으로 되돌립니다.
+    `{{macro:번호:이름}}` 자리표시자는 `macros`에 보관된 원본 XML로 복원하며,
+    `{{/macro:번호}}`는 레이아웃이나 컨테이너 매크로의 닫는 부분으로 복원합니다.
+    """
+    macros = macros or {}
+    _check_wrappers(markdown, macros)
+    lines = markdown.replace("\r\n", "\n").split("\n")
+    out: List[str] = []
+    paragraph: List[str] = []
+
+    def flush_paragraph() -> None:
+        if paragraph:
+            out.append("<p>" + "<br/>".join(_inline_to_storage(line.strip(), macros) for line in paragraph) + "</p>")
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+
+        if stripped.startswith("```"):
+            flush_paragraph()
+            language = stripped[3:].strip()
+            body = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                body.append(lines[i])
+                i += 1
+            parameter = f'<ac:parameter ac:name="language">{html.escape(language)}</ac:parameter>' if language else ""
+            out.append(f'<ac:structured-macro ac:name="code">{parameter}<ac:plain-text-body>{_cdata(chr(10).join(body))}</ac:plain-text-body></ac:structured-macro>')
+            i += 1
+            continue
+
+        if not stripped:
+            flush_paragraph()
+        elif _PLACEHOLDER.fullmatch(stripped) and _is_block(macros.get(_PLACEHOLDER.fullmatch(stripped).group(1))):
+            flush_paragraph()
+            out.append(macros[_PLACEHOLDER.fullmatch(stripped).group(1)])
+        elif _CLOSE_PLACEHOLDER.fullmatch(stripped) and "/" + _CLOSE_PLACEHOLDER.fullmatch(stripped).group(1) in macros:
+            flush_paragraph()
+            out.append(macros["/" + _CLOSE_PLACEHOLDER.fullmatch(stripped).group(1)])
+        elif _HEADING.match(stripped):
+            flush_paragraph()
+            match = _HEADING.match(stripped)
+            level = len(match.group(1))
+            out.append(f"<h{level}>{_inline_to_storage(match.group(2), macros)}</h{level}>")
+        elif re.fullmatch(r"(-{3,}|\*{3,}|_{3,})", stripped):
+            flush_paragraph()
+            out.append("<hr/>")
+        elif stripped.startswith("|"):
+            flush_paragraph()
+            rows = []
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                if not _TABLE_SEPARATOR.fullmatch(lines[i].strip()):
+                    rows.append(_split_row(lines[i]))
+                i += 1
+            body = []
+            for index, row in enumerate(rows):
+                cell_tag = "th" if index == 0 else "td"
+                body.append("<tr>" + "".join(f"<{cell_tag}>{_inline_to_storage(cell, macros)}</{cell_tag}>" for cell in row) + "</tr>")
+            out.append(f"<table><tbody>{''.join(body)}</tbody></table>")
+            continue
+        elif stripped.startswith(">"):
+            flush_paragraph()
+            quoted = []
+            while i < len(lines) and lines[i].strip().startswith(">"):
+                quoted.append(re.sub(r"^\s*> ?", "", lines[i]))
+                i += 1
+            inner = "\n".join(quoted)
+            admonition = _ADMONITION.match(inner)
+            if admonition:
+                name = admonition.group(1).lower()
+                body = markdown_to_storage(inner[admonition.end():], macros)
+                out.append(f'<ac:structured-macro ac:name="{name}"><ac:rich-text-body>{body}</ac:rich-text-body></ac:structured-macro>')
+            else:
+                out.append(f"<blockquote>{markdown_to_storage(inner, macros)}</blockquote>")
+            continue
+        elif _LIST_ITEM.match(line):
+            flush_paragraph()
+            items = []
+            while i < len(lines):
+                match = _LIST_ITEM.match(lines[i])
+                if match:
+                    items.append((len(match.group(1).expandtabs(4)), match.group(2), match.group(3)))
+                elif lines[i].strip() and items and lines[i].startswith("  "):
+                    indent, marker, text = items[-1]
+                    items[-1] = (indent, marker, f"{text} <br> {lines[i].strip()}")
+                else:
+                    break
+                i += 1
+            out.append(_list_to_storage(items, macros))
+            continue
+        else:
+            paragraph.append(line)
+        i += 1
+    flush_paragraph()
+    return "".join(out)
@@ -0,0 +1,286 @@
+import os
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+from app.core.config import settings
+from app.models.confluence_models import PageChangeEvent
+from .base_service import BaseConfluenceService
+
+Subscriber = Callable[[List[PageChangeEvent]], Awaitable[None]]
+
+CQL_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def parse_when(value: Optional[str]) -> Optional[datetime]:
+    """version.when(ISO 8601) 값을 UTC datetime으로 변환합니다."""
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+
+def format_cql_date(when: datetime) -> str:
+    """
+    datetime을 CQL 날짜 문자열로 변환합니다.
+    CQL은 시간대 없는 날짜를 CONFLUENCE_USER의 프로필 시간대로 해석하므로 CONFLUENCE_TIMEZONE으로 바꿔 표기합니다.
+    """
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(ZoneInfo(settings.CONFLUENCE_TIMEZONE)).strftime(CQL_DATE_FORMAT)
+
+
+class PageStore:
+    """
+    동기화된 페이지 본문/버전과 스페이스별 커서를 보관하는 SQLite 저장소.
+    프로세스가 재시작되어도 커서가 유지되므로 마지막 동기화 이후의 변경만 다시 가져옵니다.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " page_id TEXT PRIMARY KEY, space_key TEXT NOT NULL, title TEXT NOT NULL,"
+            " version INTEGER, body TEXT NOT NULL, modified_at TEXT, synced_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_space ON pages (space_key)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sync_cursors (space_key TEXT PRIMARY KEY, cursor TEXT NOT NULL, updated_at REAL NOT NULL)")
+
+    def _versions(self, page_ids: List[str]) -> Dict[str, Optional[int]]:
+        if not page_ids:
+            return {}
+        with self._lock:
+            placeholders = ",".join("?" * len(page_ids))
+            return dict(self._conn.execute(f"SELECT page_id, version FROM pages WHERE page_id IN ({placeholders})", page_ids).fetchall())
+
+    def _upsert(self, events: List[PageChangeEvent]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO pages (page_id, space_key, title, version, body, modified_at, synced_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            e.page_id, e.space_key, e.title, e.version,
+                            e.page.get("body", {}).get("storage", {}).get("value", ""),
+                            e.page.get("version", {}).get("when"), now,
+                        )
+                        for e in events
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _get_cursor(self, space_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT cursor FROM sync_cursors WHERE space_key = ?", (space_key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_cursor(self, space_key: str, cursor: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sync_cursors (space_key, cursor, updated_at) VALUES (?, ?, ?)", (space_key, cursor, time.time()))
+
+    def _get_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT page_id, space_key, title, version, body, modified_at FROM pages WHERE page_id = ?", (page_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "space_key": row[1], "title": row[2], "version": row[3], "body": row[4], "modified_at": row[5]}
+
+    async def versions(self, page_ids: List[str]) -> Dict[str, Optional[int]]:
+        return await asyncio.to_thread(self._versions, page_ids)
+
+    async def upsert(self, events: List[PageChangeEvent]) -> None:
+        await asyncio.to_thread(self._upsert, events)
+
+    async def get_cursor(self, space_key: str) -> Optional[datetime]:
+        value = await asyncio.to_thread(self._get_cursor, space_key)
+        return datetime.fromisoformat(value) if value else None
+
+    async def set_cursor(self, space_key: str, cursor: datetime) -> None:
+        await asyncio.to_thread(self._set_cursor, space_key, cursor.isoformat())
+
+    async def get_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """로컬에 저장된 페이지를 반환합니다. 동기화되지 않은 페이지면 None을 반환합니다."""
+        return await asyncio.to_thread(self._get_page, page_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            cursors = dict(self._conn.execute("SELECT space_key, cursor FROM sync_cursors").fetchall())
+        return {"pages": pages, "cursors": cursors}
+
+
+class ChangeSyncWorker:
+    """
+    스페이스별 커서 이후에 수정된 페이지만 CQL로 가져와 로컬 저장소에 반영하고,
+    변경 이벤트를 구독자(페이지 캐시, 검색 인덱스 등)에게 전달하는 백그라운드 작업자.
+
+    - 커서는 받은 페이지의 `version.when` 중 가장 최근 값(서버 시각)으로 저장하고,
+      조회할 때는 CONFLUENCE_TIMEZONE 기준으로 표기하고 SYNC_OVERLAP_MINUTES만큼 앞당겨 분 단위 CQL 날짜를 보완합니다.
+    - 버전이 저장소와 같은 페이지는 건너뛰므로 같은 구간을 여러 번 동기화해도 결과가 같습니다.
+    - 이벤트를 구독자에게 먼저 전달한 뒤 저장소에 기록하므로, 도중에 중단되어도 재시작 시 다시 전달됩니다(at-least-once).
+    - 삭제된 페이지는 lastmodified 검색에 나타나지 않으므로 감지하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        confluence_service: BaseConfluenceService,
+        store: PageStore,
+        spaces: Optional[List[str]] = None,
+        interval: Optional[float] = None,
+    ):
+        self.confluence = confluence_service
+        self.store = store
+        self.spaces = spaces if spaces is not None else [s.strip() for s in settings.SYNC_SPACES.split(",") if s.strip()]
+        self.interval = interval if interval is not None else settings.SYNC_INTERVAL
+        self._subscribers: List[Subscriber] = []
+        self._space_locks: Dict[str, asyncio.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"runs": 0, "failed_runs": 0, "pages_seen": 0, "changes": 0, "subscriber_errors": 0}
+        self.last_results: Dict[str, Dict[str, Any]] = {}
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        """변경 이벤트 묶음을 받을 비동기 콜백을 등록합니다. 같은 콜백은 한 번만 등록됩니다."""
+        if subscriber not in self._subscribers:
+            self._subscribers.append(subscriber)
+
+    async def _publish(self, events: List[PageChangeEvent]) -> None:
+        results = await asyncio.gather(*(subscriber(events) for subscriber in self._subscribers), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.counters["subscriber_errors"] += 1
+                logging.error(f"[ChangeSyncWorker] 구독자 처리 실패: {result}")
+
+    async def _apply(self, space_key: str, pages: List[Dict[str, Any]]) -> int:
+        """바뀐 페이지만 골라 이벤트를 전달하고 저장소에 기록한 뒤, 변경 수를 반환합니다."""
+        known = await self.store.versions([p["id"] for p in pages])
+        events = []
+        for page in pages:
+            version = page.get("version", {}).get("number")
+            if page["id"] in known and known[page["id"]] == version:
+                continue
+            events.append(PageChangeEvent(
+                page_id=page["id"],
+                space_key=page.get("space", {}).get("key", space_key),
+                title=page["title"],
+                change="updated" if page["id"] in known else "created",
+                version=version,
+                previous_version=known.get(page["id"]),
+                page=page,
+            ))
+        if events:
+            await self._publish(events)
+            await self.store.upsert(events)
+        return len(events)
+
+    async def sync_space(self, space_key: str) -> Dict[str, Any]:
+        """스페이스 하나를 커서 이후로 동기화하고 결과 요약을 반환합니다."""
+        lock = self._space_locks.setdefault(space_key, asyncio.Lock())
+        async with lock:
+            started = time.perf_counter()
+            started_at = datetime.now(timezone.utc)
+            cursor = await self.store.get_cursor(space_key)
+            cql = f'space = "{space_key}" and type = page'
+            if cursor is not None:
+                since = cursor - timedelta(minutes=settings.SYNC_OVERLAP_MINUTES)
+                cql += f' and lastmodified >= "{format_cql_date(since)}"'
+            cql += " order by lastmodified"
+
+            seen = changes = 0
+            newest: Optional[datetime] = None
+            batch: List[Dict[str, Any]] = []
+            async for page in self.confluence.search_pages_iter(cql, expand="body.storage,version,space"):
+                seen += 1
+                when = parse_when(page.get("version", {}).get("when"))
+                if when is not None and (newest is None or when > newest):
+                    newest = when
+                batch.append(page)
+                if len(batch) >= settings.CONFLUENCE_SEARCH_PAGE_SIZE:
+                    changes += await self._apply(space_key, batch)
+                    batch = []
+            if batch:
+                changes += await self._apply(space_key, batch)
+
+            # 받은 페이지에 수정 시각이 없으면 동기화 시작 시각을 커서로 사용합니다.
+            if newest is None and (seen or cursor is None):
+                newest = started_at
+            if newest is not None and (cursor is None or newest > cursor):
+                await self.store.set_cursor(space_key, newest)
+
+            self.counters["runs"] += 1
+            self.counters["pages_seen"] += seen
+            self.counters["changes"] += changes
+            result = {"space_key": space_key, "seen": seen, "changes": changes, "elapsed_s": round(time.perf_counter() - started, 2)}
+            self.last_results[space_key] = result
+            return result
+
+    async def sync_all(self) -> List[Dict[str, Any]]:
+        """설정된 모든 스페이스를 동시에 동기화합니다. 한 스페이스의 실패는 다른 스페이스에 영향을 주지 않습니다."""
+        results = await asyncio.gather(*(self.sync_space(space) for space in self.spaces), return_exceptions=True)
+        summary = []
+        for space, result in zip(self.spaces, results):
+            if isinstance(result, Exception):
+                self.counters["failed_runs"] += 1
+                logging.error(f"[ChangeSyncWorker] 스페이스 동기화 실패 ({space}): {result}")
+                result = {"space_key": space, "error": str(result)}
+            summary.append(result)
+        return summary
+
+    async def _run_forever(self) -> None:
+        while True:
+            await self.sync_all()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """SYNC_INTERVAL 간격으로 동기화하는 백그라운드 작업을 시작합니다."""
+        if self._task is None and self.spaces:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "spaces": self.spaces,
+            "running": self._task is not None,
+            "last_results": self.last_results,
+            **self.counters,
+            **self.store.stats(),
+        }
+
+
+_sync_worker: Optional[ChangeSyncWorker] = None
+
+
+def get_sync_worker() -> ChangeSyncWorker:
+    global _sync_worker
+    if _sync_worker is None:
+        from .confluence_service import confluence_service
+        _sync_worker = ChangeSyncWorker(confluence_service, PageStore(settings.SYNC_STORE_PATH))
+    return _sync_worker
@@ -0,0 +1,105 @@
+import re
+from functools import lru_cache
+from typing import Optional, List
+
+try:
+    import tiktoken  # 선택 의존성: 설치되어 있으면 OpenAI 모델의 토큰 수를 정확히 계산합니다.
+except ImportError:  # pragma: no cover
+    tiktoken = None
+
+TRUNCATION_MARKER = "\n\n…(truncated)"
+_BLOCK_BOUNDARY = re.compile(r"\n\n+")
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        # 알 수 없는 모델(Gemini 등)이나 인코딩 파일을 받을 수 없는 환경에서는 추정치를 사용합니다.
+        return None
+
+
+def _heuristic_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수를 추정합니다. (session_store.estimate_tokens보다 한글 본문에 가깝게 계산)
+    영문/코드는 약 4자당 1토큰, 한글 등 비ASCII 문자는 약 1.5자당 1토큰으로 계산합니다.
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1 if text else 0
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """모델의 토크나이저로 토큰 수를 계산합니다. 사용할 수 없으면 문자 종류별 추정치를 사용합니다."""
+    encoding = _encoding(model) if model else None
+    if encoding is None:
+        return _heuristic_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _blocks(text: str) -> List[str]:
+    """문단 경계 뒤에서 나누어 원문이 그대로 이어지도록 블록 목록을 만듭니다."""
+    blocks, start = [], 0
+    for match in _BLOCK_BOUNDARY.finditer(text):
+        blocks.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        blocks.append(text[start:])
+    return blocks
+
+
+def _cut(text: str, max_tokens: int, model: Optional[str]) -> str:
+    """블록 하나가 예산보다 클 때 예산에 맞는 길이를 이분 탐색으로 찾아 자릅니다."""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def truncate_to_budget(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """
+    text가 max_tokens를 넘으면 예산 안에 들어가는 문단까지 남기고 "…(truncated)" 표시를 붙입니다.
+    예산을 넘기는 문단은 남은 예산만큼 중간에서 자릅니다.
+    """
+    if max_tokens <= 0 or count_tokens(text, model) <= max_tokens:
+        return text
+    budget = max(max_tokens - count_tokens(TRUNCATION_MARKER, model), 1)
+    kept: List[str] = []
+    used = 0
+    for block in _blocks(text):
+        tokens = count_tokens(block, model)
+        if used + tokens > budget:
+            kept.append(_cut(block, budget - used, model))
+            break
+        kept.append(block)
+        used += tokens
+    return "".join(kept).rstrip() + TRUNCATION_MARKER
+
+
+def split_to_budget(text: str, max_tokens: int, model: Optional[str] = None) -> List[str]:
+    """text를 문단 경계에서 나누어 각각 max_tokens 이하인 조각 목록으로 만듭니다."""
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for block in _blocks(text):
+        tokens = count_tokens(block, model)
+        if current and used + tokens > max_tokens:
+            chunks.append("".join(current).strip())
+            current, used = [], 0
+        while tokens > max_tokens:
+            head = _cut(block, max_tokens, model) or block[:1]
+            chunks.append(head.strip())
+            block = block[len(head):]
+            tokens = count_tokens(block, model)
+        if block:
+            current.append(block)
+            used += tokens
+    if current:
+        chunks.append("".join(current).strip())
+    return [chunk for chunk in chunks if chunk]
@@ -25,7 +25,8 @@ create_page_func = FunctionDeclaration(
         "properties": {
             "space_key": {"type": "string", "description": "페이지를 생성할 Confluence 스페이스의 키. 예: 'DEV'"},
             "title": {"type": "string", "description": "새 페이지의 제목"},
-            "content": {"type": "string", "description": "HTML 형식의 페이지 본문 내용"},
+            "content": {"type": "string", "description": "Storage 포맷(HTML) 또는 Markdown 형식의 페이지 본문 내용"},
+            "content_format": {"type": "string", "description": "content의 형식. 'storage'(기본값) 또는 'markdown'. markdown이면 검색 결과의 {{macro:번호:이름}}, {{/macro:번호}} 자리표시자를 각각 한 줄에 그대로 두어야 원본 서식이 복원됩니다."},
             "parent_id": {
                 "type": "string",
                 "description": "부모 페이지의 ID. 지정하지 않으면 최상위 페이지로 생성됩니다.",
@@ -44,7 +45,8 @@ update_page_func = FunctionDeclaration(
         "properties": {
             "page_id": {"type": "string", "description": "업데이트할 페이지의 ID"},
             "title": {"type": "string", "description": "새로운 페이지 제목"},
-            "content": {"type": "string", "description": "HTML 형식의 새로운 페이지 본문 내용"},
+            "content": {"type": "string", "description": "Storage 포맷(HTML) 또는 Markdown 형식의 새로운 페이지 본문 내용"},
+            "content_format": {"type": "string", "description": "content의 형식. 'storage'(기본값) 또는 'markdown'. markdown이면 검색 결과의 {{macro:번호:이름}}, {{/macro:번호}} 자리표시자를 각각 한 줄에 그대로 두어야 원본 서식이 복원됩니다."},
             "version": {
                 "type": "integer",
                 "description": "업데이트의 기반이 되는 현재 페이지의 버전 번호. 이 번호는 페이지를 검색하거나 조회하여 얻을 수 있습니다.",
@@ -73,7 +75,21 @@ draft_summary_report_func = FunctionDeclaration(
     },
 )
 
+# 로컬 인덱스 검색 도구 정의
+search_index_func = FunctionDeclaration(
+    name="search_index",
+    description="로컬에 동기화된 인덱스에서 키워드로 Confluence 페이지를 빠르게 검색합니다. 관련도 순으로 페이지 ID, 제목, 일치 부분(snippet)을 반환합니다. 본문 전체가 필요하면 search_pages를 사용하세요.",
+    parameters={
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "검색할 키워드. 예: '배포 절차 롤백'"},
+            "space_key": {"type": "string", "description": "검색을 제한할 스페이스 키. 생략하면 전체에서 검색합니다."},
+        },
+        "required": ["query"],
+    },
+)
+
 # Gemini 모델에 제공할 도구 목록
 confluence_tools = Tool(
-    function_declarations=[search_pages_func, create_page_func, update_page_func, draft_summary_report_func],
+    function_declarations=[search_pages_func, create_page_func, update_page_func, draft_summary_report_func, search_index_func],
 )
\ No newline at end of file
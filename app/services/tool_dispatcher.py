@@ -0,0 +1,155 @@
+import json
+import time
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any, Tuple, Union
+
+from app.core.config import settings
+from app.core.metrics import TOOL_LATENCY
+from app.core.tracing import span
+from app.models.confluence_models import PageCreate, PageUpdate, ReportDraft
+from .base_service import BaseConfluenceService, BaseLLMService
+from .report_service import ReportService
+from .search_index import get_search_index
+from .llm_cache import record_side_effect
+from .storage_format import storage_to_markdown, markdown_to_storage
+from .token_counter import truncate_to_budget
+
+
+class ToolDispatcher:
+    """
+    LLM의 함수 호출(tool call)을 ConfluenceService 메서드로 연결합니다.
+
+    한 턴에 여러 도구 호출이 오면 asyncio.gather로 동시에 실행하며,
+    결과는 TOOL_RESULT_MAX_CHARS 이내의 문자열로 잘라 프롬프트 크기를 제한합니다.
+    LLM_BODY_FORMAT이 'markdown'이면 검색된 본문을 Markdown으로 줄여 전달하고, 변환하지 못한 매크로는
+    자리표시자로 보관했다가 Markdown으로 작성된 create_page/update_page 내용에서 복원합니다.
+    질의(process_query) 하나마다 새로 생성하여 사용합니다.
+    """
+
+    def __init__(self, confluence_service: BaseConfluenceService, llm_service: BaseLLMService):
+        self.confluence = confluence_service
+        self.llm = llm_service
+        self.report_draft: Optional[ReportDraft] = None
+        self.macros: Dict[str, str] = {}
+        self.handlers = {
+            "search_pages": self._search_pages,
+            "create_page": self._create_page,
+            "update_page": self._update_page,
+            "draft_summary_report": self._draft_summary_report,
+            "search_index": self._search_index,
+        }
+
+    def _page_body(self, storage: str) -> Dict[str, Any]:
+        if settings.LLM_BODY_FORMAT != "markdown":
+            return {"body": storage}
+        markdown = storage_to_markdown(storage, self.macros)
+        body = truncate_to_budget(markdown, settings.TOOL_PAGE_MAX_TOKENS, self.llm.model_name)
+        # 잘린 본문을 그대로 update_page에 쓰면 나머지 내용이 사라지므로 모델에 알려줍니다.
+        return {"body": body, "body_format": "markdown", **({"body_truncated": True} if body != markdown else {})}
+
+    def _content(self, content: str, content_format: Optional[str]) -> str:
+        return markdown_to_storage(content, self.macros) if content_format == "markdown" else content
+
+    async def _search_pages(self, cql: str) -> Dict[str, Any]:
+        results = []
+        async for page in self.confluence.search_pages_iter(cql, expand="body.storage,version", max_results=settings.TOOL_SEARCH_MAX_RESULTS):
+            results.append({
+                "id": page["id"],
+                "title": page["title"],
+                "version": page.get("version", {}).get("number"),
+                **self._page_body(page.get("body", {}).get("storage", {}).get("value", "")),
+            })
+        return {"results": results}
+
+    async def _create_page(self, space_key: str, title: str, content: str, parent_id: Optional[str] = None, content_format: Optional[str] = None) -> Dict[str, Any]:
+        record_side_effect()
+        content = self._content(content, content_format)
+        page = await self.confluence.create_page(PageCreate(space_key=space_key, title=title, content=content, parent_id=parent_id))
+        return {"id": page.get("id"), "title": page.get("title"), "version": page.get("version", {}).get("number")}
+
+    async def _update_page(self, page_id: str, title: str, content: str, version: Optional[int] = None, content_format: Optional[str] = None) -> Dict[str, Any]:
+        version = int(version) if version is not None else None
+        record_side_effect()
+        content = self._content(content, content_format)
+        page = await self.confluence.update_page(page_id, PageUpdate(title=title, content=content, version=version))
+        return {"id": page.get("id"), "title": page.get("title"), "version": page.get("version", {}).get("number")}
+
+    async def _draft_summary_report(self, cql: str, space_key: str, report_title: str, summary_prompt: str) -> Dict[str, Any]:
+        report_service = ReportService(self.confluence, self.llm)
+        self.report_draft = await report_service.draft_summary_report(cql, space_key, report_title, summary_prompt)
+        return {"report_draft": self.report_draft.model_dump()}
+
+    async def _search_index(self, query: str, space_key: Optional[str] = None) -> Dict[str, Any]:
+        return {"results": await get_search_index().search(query, settings.TOOL_SEARCH_MAX_RESULTS, space_key)}
+
+    @staticmethod
+    def _truncate(result: Dict[str, Any]) -> str:
+        """
+        결과를 JSON 문자열로 만들고 TOOL_RESULT_MAX_CHARS를 넘지 않도록 줄입니다. 잘라도 항상 올바른 JSON을 반환합니다.
+        검색 결과는 페이지 본문을 먼저 균등하게 줄여 모든 페이지의 메타데이터가 남도록 하고,
+        그래도 넘으면 뒤쪽 항목부터 통째로 빼고 `"omitted"`에 뺀 항목 수를 적습니다.
+        (search_index 결과처럼 본문 대신 snippet만 있는 항목은 줄이지 않고 빼기만 합니다)
+        """
+        max_chars = settings.TOOL_RESULT_MAX_CHARS
+        serialized = json.dumps(result, ensure_ascii=False)
+        if len(serialized) <= max_chars:
+            return serialized
+
+        pages = result.get("results")
+        if isinstance(pages, list):
+
+            def has_body(p: Any) -> bool:
+                return isinstance(p, dict) and isinstance(p.get("body"), str)
+
+            bodies = sum(1 for p in pages if has_body(p))
+            if bodies:
+                emptied = [{**p, "body": "…"} if has_body(p) else p for p in pages]
+                overhead = len(json.dumps({**result, "results": emptied, "truncated": True}, ensure_ascii=False))
+                budget = max((max_chars - overhead) // bodies, 0)
+                pages = [
+                    {**p, "body": p["body"][:budget] + ("…" if len(p["body"]) > budget else "")} if has_body(p) else p
+                    for p in pages
+                ]
+            kept = list(pages)
+            while True:
+                omitted = len(pages) - len(kept)
+                serialized = json.dumps(
+                    {**result, "results": kept, "truncated": True, **({"omitted": omitted} if omitted else {})}, ensure_ascii=False
+                )
+                if len(serialized) <= max_chars or not kept:
+                    break
+                kept.pop()
+            if len(serialized) <= max_chars:
+                return serialized
+
+        # 목록이 아닌 결과(또는 항목을 모두 빼도 넘치는 경우)는 앞부분만 문자열로 담아 보냅니다.
+        overhead = len(json.dumps({"truncated": True, "preview": ""}, ensure_ascii=False))
+        preview = json.dumps(result, ensure_ascii=False)[:max(max_chars - overhead, 0)]
+        while len(json.dumps({"truncated": True, "preview": preview}, ensure_ascii=False)) > max_chars and preview:
+            preview = preview[:-max(len(preview) // 10, 1)]
+        return json.dumps({"truncated": True, "preview": preview}, ensure_ascii=False)
+
+    async def execute(self, name: str, arguments: Union[str, Dict[str, Any], None]) -> str:
+        """도구 하나를 실행하고 모델에 돌려줄 문자열 결과를 반환합니다. 오류도 결과로 전달합니다."""
+        handler = self.handlers.get(name)
+        if handler is None:
+            return json.dumps({"error": f"Unknown tool: {name}"})
+        started = time.perf_counter()
+        status = "ok"
+        with span("tool", tool=name) as record:
+            try:
+                args = json.loads(arguments or "{}") if isinstance(arguments, str) else dict(arguments or {})
+                return self._truncate(await handler(**args))
+            except Exception as e:
+                status = "error"
+                if record is not None:
+                    record["error"] = type(e).__name__
+                logging.error(f"[ToolDispatcher] 도구 실행 실패 ({name}): {e}")
+                return json.dumps({"error": f"{type(e).__name__}: {e}"}, ensure_ascii=False)
+            finally:
+                TOOL_LATENCY.observe(time.perf_counter() - started, tool=name, status=status)
+
+    async def execute_many(self, calls: List[Tuple[str, Union[str, Dict[str, Any], None]]]) -> List[str]:
+        """한 턴의 도구 호출들을 동시에 실행합니다. 결과 순서는 호출 순서와 같습니다."""
+        return list(await asyncio.gather(*(self.execute(name, args) for name, args in calls)))
@@ -0,0 +1,189 @@
+"""
+첨부 파일 스트리밍 업로드/다운로드의 처리량과 앱 프로세스의 최대 RSS를 파일 크기별로 측정합니다.
+
+가짜 Confluence(scripts/mock_confluence.py, 내용은 보관하지 않고 크기와 해시만 기록)를 띄우고,
+파일 크기마다 앱(uvicorn app.main:app)을 새로 띄워 다음을 실행한 뒤 앱의 최대 RSS(VmHWM)를 기록합니다.
+    POST /pages/{id}/attachments                         (요청 본문 -> multipart -> Confluence)
+    GET  /pages/{id}/attachments/{attachment_id}/download (Confluence 리다이렉트 -> 응답 본문)
+본문이 조각 단위로 전달되므로 파일 크기가 커져도 최대 RSS는 거의 그대로여야 합니다.
+
+이어서 scripts/upload_attachments.py로 여러 파일을 동시성 1과 --concurrency로 올려 소요 시간과 최대 RSS를 비교합니다.
+(Confluence 응답 지연은 --latency-ms, 파일은 임시 디렉터리에 만듭니다)
+
+사용법:
+    python scripts/bench_attachments.py [--sizes-mb 1,64,256,1024] [--files 8] [--file-mb 16] [--concurrency 4] [--latency-ms 200]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, Any, AsyncIterator
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from load_test import ROOT, SCRIPTS, free_port, read_rss_mb
+
+CHUNK = bytes(range(256)) * 256  # 64KB
+
+
+async def generated_bytes(size: int, digest: "hashlib._Hash") -> AsyncIterator[bytes]:
+    while size > 0:
+        chunk = CHUNK[:min(size, len(CHUNK))]
+        size -= len(chunk)
+        digest.update(chunk)
+        yield chunk
+
+
+async def wait_until_up(process: subprocess.Popen, url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"프로세스가 종료되었습니다: {process.args}")
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+async def bench_size(size_mb: float, page_id: str, confluence_url: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """앱을 새로 띄워 size_mb 크기 파일 하나를 올리고 내려받습니다."""
+    port = free_port()
+    app_url = f"http://127.0.0.1:{port}"
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        await wait_until_up(app, f"{app_url}/")
+        baseline = read_rss_mb(app.pid).get("VmRSS")
+        size = int(size_mb * 1024 * 1024)
+        digest = hashlib.sha256()
+        async with httpx.AsyncClient(base_url=app_url, timeout=300.0) as client:
+            started = time.perf_counter()
+            response = await client.post(
+                f"/pages/{page_id}/attachments",
+                params={"filename": f"bench-{size_mb:g}mb.bin"},
+                content=generated_bytes(size, digest),
+                headers={"Content-Type": "application/octet-stream", "Content-Length": str(size)},
+            )
+            response.raise_for_status()
+            upload_s = time.perf_counter() - started
+            attachment = response.json()
+
+            started = time.perf_counter()
+            downloaded = 0
+            async with client.stream("GET", f"/pages/{page_id}/attachments/{attachment['id']}/download") as download:
+                download.raise_for_status()
+                async for chunk in download.aiter_raw():
+                    downloaded += len(chunk)
+            download_s = time.perf_counter() - started
+
+        # 가짜 Confluence가 받은 내용의 해시로 업로드가 손상 없이 전달되었는지 확인합니다.
+        async with httpx.AsyncClient(base_url=confluence_url) as client:
+            listed = (await client.get(f"/rest/api/content/{page_id}/child/attachment", params={"filename": attachment["title"]})).json()
+        stored = listed["results"][0]
+        rss = read_rss_mb(app.pid)
+        return {
+            "size_mb": size_mb,
+            "upload_mb_per_s": round(size_mb / upload_s, 1),
+            "download_mb_per_s": round(size_mb / download_s, 1),
+            "intact": stored["sha256"] == digest.hexdigest() and downloaded == size,
+            "rss_baseline_mb": baseline,
+            "rss_peak_mb": rss.get("VmHWM"),
+            "rss_growth_mb": round(rss["VmHWM"] - baseline, 1) if baseline and "VmHWM" in rss else None,
+        }
+    finally:
+        app.terminate()
+        app.wait()
+
+
+def bench_multi_file(page_id: str, paths: list, concurrency: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """scripts/upload_attachments.py를 실행하여 소요 시간과 최대 RSS(ru_maxrss)를 측정합니다."""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SCRIPTS, "upload_attachments.py"), page_id, *paths, "--replace", "--concurrency", str(concurrency)],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    started = time.perf_counter()
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    summary = json.loads(output)["summary"]
+    return {
+        "concurrency": concurrency,
+        "files": summary["files"],
+        "failed": summary["failed"],
+        "upload_s": summary["elapsed_s"],
+        "wall_s": round(elapsed, 2),
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    confluence_port = free_port()
+    confluence_url = f"http://127.0.0.1:{confluence_port}"
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {
+            **os.environ,
+            "CONFLUENCE_URL": confluence_url,
+            "CONFLUENCE_USER": "bench",
+            "CONFLUENCE_API_TOKEN": "bench",
+            "CONFLUENCE_RATE_LIMIT": "0",
+            "PAGE_CACHE_SQLITE_PATH": os.path.join(workdir, "page_cache.sqlite3"),
+            "WRITE_ELISION_PATH": os.path.join(workdir, "page_hashes.sqlite3"),
+            "SYNC_SPACES": "",
+        }
+        mock = subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPTS, "mock_confluence.py"), "--port", str(confluence_port), "--pages", "1", "--latency-ms", str(args.latency_ms)],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            await wait_until_up(mock, f"{confluence_url}/_mock/stats")
+            async with httpx.AsyncClient(base_url=confluence_url) as client:
+                page_id = (await client.get("/rest/api/content/search", params={"cql": "type = page"})).json()["results"][0]["id"]
+
+            print("단일 파일 (앱을 통한 업로드 후 다운로드)")
+            print(f"{'size':>9} {'upload':>12} {'download':>12} {'intact':>7} {'rss base':>10} {'rss peak':>10} {'growth':>9}")
+            for size_mb in [float(s) for s in args.sizes_mb.split(",")]:
+                row = await bench_size(size_mb, page_id, confluence_url, env)
+                print(
+                    f"{size_mb:>7g}MB {row['upload_mb_per_s']:>8.1f}MB/s {row['download_mb_per_s']:>8.1f}MB/s {str(row['intact']):>7} "
+                    f"{row['rss_baseline_mb']:>8.1f}MB {row['rss_peak_mb']:>8.1f}MB {row['rss_growth_mb']:>7.1f}MB",
+                    flush=True,
+                )
+
+            paths = []
+            for i in range(args.files):
+                path = os.path.join(workdir, f"multi-{i}.bin")
+                with open(path, "wb") as f:
+                    for _ in range(int(args.file_mb * 16)):
+                        f.write(CHUNK)
+                paths.append(path)
+            print(f"\n여러 파일 (scripts/upload_attachments.py, {args.files} x {args.file_mb:g}MB, Confluence 지연 {args.latency_ms:g}ms)")
+            for concurrency in (1, args.concurrency):
+                row = bench_multi_file(page_id, paths, concurrency, env)
+                print(f"  concurrency {concurrency:>2}: {row['upload_s']:>6.2f}s ({row['failed']} failed), peak RSS {row['peak_rss_mb']:.1f}MB", flush=True)
+        finally:
+            mock.terminate()
+            mock.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="첨부 파일 스트리밍 벤치마크")
+    parser.add_argument("--sizes-mb", default="1,64,256,1024", help="쉼표로 구분한 단일 파일 크기 (MB)")
+    parser.add_argument("--files", type=int, default=8, help="동시 업로드에 사용할 파일 수")
+    parser.add_argument("--file-mb", type=float, default=16.0, help="동시 업로드 파일 하나의 크기 (MB)")
+    parser.add_argument("--concurrency", type=int, default=4, help="비교할 동시 업로드 수")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="가짜 Confluence의 요청별 지연 시간")
+    asyncio.run(main(parser.parse_args()))
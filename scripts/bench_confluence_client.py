@@ -0,0 +1,77 @@
+"""
+요청마다 새 httpx.AsyncClient를 여는 방식(before)과
+ConfluenceService의 공유 커넥션 풀(after)의 처리량(requests/sec)을 비교합니다.
+
+가짜 Confluence 서버(scripts/mock_confluence.py)를 로컬에 띄워 측정하므로 외부 네트워크가 필요 없습니다.
+
+사용법:
+    python scripts/bench_confluence_client.py [--requests 2000] [--concurrency 50]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+PORT = 8765
+os.environ.setdefault("CONFLUENCE_URL", f"http://127.0.0.1:{PORT}")
+os.environ.setdefault("CONFLUENCE_USER", "bench")
+os.environ.setdefault("CONFLUENCE_API_TOKEN", "bench")
+# 커넥션 재사용 효과만 측정하기 위해 속도 제한, 응답 캐시, 쓰기 생략(내용 해시 기록)을 끕니다.
+os.environ.setdefault("CONFLUENCE_RATE_LIMIT", "0")
+os.environ.setdefault("PAGE_CACHE_BACKEND", "none")
+os.environ.setdefault("WRITE_ELISION_ENABLED", "false")
+
+import httpx
+
+from mock_confluence import MockConfluence, MockServerThread, create_app
+from app.services.confluence_service import ConfluenceService
+
+
+async def run(label: str, fetch, total: int, concurrency: int, page_ids) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await fetch(page_ids[i % len(page_ids)])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    rps = total / elapsed
+    print(f"{label:<28} {total} requests in {elapsed:.2f}s -> {rps:,.0f} req/s")
+    return rps
+
+
+async def main(total: int, concurrency: int, page_ids):
+    service = ConfluenceService()
+
+    async def per_request_client(page_id: str):
+        # 변경 전 동작: 매 호출마다 클라이언트(및 커넥션)를 새로 만듭니다.
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{service.base_url}/content/{page_id}", auth=service.auth, headers=service.headers)
+            response.raise_for_status()
+            return response.json()
+
+    async def pooled_client(page_id: str):
+        return await service.get_page(page_id)
+
+    before = await run("before (client per request)", per_request_client, total, concurrency, page_ids)
+    await service.startup()
+    after = await run("after (shared pool)", pooled_client, total, concurrency, page_ids)
+    await service.shutdown()
+    print(f"speedup: x{after / before:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    store = MockConfluence(pages=100)
+    with MockServerThread(create_app(store), PORT):
+        asyncio.run(main(args.requests, args.concurrency, list(store.pages.keys())))
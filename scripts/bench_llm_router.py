@@ -0,0 +1,158 @@
+"""
+LLM 라우터(LLM_PROVIDER='router')의 중복 요청(hedge)이 꼬리 지연 시간을 얼마나 줄이는지 가짜 LLM 서버로 측정합니다.
+
+scripts/mock_llm.py를 별도 프로세스로 띄우고(OpenAI HTTP + Gemini gRPC), 요청의 --slow-ratio 비율이
+첫 토큰을 --slow-ms만큼 늦게 받도록 한 뒤 다음 구성의 complete()/stream_query() 지연 시간을 비교합니다.
+- OpenAIService 단독 / GeminiService 단독
+- LLMRouter (중복 요청 없음)
+- LLMRouter (중복 요청)
+
+사용법:
+    python scripts/bench_llm_router.py [--requests 1000] [--concurrency 8] [--slow-ratio 0.02] [--slow-ms 2000]
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import warnings
+from typing import List, Dict, Any, Callable, Awaitable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(int(len(sorted_values) * q), len(sorted_values) - 1)]
+
+
+async def measure(label: str, call: Callable[[int], Awaitable[None]], total: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    row = {
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "max": latencies[-1] * 1000,
+        "rps": total / elapsed,
+    }
+    print(f"{label:<34} p50 {row['p50']:7.0f}ms  p95 {row['p95']:7.0f}ms  p99 {row['p99']:7.0f}ms  max {row['max']:7.0f}ms  {row['rps']:6.1f} req/s", flush=True)
+    return row
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.core.config import settings
+    from app.services.openai_service import OpenAIService
+    from app.services.gemini_service import GeminiService
+    from app.services.llm_router import LLMRouter
+
+    openai_service = OpenAIService()
+    gemini_service = GeminiService()
+
+    async def first_chunk(service, i: int) -> None:
+        stream = service.stream_query(f"stream prompt {i}", f"bench-{i}")
+        try:
+            await stream.__anext__()
+        finally:
+            await stream.aclose()
+
+    try:
+        for name, service in (("openai", openai_service), ("gemini", gemini_service)):
+            await measure(f"complete  {name}", lambda i, s=service: s.complete(f"{name} prompt {i}"), args.requests, args.concurrency)
+
+        for hedge in (False, True):
+            settings.LLM_ROUTER_HEDGE = hedge
+            router = LLMRouter({"openai": openai_service, "gemini": gemini_service})
+            label = "router (hedge)" if hedge else "router (no hedge)"
+            await measure(f"complete  {label}", lambda i: router.complete(f"router prompt {hedge} {i}"), args.requests, args.concurrency)
+            await measure(f"stream    {label} TTFT", lambda i: first_chunk(router, i), args.requests, args.concurrency)
+            stats = router.stats()
+            print(
+                f"  routed {stats['routed']}\n"
+                f"  hedges sent {stats['hedges_sent']} ({stats['hedges_sent'] / stats['requests'] * 100:.1f}% of requests), "
+                f"won {stats['hedges_won']} (win rate {stats['hedge_win_rate']}), over budget {stats['hedges_over_budget']}",
+                flush=True,
+            )
+    finally:
+        await openai_service.shutdown()
+        await gemini_service.shutdown()
+
+
+def main(args: argparse.Namespace) -> None:
+    openai_port, gemini_port = free_port(), free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ.update({
+            "CONFLUENCE_URL": "http://127.0.0.1:9",
+            "CONFLUENCE_USER": "bench",
+            "CONFLUENCE_API_TOKEN": "bench",
+            "OPENAI_API_KEY": "mock",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+            "GOOGLE_API_KEY": "mock",
+            "GEMINI_API_ENDPOINT": f"localhost:{gemini_port}",
+            "GRPC_DEFAULT_SSL_ROOTS_FILE_PATH": os.path.join(workdir, "mock_llm.pem"),
+            "SESSION_BACKEND": "memory",
+        })
+        server = subprocess.Popen(
+            [
+                sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_llm.py"),
+                "--openai-port", str(openai_port), "--gemini-port", str(gemini_port), "--cert-dir", workdir,
+                "--ttft-ms", str(args.ttft_ms), "--tokens-per-s", "0", "--response-tokens", "50",
+                "--slow-ratio", str(args.slow_ratio), "--slow-ms", str(args.slow_ms),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    httpx.get(f"http://127.0.0.1:{openai_port}/_mock/stats", timeout=1.0)
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.1)
+            print(
+                f"{args.requests} requests, concurrency {args.concurrency}, ttft {args.ttft_ms}ms, "
+                f"{args.slow_ratio * 100:.1f}% of requests +{args.slow_ms}ms",
+                flush=True,
+            )
+            asyncio.run(run(args))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM 라우터 중복 요청 벤치마크")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--ttft-ms", type=float, default=100.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.02)
+    parser.add_argument("--slow-ms", type=float, default=2000.0)
+    main(parser.parse_args())
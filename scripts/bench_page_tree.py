@@ -0,0 +1,124 @@
+"""
+페이지 트리 탐색(PageTreeCrawler)의 처리량을 가짜 Confluence 서버로 측정합니다.
+
+가지 수 --fanout, 깊이 --depth인 합성 트리(기본 10 x 4 = 11,111 페이지)를 만들고
+- 기존 방식: `ancestor = <root>` CQL 검색을 페이지네이션으로 따라가기
+- PageTreeCrawler: 동시성 1 / 8 / 32로 `/child/page`를 레벨 단위로 탐색
+- export_space: 본문을 포함해 tar.gz로 내보내기
+의 소요 시간과 pages/s를 비교합니다. (요청당 지연 시간 --latency-ms)
+가짜 서버는 별도 프로세스로 띄워 클라이언트와 GIL을 나누지 않도록 합니다.
+
+사용법:
+    python scripts/bench_page_tree.py [--fanout 10] [--depth 4] [--latency-ms 20]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import multiprocessing
+
+import httpx
+import uvicorn
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+MOCK_PORT = 8771
+os.environ["CONFLUENCE_URL"] = f"http://127.0.0.1:{MOCK_PORT}"
+os.environ.setdefault("CONFLUENCE_USER", "bench")
+os.environ.setdefault("CONFLUENCE_API_TOKEN", "bench")
+os.environ.setdefault("CONFLUENCE_RATE_LIMIT", "0")
+os.environ.setdefault("PAGE_CACHE_BACKEND", "none")
+os.environ.setdefault("WRITE_ELISION_ENABLED", "false")
+
+from mock_confluence import MockConfluence, create_app
+from app.services.confluence_service import ConfluenceService
+from app.services.page_tree import PageTreeCrawler
+from export_space import export_space
+
+
+def build_tree(store: MockConfluence, fanout: int, depth: int) -> str:
+    root = store.add_page("TREE", "Root", "<p>root</p>")
+    level = [root["id"]]
+    for d in range(1, depth + 1):
+        next_level = []
+        for parent_id in level:
+            for i in range(fanout):
+                page = store.add_page("TREE", f"Page {parent_id}-{i}", f"<h2>Level {d}</h2><p>{'내용 ' * 100}</p>", parent_id)
+                next_level.append(page["id"])
+        level = next_level
+    return root["id"]
+
+
+def serve(fanout: int, depth: int, latency_ms: float, ready) -> None:
+    store = MockConfluence(latency_ms=latency_ms)
+    ready.put((build_tree(store, fanout, depth), len(store.pages)))
+    uvicorn.run(create_app(store), host="127.0.0.1", port=MOCK_PORT, log_level="warning")
+
+
+def wait_until_up(timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(f"{os.environ['CONFLUENCE_URL']}/docs", timeout=1.0)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def report(name: str, pages: int, elapsed: float) -> None:
+    print(f"{name:<32} {pages:>7} pages  {elapsed:7.2f}s  {pages / elapsed:8.1f} pages/s", flush=True)
+
+
+async def run(root_id: str, total: int) -> None:
+    service = ConfluenceService()
+    try:
+        started = time.perf_counter()
+        found = 0
+        async for _ in service.search_pages_iter(f"ancestor = {root_id}", expand="version"):
+            found += 1
+        report("CQL ancestor search", found + 1, time.perf_counter() - started)
+
+        for concurrency in (1, 8, 32):
+            crawler = PageTreeCrawler(service, concurrency=concurrency)
+            started = time.perf_counter()
+            count = 0
+            async for _ in crawler.crawl(root_id):
+                count += 1
+            assert count == total, (count, total)
+            report(f"crawler (concurrency={concurrency})", count, time.perf_counter() - started)
+        print(f"  {crawler.stats()}", flush=True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = await export_space(service, "TREE", os.path.join(tmp, "tree.tar.gz"), concurrency=32)
+            report("export_space (bodies, tar.gz)", summary["pages"], summary["elapsed_s"])
+            print(f"  body {summary['body_bytes'] / 1e6:.1f} MB -> archive {summary['archive_bytes'] / 1e6:.2f} MB")
+    finally:
+        await service.shutdown()
+
+
+def main(fanout: int, depth: int, latency_ms: float) -> None:
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(fanout, depth, latency_ms, ready), daemon=True)
+    server.start()
+    try:
+        root_id, total = ready.get(timeout=120)
+        wait_until_up()
+        print(f"tree: fanout {fanout}, depth {depth}, {total} pages, latency {latency_ms} ms/request", flush=True)
+        asyncio.run(run(root_id, total))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="페이지 트리 탐색 벤치마크")
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    main(args.fanout, args.depth, args.latency_ms)
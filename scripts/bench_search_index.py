@@ -0,0 +1,111 @@
+"""
+로컬 검색 인덱스(SearchIndex)의 색인 시간과 질의 지연 시간(p50/p95)을 측정합니다.
+
+합성 페이지(기본 100,000개)를 색인한 뒤 무작위 키워드 질의를 실행하고,
+같은 질의를 본문 전체를 순회하는 단순 부분 문자열 검색(before)과 비교합니다.
+numpy가 설치되어 있으면 가짜 임베딩으로 의미 검색 지연 시간도 측정합니다.
+
+사용법:
+    python scripts/bench_search_index.py [--pages 100000] [--queries 200] [--dim 256]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("CONFLUENCE_URL", "http://127.0.0.1")
+os.environ.setdefault("CONFLUENCE_USER", "bench")
+os.environ.setdefault("CONFLUENCE_API_TOKEN", "bench")
+
+from app.services.search_index import SearchIndex, storage_to_text, np
+
+WORDS = [f"w{i}" for i in range(20000)] + ["배포", "롤백", "회의록", "장애", "릴리스", "온보딩", "아키텍처", "보안"]
+
+
+def make_page(i: int, rng: random.Random):
+    words = rng.choices(WORDS, k=300)
+    paragraphs = "".join(f"<p>{' '.join(words[j:j + 30])}</p>" for j in range(0, len(words), 30))
+    return {
+        "id": str(i),
+        "title": f"Page {i} {' '.join(rng.choices(WORDS, k=4))}",
+        "space": {"key": f"S{i % 20}"},
+        "version": {"number": 1},
+        "body": {"storage": {"value": paragraphs}},
+    }
+
+
+def percentile(samples, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+async def main(pages: int, queries: int, dim: int):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.sqlite3")
+        index = SearchIndex(path)
+        vector_rng = np.random.default_rng(42) if np is not None else None
+
+        async def fake_embedder(texts):
+            return vector_rng.standard_normal((len(texts), dim)).astype(np.float32).tolist()
+
+        embedder = fake_embedder if np is not None else None
+        corpus = []
+        started = time.perf_counter()
+        for offset in range(0, pages, 1000):
+            batch = [make_page(i, rng) for i in range(offset, min(offset + 1000, pages))]
+            corpus.extend(storage_to_text(p["body"]["storage"]["value"]) for p in batch)
+            await index.upsert_pages(batch, embedder)
+        build = time.perf_counter() - started
+        size_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1024 / 1024
+        print(f"indexed {pages:,} pages in {build:.1f}s ({pages / build:,.0f} pages/s), {size_mb:.0f} MB on disk")
+
+        started = time.perf_counter()
+        unchanged = await index.upsert_pages([make_page(i, random.Random(i)) for i in range(1000)])
+        print(f"re-sync of 1,000 unchanged pages: {unchanged} re-indexed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        terms = [" ".join(rng.choices(WORDS, k=2)) for _ in range(queries)]
+
+        fts = []
+        for term in terms:
+            t = time.perf_counter()
+            await index.search(term, limit=10)
+            fts.append(time.perf_counter() - t)
+
+        scan = []
+        for term in terms[:max(queries // 10, 5)]:
+            t = time.perf_counter()
+            parts = term.split()
+            [i for i, text in enumerate(corpus) if all(part in text for part in parts)][:10]
+            scan.append(time.perf_counter() - t)
+
+        print(f"{'before (substring scan)':<28} p50 {percentile(scan, 0.5):8.1f} ms  p95 {percentile(scan, 0.95):8.1f} ms")
+        print(f"{'after (FTS5 bm25)':<28} p50 {percentile(fts, 0.5):8.1f} ms  p95 {percentile(fts, 0.95):8.1f} ms")
+
+        if np is not None:
+            semantic = []
+            for term in terms:
+                t = time.perf_counter()
+                await index.semantic_search(term, fake_embedder, limit=10)
+                semantic.append(time.perf_counter() - t)
+            # 첫 질의는 벡터 행렬을 메모리에 올리는 시간이 포함되므로 분리해서 표시합니다.
+            print(f"{'semantic (dim ' + str(dim) + ')':<28} p50 {percentile(semantic[1:], 0.5):8.1f} ms  "
+                  f"p95 {percentile(semantic[1:], 0.95):8.1f} ms  (first query {semantic[0] * 1000:.0f} ms)")
+        else:
+            print("numpy is not installed; skipping semantic search")
+        print(f"mean FTS latency: {statistics.mean(fts) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=256)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.queries, args.dim))
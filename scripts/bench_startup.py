@@ -0,0 +1,83 @@
+"""
+LLM 서비스의 기동 비용을 측정합니다.
+
+- import: `app.main`을 import하는 데 걸리는 시간과 최대 메모리(RSS)
+  - before: 예전 llm_factory처럼 두 프로바이더 SDK를 모두 import
+  - after: 설정된 프로바이더의 SDK만 필요할 때 import
+- request: `/llm/execute` 한 번에 해당하는 서비스 준비 비용
+  - before: 요청마다 서비스(및 SDK 클라이언트)를 새로 생성
+  - after: 프로세스 수명 동안 캐시된 인스턴스 재사용
+
+각 측정은 깨끗한 상태를 위해 별도의 파이썬 프로세스에서 실행됩니다. 실제 LLM API는 호출하지 않습니다.
+
+사용법:
+    python scripts/bench_startup.py [--provider openai|gemini] [--requests 20]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+IMPORT_SNIPPET = """
+import sys, time, json, resource
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import app.main
+if {eager}:
+    import app.services.gemini_service, app.services.openai_service
+elapsed = time.perf_counter() - started
+print(json.dumps({{"import_ms": elapsed * 1000, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+REQUEST_SNIPPET = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+from app.services import llm_factory
+timings = []
+for _ in range({requests}):
+    started = time.perf_counter()
+    if {per_request}:
+        llm_factory._create_llm_service({provider!r})
+    else:
+        llm_factory.get_llm_service()
+    timings.append((time.perf_counter() - started) * 1000)
+print(json.dumps({{"first_ms": timings[0], "avg_rest_ms": sum(timings[1:]) / max(len(timings) - 1, 1)}}))
+"""
+
+
+def run_snippet(code: str, provider: str) -> dict:
+    env = {
+        **os.environ,
+        "CONFLUENCE_URL": "http://127.0.0.1",
+        "CONFLUENCE_USER": "bench",
+        "CONFLUENCE_API_TOKEN": "bench",
+        "LLM_PROVIDER": provider,
+        "OPENAI_API_KEY": "bench",
+        "GOOGLE_API_KEY": "bench",
+    }
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(provider: str, requests: int, repeat: int) -> None:
+    for label, eager in (("before (eager SDK imports)", True), ("after (lazy SDK import)", False)):
+        runs = [run_snippet(IMPORT_SNIPPET.format(root=ROOT, eager=eager), provider) for _ in range(repeat)]
+        import_ms = sorted(r["import_ms"] for r in runs)[len(runs) // 2]
+        rss = max(r["max_rss_mb"] for r in runs)
+        print(f"import  {label:<32} {import_ms:8.1f} ms (median of {repeat})  max RSS {rss:.1f} MB")
+
+    for label, per_request in (("before (service per request)", True), ("after (cached singleton)", False)):
+        result = run_snippet(REQUEST_SNIPPET.format(root=ROOT, requests=requests, per_request=per_request, provider=provider), provider)
+        print(f"request {label:<32} first {result['first_ms']:8.1f} ms  following avg {result['avg_rest_ms']:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", default="openai", choices=["openai", "gemini"])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.provider, args.requests, args.repeat)
@@ -0,0 +1,106 @@
+"""
+Storage 포맷 ↔ Markdown 변환기(storage_format)의 처리량과 프롬프트 크기 절감량을 측정합니다.
+
+표, 매크로, 인라인 스타일이 섞인 큰 합성 페이지를 만들어
+- storage → markdown, markdown → storage 변환 처리량(MB/s)
+- 원본 대비 Markdown의 문자 수와 토큰 수(count_tokens) 감소율
+- TOOL_PAGE_MAX_TOKENS 예산으로 자를 때의 시간
+을 출력합니다. tiktoken이 설치되어 있으면 --model의 토크나이저로, 아니면 추정치로 토큰을 셉니다.
+
+사용법:
+    python scripts/bench_storage_format.py [--sections 400] [--rounds 5] [--model gpt-4o-mini]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("CONFLUENCE_URL", "http://127.0.0.1")
+os.environ.setdefault("CONFLUENCE_USER", "bench")
+os.environ.setdefault("CONFLUENCE_API_TOKEN", "bench")
+
+from app.services.storage_format import StorageToMarkdown, storage_to_markdown, markdown_to_storage
+from app.services.token_counter import count_tokens, truncate_to_budget, tiktoken
+
+WORDS = ["배포", "롤백", "회의록", "장애", "릴리스", "온보딩", "release", "deploy", "cluster", "latency", "owner", "status"]
+
+
+def make_section(i: int, rng: random.Random) -> str:
+    def words(k: int) -> str:
+        return " ".join(rng.choices(WORDS, k=k))
+
+    style = 'style="text-align: left;" class="auto-cursor-target"'
+    rows = "".join(
+        f'<tr><td class="confluenceTd" style="background-color: #f4f5f7;"><p {style}>{words(3)}</p></td>'
+        f'<td class="confluenceTd"><p><span style="color: rgb(23,43,77);">{words(5)}</span></p></td>'
+        f'<td class="confluenceTd"><ac:structured-macro ac:name="status" ac:schema-version="1" ac:macro-id="{i}-{r}">'
+        f'<ac:parameter ac:name="colour">Green</ac:parameter><ac:parameter ac:name="title">DONE</ac:parameter></ac:structured-macro></td></tr>'
+        for r in range(6)
+    )
+    return (
+        f'<h2 id="section-{i}" style="margin-top: 20px;">섹션 {i} {words(2)}</h2>'
+        f'<p {style}><span style="color: rgb(23,43,77);">{words(40)}</span> <strong>{words(3)}</strong> '
+        f'<a href="https://example.com/issues/{i}" data-card-appearance="inline">{words(2)}</a></p>'
+        f'<ac:structured-macro ac:name="info" ac:schema-version="1" ac:macro-id="info-{i}"><ac:rich-text-body><p {style}>{words(20)}</p></ac:rich-text-body></ac:structured-macro>'
+        f'<ul><li><p {style}>{words(8)}</p></li><li><p {style}>{words(8)}</p><ul><li>{words(6)}</li></ul></li></ul>'
+        f'<table data-layout="default" data-table-width="760" class="wrapped confluenceTable"><colgroup><col style="width: 200px;"/><col/><col/></colgroup>'
+        f'<tbody><tr><th class="confluenceTh"><p><strong>항목</strong></p></th><th class="confluenceTh">설명</th><th class="confluenceTh">상태</th></tr>{rows}</tbody></table>'
+        f'<ac:structured-macro ac:name="code" ac:schema-version="1"><ac:parameter ac:name="language">python</ac:parameter>'
+        f'<ac:plain-text-body><![CDATA[def handler_{i}(event):\n    return {{"status": "{rng.choice(WORDS)}"}}]]></ac:plain-text-body></ac:structured-macro>'
+    )
+
+
+def timed(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(sections: int, rounds: int, model: str, budget: int):
+    rng = random.Random(42)
+    storage = "".join(make_section(i, rng) for i in range(sections))
+    storage_mb = len(storage.encode("utf-8")) / 1e6
+
+    macros = {}
+    markdown = storage_to_markdown(storage, macros)
+    markdown_mb = len(markdown.encode("utf-8")) / 1e6
+
+    to_md = timed(lambda: storage_to_markdown(storage, {}), rounds)
+    to_storage = timed(lambda: markdown_to_storage(markdown, macros), rounds)
+
+    def streamed():
+        converter = StorageToMarkdown({})
+        for i in range(0, len(storage), 64 * 1024):
+            converter.feed(storage[i:i + 64 * 1024])
+        converter.close()
+
+    to_md_stream = timed(streamed, rounds)
+
+    storage_tokens = count_tokens(storage, model)
+    markdown_tokens = count_tokens(markdown, model)
+    truncate = timed(lambda: truncate_to_budget(markdown, budget, model), rounds)
+
+    print(f"page: {sections} sections, storage {storage_mb:.2f} MB, markdown {markdown_mb:.2f} MB, {len(macros)} stashed macros")
+    print(f"tokenizer: {'tiktoken/' + model if tiktoken is not None else 'heuristic'}")
+    print(f"storage -> markdown          : {to_md * 1000:8.1f} ms  ({storage_mb / to_md:6.1f} MB/s)")
+    print(f"storage -> markdown (64KB)   : {to_md_stream * 1000:8.1f} ms  ({storage_mb / to_md_stream:6.1f} MB/s)")
+    print(f"markdown -> storage          : {to_storage * 1000:8.1f} ms  ({markdown_mb / to_storage:6.1f} MB/s)")
+    print(f"chars : {len(storage):>10,} -> {len(markdown):>10,}  (-{(1 - len(markdown) / len(storage)) * 100:.1f}%)")
+    print(f"tokens: {storage_tokens:>10,} -> {markdown_tokens:>10,}  (-{(1 - markdown_tokens / storage_tokens) * 100:.1f}%)")
+    print(f"truncate_to_budget({budget})  : {truncate * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Storage ↔ Markdown 변환 벤치마크")
+    parser.add_argument("--sections", type=int, default=400, help="합성 페이지의 섹션 수 (섹션당 약 5KB)")
+    parser.add_argument("--rounds", type=int, default=5, help="반복 횟수 (가장 빠른 값을 사용)")
+    parser.add_argument("--model", default="gpt-4o-mini", help="토큰 수를 셀 모델 이름")
+    parser.add_argument("--budget", type=int, default=2000, help="truncate_to_budget 토큰 예산")
+    args = parser.parse_args()
+    main(args.sections, args.rounds, args.model, args.budget)
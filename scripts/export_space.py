@@ -0,0 +1,108 @@
+"""
+스페이스 전체(또는 한 페이지의 하위 트리)를 압축 아카이브(tar.gz/tar.xz/tar.bz2)로 내보냅니다.
+
+PageTreeCrawler로 최상위 페이지부터 레벨 단위로 동시에 내려가며 본문을 받아, 받는 즉시 아카이브에 씁니다.
+아카이브 구조:
+    <space>/pages/<id>.xml     Storage 포맷 본문
+    <space>/pages/<id>.md      --markdown을 주면 Markdown 변환본도 함께 저장
+    <space>/manifest.jsonl     페이지별 id, title, parent_id, depth, version, path (레벨 순서)
+내보내기가 끝나야 최종 파일 이름으로 바뀌므로, 중간에 실패해도 불완전한 아카이브가 남지 않습니다.
+
+사용법:
+    python scripts/export_space.py DEV [--output DEV.tar.gz] [--root 12345] [--concurrency 8] [--compression gz] [--markdown]
+"""
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import tarfile
+import argparse
+from typing import Optional, Dict, Any
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+from app.services.confluence_service import ConfluenceService
+from app.services.page_tree import PageTreeCrawler
+from app.services.storage_format import storage_to_markdown
+
+
+def _add_file(tar: tarfile.TarFile, name: str, data: bytes, mtime: float) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = mtime
+    tar.addfile(info, io.BytesIO(data))
+
+
+async def export_space(
+    confluence_service: ConfluenceService,
+    space_key: str,
+    output: str,
+    root_id: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    compression: str = "gz",
+    markdown: bool = False,
+) -> Dict[str, Any]:
+    """space_key(또는 root_id 하위 트리)를 output 아카이브로 내보내고 요약을 반환합니다."""
+    crawler = PageTreeCrawler(confluence_service, concurrency=concurrency, include_body=True)
+    nodes = crawler.crawl(root_id) if root_id else crawler.crawl_space(space_key)
+    manifest = io.BytesIO()
+    body_bytes = 0
+    started = time.perf_counter()
+    partial = f"{output}.partial"
+    try:
+        with tarfile.open(partial, f"w:{compression}") as tar:
+            now = time.time()
+            async for node in nodes:
+                body = node.pop("body", "") or ""
+                path = f"{space_key}/pages/{node['id']}.xml"
+                data = body.encode("utf-8")
+                body_bytes += len(data)
+                _add_file(tar, path, data, now)
+                if markdown:
+                    _add_file(tar, f"{space_key}/pages/{node['id']}.md", storage_to_markdown(body).encode("utf-8"), now)
+                manifest.write((json.dumps({**node, "path": path}, ensure_ascii=False) + "\n").encode("utf-8"))
+            _add_file(tar, f"{space_key}/manifest.jsonl", manifest.getvalue(), now)
+        os.replace(partial, output)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    elapsed = time.perf_counter() - started
+    stats = crawler.stats()
+    return {
+        "output": output,
+        "pages": stats["pages"],
+        "errors": stats["errors"],
+        "body_bytes": body_bytes,
+        "archive_bytes": os.path.getsize(output),
+        "elapsed_s": round(elapsed, 2),
+        "pages_per_s": round(stats["pages"] / elapsed, 1) if elapsed else None,
+        "crawl": stats,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    load_dotenv()
+    service = ConfluenceService()
+    output = args.output or f"{args.space_key}.tar.{args.compression}"
+    try:
+        summary = await export_space(service, args.space_key, output, args.root, args.concurrency, args.compression, args.markdown)
+    finally:
+        await service.shutdown()
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confluence 스페이스를 압축 아카이브로 내보냅니다.")
+    parser.add_argument("space_key", help="내보낼 스페이스 키 (아카이브 안의 최상위 폴더 이름)")
+    parser.add_argument("--output", default=None, help="아카이브 경로 (기본값: <space_key>.tar.<compression>)")
+    parser.add_argument("--root", default=None, help="스페이스 전체 대신 이 페이지와 하위 페이지만 내보냅니다")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시에 자식 목록을 조회할 부모 수 (기본값: TREE_CRAWL_CONCURRENCY)")
+    parser.add_argument("--compression", choices=["gz", "xz", "bz2"], default="gz")
+    parser.add_argument("--markdown", action="store_true", help="Markdown 변환본(.md)도 함께 저장합니다")
+    sys.exit(asyncio.run(main(parser.parse_args())))
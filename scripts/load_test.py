@@ -0,0 +1,525 @@
+"""
+외부 서비스 없이 이 서버의 부하 테스트를 실행하고 결과를 JSON으로 저장합니다.
+
+가짜 Confluence(scripts/mock_confluence.py)와 가짜 LLM(scripts/mock_llm.py), 그리고 앱(uvicorn app.main:app)을
+각각 별도 프로세스로 띄운 뒤 시나리오별로 일정 시간 동안 동시 요청을 보내고 다음을 측정합니다.
+- 처리량(성공 요청/s), 지연 시간 p50/p95/p99/max, 상태 코드별 건수
+- 스트리밍 시나리오는 첫 토큰까지의 시간(TTFT) 분포
+- 앱 프로세스의 RSS(시작/최대/종료, /proc 기반이라 Linux에서만)
+- update_pages_by_label 시나리오는 스크립트를 그대로 실행하여 pages/s와 최대 RSS
+
+시나리오:
+    search                  GET  /pages/search (CQL 검색 + 페이지네이션)
+    update                  PUT  /pages/{id} (버전 조회 + 쓰기)
+    batch                   POST /pages/batch (NDJSON 20건)
+    llm_execute             POST /llm/execute (search_pages 도구 호출 1회 포함)
+    llm_stream              POST /llm/execute/stream (SSE)
+    update_pages_by_label   scripts/update_pages_by_label.py
+
+결과는 --output(기본값: bench_results/load_test-<시각>.json)에 저장되며, --compare로 이전 결과와 비교할 수 있습니다.
+앱 설정은 기본값을 그대로 사용합니다(CONFLUENCE_RATE_LIMIT 등). 바꾸려면 --env KEY=VALUE를 반복해서 주세요.
+
+사용법:
+    python scripts/load_test.py [--provider openai] [--scenarios search,update,llm_stream] [--duration 10] [--concurrency 16]
+                                [--pages 2000] [--body-kb 4] [--confluence-latency-ms 30] [--confluence-throttle-ratio 0.01]
+                                [--llm-ttft-ms 200] [--llm-tokens-per-s 100] [--env CONFLUENCE_RATE_LIMIT=10]
+                                [--output result.json] [--compare previous.json]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import Counter
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCRIPTS = os.path.join(ROOT, "scripts")
+SPACE_KEY = "BENCH"
+LABEL = "loadtest"
+SCENARIOS = ["search", "update", "batch", "llm_execute", "llm_stream", "update_pages_by_label"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """정렬된 값의 q 분위수 (선형 보간)."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def distribution_ms(values: List[float]) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "p50": ms(percentile(ordered, 0.50)),
+        "p95": ms(percentile(ordered, 0.95)),
+        "p99": ms(percentile(ordered, 0.99)),
+        "max": ms(ordered[-1] if ordered else None),
+        "mean": ms(sum(ordered) / len(ordered) if ordered else None),
+    }
+
+
+def read_rss_mb(pid: int) -> Dict[str, float]:
+    """/proc/<pid>/status의 현재 RSS(VmRSS)와 최대 RSS(VmHWM)를 MB로 반환합니다. (Linux 외에서는 빈 dict)"""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    name, kb = line.split()[:2]
+                    values[name.rstrip(":")] = round(int(kb) / 1024, 1)
+    except OSError:
+        pass
+    return values
+
+
+class RssSampler:
+    """시나리오 실행 중 앱 프로세스의 RSS를 주기적으로 기록합니다."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            rss = read_rss_mb(self.pid).get("VmRSS")
+            if rss is not None:
+                self.samples.append(rss)
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._task.cancel()
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        if not self.samples:
+            return {"start_mb": None, "peak_mb": None, "end_mb": None}
+        return {"start_mb": self.samples[0], "peak_mb": max(self.samples), "end_mb": self.samples[-1]}
+
+
+class Recorder:
+    """요청별 지연 시간과 결과를 모읍니다."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.ttfts: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        ok = sum(count for code, count in self.statuses.items() if isinstance(code, int) and code < 400)
+        result = {
+            "requests": len(self.latencies),
+            "ok": ok,
+            "elapsed_s": round(elapsed, 2),
+            "throughput_rps": round(ok / elapsed, 1) if elapsed else None,
+            "latency_ms": distribution_ms(self.latencies),
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items(), key=str)},
+        }
+        if self.ttfts:
+            result["ttft_ms"] = distribution_ms(self.ttfts)
+        if self.errors:
+            result["errors"] = dict(self.errors.most_common(5))
+        return result
+
+
+RequestFn = Callable[[httpx.AsyncClient, Recorder], Awaitable[int]]
+
+
+async def closed_loop(client: httpx.AsyncClient, request: RequestFn, concurrency: int, duration: float, max_requests: Optional[int]) -> Dict[str, Any]:
+    """concurrency개의 작업자가 duration초 동안(또는 max_requests건까지) 쉬지 않고 요청을 보냅니다."""
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            started = time.perf_counter()
+            try:
+                status = await request(client, recorder)
+            except Exception as e:
+                recorder.errors[f"{type(e).__name__}: {str(e)[:80]}"] += 1
+                status = "error"
+            recorder.latencies.append(time.perf_counter() - started)
+            recorder.statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return recorder.summary(time.perf_counter() - started)
+
+
+class LoadTest:
+    """가짜 서버와 앱 프로세스를 관리하고 시나리오를 실행합니다."""
+
+    def __init__(self, args: argparse.Namespace, workdir: str):
+        self.args = args
+        self.workdir = workdir
+        self.ports = {"confluence": free_port(), "openai": free_port(), "gemini": free_port(), "app": free_port()}
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self.pages: List[Dict[str, Any]] = []
+        self.env = self._app_env()
+
+    @property
+    def confluence_url(self) -> str:
+        return f"http://127.0.0.1:{self.ports['confluence']}"
+
+    @property
+    def llm_url(self) -> str:
+        return f"http://127.0.0.1:{self.ports['openai']}"
+
+    @property
+    def app_url(self) -> str:
+        return f"http://127.0.0.1:{self.ports['app']}"
+
+    def _app_env(self) -> Dict[str, str]:
+        cache = os.path.join(self.workdir, "cache")
+        env = {
+            **os.environ,
+            "CONFLUENCE_URL": self.confluence_url,
+            "CONFLUENCE_USER": "loadtest",
+            "CONFLUENCE_API_TOKEN": "loadtest",
+            "LLM_PROVIDER": self.args.provider,
+            "OPENAI_API_KEY": "mock",
+            "OPENAI_BASE_URL": f"{self.llm_url}/v1",
+            "GOOGLE_API_KEY": "mock",
+            "GEMINI_API_ENDPOINT": f"localhost:{self.ports['gemini']}",
+            "GRPC_DEFAULT_SSL_ROOTS_FILE_PATH": os.path.join(self.workdir, "certs", "mock_llm.pem"),
+            # 이전 실행이나 실제 환경의 로컬 캐시를 건드리지 않도록 모든 저장소를 작업 디렉터리에 둡니다.
+            "WRITE_ELISION_PATH": os.path.join(cache, "page_hashes.sqlite3"),
+            "PAGE_CACHE_SQLITE_PATH": os.path.join(cache, "page_cache.sqlite3"),
+            "SESSION_SQLITE_PATH": os.path.join(cache, "sessions.sqlite3"),
+            "REPORT_SUMMARY_CACHE_PATH": os.path.join(cache, "report_summaries.sqlite3"),
+            "INDEX_PATH": os.path.join(cache, "search_index.sqlite3"),
+            "SYNC_STORE_PATH": os.path.join(cache, "page_store.sqlite3"),
+            "LLM_CACHE_PATH": os.path.join(cache, "llm_cache.sqlite3"),
+            "SYNC_SPACES": "",
+        }
+        for item in self.args.env:
+            key, _, value = item.partition("=")
+            env[key] = value
+        return env
+
+    def _spawn(self, name: str, command: List[str]) -> subprocess.Popen:
+        log = open(os.path.join(self.workdir, f"{name}.log"), "w")
+        process = subprocess.Popen(command, cwd=ROOT, env=self.env, stdout=log, stderr=subprocess.STDOUT)
+        self.processes[name] = process
+        return process
+
+    async def _wait_until_up(self, name: str, url: str, timeout: float = 60.0) -> None:
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient() as client:
+            while True:
+                if self.processes[name].poll() is not None:
+                    raise RuntimeError(f"{name} 프로세스가 종료되었습니다. 로그: {os.path.join(self.workdir, name + '.log')}")
+                try:
+                    await client.get(url, timeout=1.0)
+                    return
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise
+                    await asyncio.sleep(0.1)
+
+    async def start(self) -> None:
+        args = self.args
+        self._spawn("mock_confluence", [
+            sys.executable, os.path.join(SCRIPTS, "mock_confluence.py"),
+            "--port", str(self.ports["confluence"]), "--pages", str(args.pages), "--space", SPACE_KEY,
+            "--body-kb", str(args.body_kb), "--labels", LABEL, "--labeled-pages", str(args.label_pages),
+            "--latency-ms", str(args.confluence_latency_ms), "--jitter-ms", str(args.confluence_jitter_ms),
+            "--rate-limit", str(args.confluence_rate_limit), "--throttle-ratio", str(args.confluence_throttle_ratio),
+            "--retry-after", str(args.confluence_retry_after),
+        ])
+        self._spawn("mock_llm", [
+            sys.executable, os.path.join(SCRIPTS, "mock_llm.py"),
+            "--openai-port", str(self.ports["openai"]),
+            "--gemini-port", str(self.ports["gemini"] if args.provider in ("gemini", "router") else 0),
+            "--cert-dir", os.path.join(self.workdir, "certs"),
+            "--ttft-ms", str(args.llm_ttft_ms), "--tokens-per-s", str(args.llm_tokens_per_s),
+            "--response-tokens", str(args.llm_response_tokens), "--throttle-ratio", str(args.llm_throttle_ratio),
+            "--slow-ratio", str(args.llm_slow_ratio), "--slow-ms", str(args.llm_slow_ms),
+            "--tool-cql", f"space = {SPACE_KEY}",
+        ])
+        await self._wait_until_up("mock_confluence", f"{self.confluence_url}/_mock/stats", timeout=300)
+        await self._wait_until_up("mock_llm", f"{self.llm_url}/_mock/stats")
+        self._spawn("app", [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(self.ports["app"]), "--log-level", "warning",
+        ])
+        await self._wait_until_up("app", f"{self.app_url}/")
+
+        # 쓰기 시나리오의 대상 페이지 목록은 가짜 서버에서 직접 가져옵니다. (앱의 지표에 섞이지 않도록)
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            response = await client.get(
+                f"{self.confluence_url}/rest/api/content/search",
+                params={"cql": f"space = {SPACE_KEY}", "limit": args.pages},
+            )
+            self.pages = [{"id": p["id"], "title": p["title"]} for p in response.json()["results"]]
+
+    def stop(self) -> None:
+        for process in reversed(list(self.processes.values())):
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    # --- 시나리오별 요청 ---
+
+    async def search(self, client: httpx.AsyncClient, recorder: Recorder) -> int:
+        response = await client.get("/pages/search", params={"cql": f'space = {SPACE_KEY} and title ~ "Page {random.randrange(100)}"', "max_results": 25})
+        return response.status_code
+
+    async def update(self, client: httpx.AsyncClient, recorder: Recorder) -> int:
+        page = random.choice(self.pages)
+        response = await client.put(f"/pages/{page['id']}", json={"title": page["title"], "content": f"<p>load test {uuid.uuid4().hex}</p>"})
+        return response.status_code
+
+    async def batch(self, client: httpx.AsyncClient, recorder: Recorder) -> int:
+        lines = [
+            json.dumps({"op": "update", "page_id": page["id"], "title": page["title"], "content": f"<p>batch {uuid.uuid4().hex}</p>"})
+            for page in random.sample(self.pages, min(20, len(self.pages)))
+        ]
+        response = await client.post("/pages/batch", content="\n".join(lines).encode("utf-8"), headers={"Content-Type": "application/x-ndjson"})
+        failed = sum(1 for line in response.text.splitlines() if line and json.loads(line).get("status") == "error")
+        if failed:
+            recorder.errors["batch item failed"] += failed
+        return response.status_code
+
+    async def llm_execute(self, client: httpx.AsyncClient, recorder: Recorder) -> int:
+        response = await client.post("/llm/execute", json={"prompt": f"BENCH 스페이스의 페이지를 요약해줘 ({uuid.uuid4().hex})"})
+        return response.status_code
+
+    async def llm_stream(self, client: httpx.AsyncClient, recorder: Recorder) -> int:
+        started = time.perf_counter()
+        async with client.stream("POST", "/llm/execute/stream", json={"prompt": f"배포 절차를 설명해줘 ({uuid.uuid4().hex})"}) as response:
+            first = True
+            async for line in response.aiter_lines():
+                if first and line.startswith("data:") and '"delta"' in line:
+                    recorder.ttfts.append(time.perf_counter() - started)
+                    first = False
+                elif line == "event: error":
+                    recorder.errors["stream error event"] += 1
+            return response.status_code
+
+    async def run_http(self, name: str) -> Dict[str, Any]:
+        request = getattr(self, name)
+        limits = httpx.Limits(max_connections=self.args.concurrency, max_keepalive_connections=self.args.concurrency)
+        mock_before = await self.mock_stats()
+        async with httpx.AsyncClient(base_url=self.app_url, timeout=self.args.timeout, limits=limits) as client:
+            with RssSampler(self.processes["app"].pid) as sampler:
+                result = await closed_loop(client, request, self.args.concurrency, self.args.duration, self.args.max_requests)
+        mock_after = await self.mock_stats()
+        result["concurrency"] = self.args.concurrency
+        result["server_rss"] = sampler.summary()
+        result["upstream"] = {
+            service: {key: after[key] - mock_before[service].get(key, 0) for key in ("requests", "throttled")}
+            for service, after in mock_after.items()
+        }
+        return result
+
+    async def run_update_pages_by_label(self) -> Dict[str, Any]:
+        """scripts/update_pages_by_label.py를 별도 프로세스로 실행하여 pages/s와 최대 RSS를 잽니다."""
+        report_path = os.path.join(self.workdir, "update_pages_by_label.json")
+        command = [
+            sys.executable, os.path.join(SCRIPTS, "update_pages_by_label.py"), LABEL, "각 페이지에 요약 섹션을 추가해줘",
+            "--report", report_path, "--no-llm-cache",
+        ]
+        mock_before = await self.mock_stats()
+        started = time.perf_counter()
+        with open(os.path.join(self.workdir, "update_pages_by_label.log"), "w") as log:
+            process = subprocess.Popen(command, cwd=ROOT, env=self.env, stdout=log, stderr=subprocess.STDOUT)
+            _, status, usage = await asyncio.to_thread(os.wait4, process.pid, 0)
+        elapsed = time.perf_counter() - started
+        mock_after = await self.mock_stats()
+        if os.waitstatus_to_exitcode(status) != 0 or not os.path.exists(report_path):
+            return {"error": f"exit code {os.waitstatus_to_exitcode(status)}", "elapsed_s": round(elapsed, 2)}
+        with open(report_path, encoding="utf-8") as f:
+            report = json.load(f)
+        # ru_maxrss는 Linux에서 KB, macOS에서 바이트 단위입니다.
+        peak_rss = usage.ru_maxrss / (1024 * 1024 if platform.system() == "Darwin" else 1024)
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "pages": report["counts"]["found"],
+            "pages_per_s": report["pages_per_s"],
+            "counts": report["counts"],
+            "stages": report["stages"],
+            "peak_rss_mb": round(peak_rss, 1),
+            "upstream": {
+                service: {key: after[key] - mock_before[service].get(key, 0) for key in ("requests", "throttled")}
+                for service, after in mock_after.items()
+            },
+        }
+
+    async def mock_stats(self) -> Dict[str, Dict[str, Any]]:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            confluence = (await client.get(f"{self.confluence_url}/_mock/stats")).json()
+            llm = (await client.get(f"{self.llm_url}/_mock/stats")).json()
+        return {"confluence": confluence, "llm": llm}
+
+    async def app_stats(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient(base_url=self.app_url, timeout=10.0) as client:
+            stats = (await client.get("/stats")).json()
+        return {key: stats.get(key) for key in ("confluence", "page_cache", "writes", "llm_router")}
+
+
+def print_result(name: str, result: Dict[str, Any]) -> None:
+    if "error" in result:
+        print(f"{name:<22} 실패: {result['error']}", flush=True)
+    elif "latency_ms" in result:
+        latency = result["latency_ms"]
+        ttft = f"  ttft p50 {result['ttft_ms']['p50']}ms" if "ttft_ms" in result else ""
+        rss = result["server_rss"]
+        print(
+            f"{name:<22} {result['throughput_rps']:>8} req/s  p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms"
+            f"{ttft}  ok {result['ok']}/{result['requests']}  rss {rss['start_mb']}->{rss['peak_mb']}MB"
+            f"  429 {result['upstream']['confluence']['throttled']}",
+            flush=True,
+        )
+    else:
+        print(
+            f"{name:<22} {result['pages_per_s']:>8} pages/s  {result['pages']} pages in {result['elapsed_s']}s"
+            f"  peak rss {result['peak_rss_mb']}MB  429 {result['upstream']['confluence']['throttled']}",
+            flush=True,
+        )
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """두 실행 결과의 처리량과 p95 지연 시간 변화를 출력합니다."""
+    print(f"\n비교 대상: {previous['meta'].get('timestamp')} ({previous['meta'].get('git_commit')})")
+
+    def change(now: Optional[float], before: Optional[float]) -> str:
+        if now is None or not before:
+            return "n/a"
+        return f"{before} -> {now} ({(now - before) / before * 100:+.1f}%)"
+
+    for name, result in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before or "error" in result or "error" in before:
+            continue
+        if "latency_ms" in result:
+            print(f"  {name:<22} throughput {change(result['throughput_rps'], before.get('throughput_rps'))}"
+                  f"  p95 {change(result['latency_ms']['p95'], before.get('latency_ms', {}).get('p95'))}")
+        else:
+            print(f"  {name:<22} pages/s {change(result['pages_per_s'], before.get('pages_per_s'))}"
+                  f"  peak rss {change(result['peak_rss_mb'], before.get('peak_rss_mb'))}")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 시나리오: {', '.join(sorted(unknown))} (가능: {', '.join(SCENARIOS)})")
+
+    with tempfile.TemporaryDirectory(prefix="load_test-") as workdir:
+        test = LoadTest(args, workdir)
+        try:
+            await test.start()
+            print(f"provider {args.provider}, {args.pages} pages, concurrency {args.concurrency}, {args.duration}s per scenario", flush=True)
+            results = {}
+            for name in scenarios:
+                if name == "update_pages_by_label":
+                    results[name] = await test.run_update_pages_by_label()
+                else:
+                    results[name] = await test.run_http(name)
+                print_result(name, results[name])
+            app_rss = read_rss_mb(test.processes["app"].pid)
+            app_stats = await test.app_stats()
+        except BaseException:
+            print(f"로그: {workdir}/*.log", file=sys.stderr)
+            for name in test.processes:
+                with open(os.path.join(workdir, f"{name}.log")) as f:
+                    tail = f.read()[-2000:]
+                if tail.strip():
+                    print(f"--- {name} ---\n{tail}", file=sys.stderr)
+            raise
+        finally:
+            test.stop()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "scenarios": results,
+        "server": {"rss_mb": app_rss, "stats": app_stats},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=["openai", "gemini", "router"], default="openai")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="쉼표로 구분한 시나리오 목록")
+    parser.add_argument("--duration", type=float, default=10.0, help="HTTP 시나리오별 실행 시간 (초)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시에 요청을 보내는 클라이언트 수")
+    parser.add_argument("--max-requests", type=int, default=None, help="HTTP 시나리오별 최대 요청 수")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--pages", type=int, default=2000, help="가짜 Confluence의 페이지 수")
+    parser.add_argument("--body-kb", type=float, default=4.0, help="페이지 본문 크기 (KB)")
+    parser.add_argument("--label-pages", type=int, default=50, help="update_pages_by_label 대상 페이지 수")
+    parser.add_argument("--confluence-latency-ms", type=float, default=30.0)
+    parser.add_argument("--confluence-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--confluence-rate-limit", type=float, default=0.0, help="가짜 Confluence의 초당 허용 요청 수 (0이면 제한 없음)")
+    parser.add_argument("--confluence-throttle-ratio", type=float, default=0.0, help="가짜 Confluence가 무작위로 429를 돌려줄 비율")
+    parser.add_argument("--confluence-retry-after", type=float, default=1.0)
+    parser.add_argument("--llm-ttft-ms", type=float, default=200.0)
+    parser.add_argument("--llm-tokens-per-s", type=float, default=100.0)
+    parser.add_argument("--llm-response-tokens", type=int, default=100)
+    parser.add_argument("--llm-throttle-ratio", type=float, default=0.0, help="가짜 LLM이 429로 거절할 비율")
+    parser.add_argument("--llm-slow-ratio", type=float, default=0.0, help="가짜 LLM이 첫 토큰을 --llm-slow-ms만큼 늦게 보낼 비율")
+    parser.add_argument("--llm-slow-ms", type=float, default=0.0)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="앱과 스크립트에 줄 환경 변수 (반복 가능)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본값: bench_results/load_test-<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args))
+    output = args.output or os.path.join(ROOT, "bench_results", f"load_test-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(result, json.load(f))
@@ -0,0 +1,453 @@
+"""
+벤치마크와 로컬 테스트를 위한 간단한 가짜 Confluence REST 서버.
+
+`ConfluenceService`가 사용하는 `/rest/api/content` 엔드포인트를 메모리 상에서 흉내냅니다.
+부하 테스트(scripts/load_test.py)를 위해 지연 시간(+ 무작위 편차), 429 응답 주입, 큰 본문을 설정할 수 있습니다.
+`GET /_mock/stats`로 받은 요청 수와 429로 거절한 요청 수를 확인할 수 있습니다.
+첨부 파일은 내용을 보관하지 않고 크기와 SHA-256만 기록하며, 다운로드하면 같은 크기의 생성된 바이트를 돌려줍니다.
+
+사용법:
+    python scripts/mock_confluence.py [--port 8090] [--pages 1000] [--latency-ms 0] [--jitter-ms 0]
+                                      [--body-kb 0] [--rate-limit 0] [--throttle-ratio 0] [--retry-after 1]
+"""
+import re
+import random
+import hashlib
+import argparse
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote, urlencode
+from typing import Optional, List, Dict, Any, Callable, AsyncIterator, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request, Response, HTTPException
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
+
+# 첨부 파일 다운로드 시 반복해서 내보낼 바이트 블록
+MEDIA_BLOCK = bytes(range(256)) * 256
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+class MockConfluence:
+    """메모리에 페이지를 보관하는 가짜 Confluence 저장소."""
+
+    def __init__(
+        self,
+        pages: int = 0,
+        latency_ms: float = 0.0,
+        space_key: str = "BENCH",
+        jitter_ms: float = 0.0,
+        body_kb: float = 0.0,
+        labels: Optional[List[str]] = None,
+        labeled_pages: Optional[int] = None,
+        rate_limit: float = 0.0,
+        throttle_ratio: float = 0.0,
+        retry_after: float = 1.0,
+    ):
+        """
+        - jitter_ms: 요청마다 latency_ms에 더할 0 ~ jitter_ms 사이의 무작위 지연
+        - body_kb: 생성하는 페이지 본문의 대략적인 크기 (0이면 한 문단)
+        - labels, labeled_pages: 앞에서부터 labeled_pages개(None이면 전부)의 페이지에 붙일 레이블
+        - rate_limit: 초당 허용 요청 수. 넘는 요청은 Retry-After와 함께 429로 거절합니다. (0이면 제한 없음)
+        - throttle_ratio: 제한과 무관하게 무작위로 429를 돌려줄 요청 비율 (0 ~ 1)
+        """
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.rate_limit = rate_limit
+        self.throttle_ratio = throttle_ratio
+        self.retry_after = retry_after
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.attachments: Dict[str, Dict[str, Any]] = {}
+        self.counters = {"requests": 0, "throttled": 0, "uploaded_bytes": 0, "downloaded_bytes": 0}
+        self._window_start = 0.0
+        self._window_count = 0
+        self._next_id = 100000
+        for i in range(pages):
+            labeled = labeled_pages is None or i < labeled_pages
+            self.add_page(space_key, f"Page {i}", self.make_body(i, body_kb), labels=labels if labeled else None)
+
+    @staticmethod
+    def make_body(i: int, body_kb: float) -> str:
+        paragraph = f"<p>Body of page {i}</p>"
+        if body_kb <= 0:
+            return paragraph
+        filler = f"<h2>Section</h2><p>{'Lorem ipsum dolor sit amet, 가나다라마바사 ' * 20}</p>"
+        return paragraph + filler * max(1, int(body_kb * 1024 // len(filler.encode("utf-8"))))
+
+    def add_page(self, space_key: str, title: str, body: str, parent_id: Optional[str] = None, labels: Optional[List[str]] = None) -> Dict[str, Any]:
+        page_id = str(self._next_id)
+        self._next_id += 1
+        page = {
+            "id": page_id,
+            "type": "page",
+            "status": "current",
+            "title": title,
+            "space": {"key": space_key},
+            "version": {"number": 1, "when": now_iso()},
+            "body": {"storage": {"value": body, "representation": "storage"}},
+            "ancestors": [{"id": parent_id}] if parent_id else [],
+            "labels": list(labels or []),
+        }
+        self.pages[page_id] = page
+        if parent_id:
+            self.children.setdefault(parent_id, []).append(page_id)
+        return page
+
+    def remove_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        page = self.pages.pop(page_id, None)
+        if page is not None and page["ancestors"]:
+            siblings = self.children.get(page["ancestors"][0]["id"], [])
+            if page_id in siblings:
+                siblings.remove(page_id)
+        return page
+
+    def is_descendant(self, page: Dict[str, Any], ancestor_id: str) -> bool:
+        while page["ancestors"]:
+            parent_id = page["ancestors"][0]["id"]
+            if parent_id == ancestor_id:
+                return True
+            page = self.pages.get(parent_id)
+            if page is None:
+                return False
+        return False
+
+    def query(self, cql: str) -> List[Dict[str, Any]]:
+        """CQL 중 `space = X`, `ancestor = X`, `label = X`, `lastmodified >(=) "yyyy-MM-dd HH:mm"`(UTC로 해석) 조건만 흉내냅니다. 나머지 조건은 무시합니다."""
+        pages = list(self.pages.values())
+        space = re.search(r'space\s*=\s*"?([\w-]+)"?', cql)
+        if space:
+            pages = [p for p in pages if p["space"]["key"] == space.group(1)]
+        ancestor = re.search(r'ancestor\s*=\s*"?(\d+)"?', cql)
+        if ancestor:
+            pages = [p for p in pages if self.is_descendant(p, ancestor.group(1))]
+        label = re.search(r'label\s*=\s*[\'"]?([\w-]+)[\'"]?', cql)
+        if label:
+            pages = [p for p in pages if label.group(1) in p["labels"]]
+        modified = re.search(r'lastmodified\s*(>=?)\s*"([^"]+)"', cql)
+        if modified:
+            since = datetime.strptime(modified.group(2), "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+            if modified.group(1) == ">=":
+                pages = [p for p in pages if datetime.fromisoformat(p["version"]["when"]) >= since]
+            else:
+                pages = [p for p in pages if datetime.fromisoformat(p["version"]["when"]) > since]
+        if "order by lastmodified" in cql:
+            pages.sort(key=lambda p: p["version"]["when"])
+        return pages
+
+    def render(self, page: Dict[str, Any], expand: Optional[str]) -> Dict[str, Any]:
+        """expand 파라미터에 요청된 필드만 포함하여 반환합니다."""
+        fields = set((expand or "").split(",")) if expand else set()
+        result = {k: page[k] for k in ("id", "type", "status", "title")}
+        if "version" in fields:
+            result["version"] = page["version"]
+        if "space" in fields:
+            result["space"] = page["space"]
+        if "ancestors" in fields:
+            result["ancestors"] = page["ancestors"]
+        if "body.storage" in fields:
+            result["body"] = page["body"]
+        if "childTypes.page" in fields or "childTypes.all" in fields:
+            result["childTypes"] = {"page": {"value": any(c in self.pages for c in self.children.get(page["id"], []))}}
+        result["_links"] = {"webui": f"/pages/viewpage.action?pageId={page['id']}"}
+        return result
+
+    def add_attachment(self, page_id: str, filename: str, media_type: str, size: int, digest: str, comment: str = "") -> Dict[str, Any]:
+        attachment_id = f"att{self._next_id}"
+        self._next_id += 1
+        attachment = {
+            "id": attachment_id,
+            "type": "attachment",
+            "status": "current",
+            "title": filename,
+            "container": {"id": page_id},
+            "version": {"number": 1, "when": now_iso()},
+            "extensions": {"mediaType": media_type, "fileSize": size, "comment": comment},
+            "sha256": digest,
+        }
+        self.attachments[attachment_id] = attachment
+        return attachment
+
+    def update_attachment(self, attachment: Dict[str, Any], media_type: str, size: int, digest: str, comment: str = "") -> Dict[str, Any]:
+        attachment["version"] = {"number": attachment["version"]["number"] + 1, "when": now_iso()}
+        attachment["extensions"] = {"mediaType": media_type, "fileSize": size, "comment": comment}
+        attachment["sha256"] = digest
+        return attachment
+
+    def page_attachments(self, page_id: str) -> List[Dict[str, Any]]:
+        return [a for a in self.attachments.values() if a["container"]["id"] == page_id]
+
+    @staticmethod
+    def render_attachment(attachment: Dict[str, Any], expand: Optional[str] = None) -> Dict[str, Any]:
+        page_id = attachment["container"]["id"]
+        return {
+            **attachment,
+            "_links": {"download": f"/download/attachments/{page_id}/{attachment['title']}?version={attachment['version']['number']}"},
+        }
+
+    async def delay(self) -> None:
+        latency = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if latency:
+            await asyncio.sleep(latency)
+
+    def should_throttle(self) -> bool:
+        """이 요청을 429로 거절할지 결정합니다. (1초 고정 창 기준의 rate_limit + 무작위 throttle_ratio)"""
+        self.counters["requests"] += 1
+        throttled = bool(self.throttle_ratio) and random.random() < self.throttle_ratio
+        if self.rate_limit and not throttled:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            throttled = self._window_count > self.rate_limit
+        if throttled:
+            self.counters["throttled"] += 1
+        return throttled
+
+
+def listing(
+    request: Request,
+    pages: List[Dict[str, Any]],
+    store: MockConfluence,
+    expand: Optional[str],
+    start: int,
+    limit: int,
+    render: Optional[Callable[[Dict[str, Any], Optional[str]], Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """목록 API 응답 형식(`results`, `_links.next`)으로 페이지네이션합니다."""
+    results = [(render or store.render)(p, expand) for p in pages[start:start + limit]]
+    links = {"base": str(request.base_url).rstrip("/")}
+    if start + limit < len(pages):
+        query = {k: v for k, v in request.query_params.items() if k not in ("start", "limit")}
+        links["next"] = f"{request.url.path}?{urlencode({**query, 'start': start + limit, 'limit': limit})}"
+    return {"results": results, "start": start, "limit": limit, "size": len(results), "_links": links}
+
+
+async def read_multipart_file(request: Request) -> Tuple[str, str, int, str, str]:
+    """
+    multipart/form-data 본문에서 `file` 파트를 메모리에 모으지 않고 읽어 (파일 이름, 형식, 크기, SHA-256, comment)를 반환합니다.
+    `file` 파트가 마지막 파트라고 가정합니다. (ConfluenceService가 보내는 형식)
+    """
+    boundary = re.search(r"boundary=([^;\s]+)", request.headers.get("content-type", ""))
+    if boundary is None:
+        raise HTTPException(status_code=415, detail="multipart/form-data required")
+    tail_size = len(f"\r\n--{boundary.group(1)}--\r\n")
+    head = b""
+    pending = b""
+    match = None
+    size = 0
+    digest = hashlib.sha256()
+    async for chunk in request.stream():
+        if match is None:
+            head += chunk
+            match = re.search(rb'name="file"; filename="([^"]*)"\r\n(?:Content-Type: ([^\r]*)\r\n)?\r\n', head)
+            if match is None:
+                continue
+            chunk = head[match.end():]
+        # 마지막 경계 문자열은 파일 내용이 아니므로 끝의 tail_size 바이트는 다음 조각이 올 때까지 보류합니다.
+        data = pending + chunk
+        content, pending = data[:-tail_size], data[-tail_size:]
+        size += len(content)
+        digest.update(content)
+    if match is None:
+        raise HTTPException(status_code=400, detail="file part is missing")
+    comment = re.search(rb'name="comment"\r\n\r\n(.*?)\r\n--', head[:match.start()], re.S)
+    return (
+        match.group(1).decode("utf-8"),
+        (match.group(2) or b"application/octet-stream").decode("latin-1"),
+        size,
+        digest.hexdigest(),
+        comment.group(1).decode("utf-8") if comment else "",
+    )
+
+
+async def media_bytes(size: int, store: MockConfluence) -> AsyncIterator[bytes]:
+    while size > 0:
+        chunk = MEDIA_BLOCK[:min(size, len(MEDIA_BLOCK))]
+        size -= len(chunk)
+        store.counters["downloaded_bytes"] += len(chunk)
+        yield chunk
+
+
+def create_app(store: MockConfluence) -> FastAPI:
+    app = FastAPI(title="Mock Confluence")
+
+    @app.middleware("http")
+    async def throttle(request: Request, call_next):
+        if request.url.path.startswith("/rest/api/") and store.should_throttle():
+            return JSONResponse(
+                status_code=429,
+                content={"statusCode": 429, "message": "Rate limit exceeded"},
+                headers={"Retry-After": f"{store.retry_after:g}"},
+            )
+        return await call_next(request)
+
+    @app.get("/_mock/stats")
+    async def mock_stats():
+        return {"pages": len(store.pages), "attachments": len(store.attachments), **store.counters}
+
+    @app.get("/rest/api/content/search")
+    async def search(cql: str, request: Request, expand: Optional[str] = None, start: int = 0, limit: int = 25):
+        await store.delay()
+        return listing(request, store.query(cql), store, expand, start, limit)
+
+    @app.get("/rest/api/content/{page_id}/child/page")
+    async def child_pages(page_id: str, request: Request, expand: Optional[str] = None, start: int = 0, limit: int = 25):
+        await store.delay()
+        if page_id not in store.pages:
+            raise HTTPException(status_code=404, detail="Not found")
+        children = [store.pages[c] for c in store.children.get(page_id, []) if c in store.pages]
+        return listing(request, children, store, expand, start, limit)
+
+    @app.get("/rest/api/space/{space_key}/content/page")
+    async def space_pages(space_key: str, request: Request, depth: Optional[str] = None, expand: Optional[str] = None, start: int = 0, limit: int = 25):
+        await store.delay()
+        pages = [p for p in store.pages.values() if p["space"]["key"] == space_key and not (depth == "root" and p["ancestors"])]
+        return listing(request, pages, store, expand, start, limit)
+
+    @app.get("/rest/api/content/{page_id}/child/attachment")
+    async def list_attachments(page_id: str, request: Request, filename: Optional[str] = None, expand: Optional[str] = None, start: int = 0, limit: int = 25):
+        await store.delay()
+        if page_id not in store.pages:
+            raise HTTPException(status_code=404, detail="Not found")
+        attachments = [a for a in store.page_attachments(page_id) if filename is None or a["title"] == filename]
+        return listing(request, attachments, store, expand, start, limit, render=store.render_attachment)
+
+    @app.post("/rest/api/content/{page_id}/child/attachment")
+    async def upload_attachment(page_id: str, request: Request):
+        await store.delay()
+        if page_id not in store.pages:
+            raise HTTPException(status_code=404, detail="Not found")
+        filename, media_type, size, digest, comment = await read_multipart_file(request)
+        store.counters["uploaded_bytes"] += size
+        if any(a["title"] == filename for a in store.page_attachments(page_id)):
+            raise HTTPException(status_code=400, detail=f"Cannot add a new attachment with same file name as an existing attachment: {filename}")
+        attachment = store.add_attachment(page_id, filename, media_type, size, digest, comment)
+        return {"results": [store.render_attachment(attachment)], "size": 1}
+
+    @app.post("/rest/api/content/{page_id}/child/attachment/{attachment_id}/data")
+    async def update_attachment_data(page_id: str, attachment_id: str, request: Request):
+        await store.delay()
+        attachment = store.attachments.get(attachment_id)
+        if attachment is None or attachment["container"]["id"] != page_id:
+            raise HTTPException(status_code=404, detail="Not found")
+        _, media_type, size, digest, comment = await read_multipart_file(request)
+        store.counters["uploaded_bytes"] += size
+        return store.render_attachment(store.update_attachment(attachment, media_type, size, digest, comment))
+
+    @app.get("/rest/api/content/{page_id}/child/attachment/{attachment_id}/download")
+    async def download_attachment(page_id: str, attachment_id: str):
+        await store.delay()
+        attachment = store.attachments.get(attachment_id)
+        if attachment is None or attachment["container"]["id"] != page_id:
+            raise HTTPException(status_code=404, detail="Not found")
+        # Confluence Cloud처럼 미디어 서버 주소로 리다이렉트합니다.
+        return RedirectResponse(f"/_mock/media/{attachment_id}", status_code=302)
+
+    @app.get("/_mock/media/{attachment_id}")
+    async def media(attachment_id: str):
+        attachment = store.attachments.get(attachment_id)
+        if attachment is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        size = attachment["extensions"]["fileSize"]
+        return StreamingResponse(
+            media_bytes(size, store),
+            media_type=attachment["extensions"]["mediaType"],
+            headers={"Content-Length": str(size), "Content-Disposition": f"attachment; filename*=UTF-8''{quote(attachment['title'])}"},
+        )
+
+    @app.get("/rest/api/content/{page_id}")
+    async def get_page(page_id: str, expand: Optional[str] = None):
+        await store.delay()
+        page = store.pages.get(page_id)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return store.render(page, expand)
+
+    @app.post("/rest/api/content")
+    async def create_page(request: Request):
+        await store.delay()
+        data = await request.json()
+        ancestors = data.get("ancestors") or []
+        page = store.add_page(
+            data["space"]["key"], data["title"], data["body"]["storage"]["value"],
+            parent_id=ancestors[0]["id"] if ancestors else None,
+        )
+        return store.render(page, "version,space,body.storage")
+
+    @app.put("/rest/api/content/{page_id}")
+    async def update_page(page_id: str, request: Request):
+        await store.delay()
+        page = store.pages.get(page_id)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        data = await request.json()
+        if data["version"]["number"] != page["version"]["number"] + 1:
+            raise HTTPException(status_code=409, detail="Version must be incremented on update.")
+        page["title"] = data["title"]
+        page["version"] = {"number": data["version"]["number"], "when": now_iso()}
+        page["body"] = {"storage": {"value": data["body"]["storage"]["value"], "representation": "storage"}}
+        return store.render(page, "version,space,body.storage")
+
+    @app.delete("/rest/api/content/{page_id}")
+    async def delete_page(page_id: str):
+        await store.delay()
+        if store.remove_page(page_id) is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return Response(status_code=204)
+
+    return app
+
+
+class MockServerThread:
+    """벤치마크 스크립트에서 가짜 서버를 백그라운드 스레드로 띄우기 위한 헬퍼."""
+
+    def __init__(self, app: FastAPI, port: int):
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.url = f"http://127.0.0.1:{port}"
+
+    def __enter__(self) -> "MockServerThread":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Confluence REST server")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="요청마다 더할 0 ~ N ms의 무작위 지연")
+    parser.add_argument("--space", default="BENCH", help="생성할 페이지의 스페이스 키")
+    parser.add_argument("--body-kb", type=float, default=0.0, help="페이지 본문 크기 (KB, 0이면 한 문단)")
+    parser.add_argument("--labels", default="bench", help="생성할 페이지에 붙일 레이블 (쉼표로 구분)")
+    parser.add_argument("--labeled-pages", type=int, default=None, help="레이블을 붙일 페이지 수 (기본값: 전부)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="초당 허용 요청 수, 넘으면 429 (0이면 제한 없음)")
+    parser.add_argument("--throttle-ratio", type=float, default=0.0, help="무작위로 429를 돌려줄 요청 비율 (0 ~ 1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After (초)")
+    args = parser.parse_args()
+
+    store = MockConfluence(
+        args.pages, args.latency_ms, args.space,
+        jitter_ms=args.jitter_ms,
+        body_kb=args.body_kb,
+        labels=[label for label in args.labels.split(",") if label],
+        labeled_pages=args.labeled_pages,
+        rate_limit=args.rate_limit,
+        throttle_ratio=args.throttle_ratio,
+        retry_after=args.retry_after,
+    )
+    uvicorn.run(create_app(store), host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,337 @@
+"""
+벤치마크와 부하 테스트를 위한 가짜 LLM 서버.
+
+- OpenAI 호환 HTTP API: `POST /v1/chat/completions` (stream 포함), `POST /v1/embeddings`
+- Gemini gRPC API (google-generativeai SDK의 비동기 클라이언트가 사용하는 GenerativeService):
+  GenerateContent, StreamGenerateContent, EmbedContent, BatchEmbedContents
+
+첫 토큰까지의 시간(--ttft-ms)과 초당 토큰 수(--tokens-per-s)로 스트리밍 속도를 흉내내며,
+같은 프롬프트에는 항상 같은 응답을 돌려줍니다. --throttle-ratio 비율의 요청은 429(RESOURCE_EXHAUSTED)로 거절하고,
+--slow-ratio 비율의 요청은 첫 토큰을 --slow-ms만큼 더 늦게 보냅니다. (긴 꼬리 지연)
+--tool-cql을 주면 도구가 제공된 첫 턴에 그 CQL로 search_pages 도구 호출을 요청하여 도구 루프까지 거치게 합니다.
+
+Gemini SDK는 TLS gRPC로만 접속하므로 openssl로 자체 서명 인증서를 만들어 사용합니다.
+앱에는 다음과 같이 연결합니다.
+    OPENAI_BASE_URL=http://127.0.0.1:8091/v1
+    GEMINI_API_ENDPOINT=localhost:8092  GRPC_DEFAULT_SSL_ROOTS_FILE_PATH=<cert-dir>/mock_llm.pem
+
+사용법:
+    python scripts/mock_llm.py [--openai-port 8091] [--gemini-port 8092] [--cert-dir .cache/mock_llm]
+                               [--ttft-ms 300] [--tokens-per-s 50] [--response-tokens 200] [--throttle-ratio 0] [--slow-ratio 0] [--slow-ms 0]
+                               [--tool-cql "space = BENCH"]
+"""
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import argparse
+import subprocess
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "the page release plan 배포 일정 회의록 정리 summary update team review 문서 변경 사항 "
+    "owner status risk 검토 결과 next steps 담당자 완료 진행 중 Confluence draft section"
+).split()
+GEMINI_SERVICE = "google.ai.generativelanguage.v1beta.GenerativeService"
+EMBEDDING_DIMENSIONS = 256
+
+
+class MockLLM:
+    """응답 생성 속도와 오류 비율을 설정할 수 있는 가짜 LLM."""
+
+    def __init__(
+        self,
+        ttft_ms: float = 300.0,
+        tokens_per_s: float = 50.0,
+        response_tokens: int = 200,
+        throttle_ratio: float = 0.0,
+        tool_cql: Optional[str] = None,
+        slow_ratio: float = 0.0,
+        slow_ms: float = 0.0,
+    ):
+        self.ttft = ttft_ms / 1000.0
+        self.slow_ratio = slow_ratio
+        self.slow = slow_ms / 1000.0
+        self.token_interval = 1.0 / tokens_per_s if tokens_per_s > 0 else 0.0
+        self.response_tokens = response_tokens
+        self.throttle_ratio = throttle_ratio
+        self.tool_cql = tool_cql
+        self.counters = {"requests": 0, "throttled": 0, "slowed": 0, "streams": 0, "tool_calls": 0, "completion_tokens": 0}
+
+    def should_throttle(self) -> bool:
+        self.counters["requests"] += 1
+        if self.throttle_ratio and random.random() < self.throttle_ratio:
+            self.counters["throttled"] += 1
+            return True
+        return False
+
+    async def first_token_delay(self) -> None:
+        """ttft만큼 기다리며, slow_ratio 비율의 요청은 slow_ms만큼 더 기다립니다. (긴 꼬리 지연 흉내)"""
+        delay = self.ttft
+        if self.slow_ratio and random.random() < self.slow_ratio:
+            self.counters["slowed"] += 1
+            delay += self.slow
+        await asyncio.sleep(delay)
+
+    def tokens_for(self, prompt: str) -> List[str]:
+        """프롬프트에서 결정되는 응답 토큰 목록 (같은 프롬프트면 같은 응답)."""
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        return [rng.choice(WORDS) + " " for _ in range(self.response_tokens)]
+
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        return max(1, len(text) // 4)
+
+    async def generate(self, prompt: str) -> AsyncIterator[str]:
+        """ttft만큼 기다린 뒤 tokens_per_s 속도로 토큰을 내보냅니다."""
+        tokens = self.tokens_for(prompt)
+        await self.first_token_delay()
+        started = time.monotonic()
+        for i, token in enumerate(tokens):
+            if self.token_interval:
+                # 토큰마다 sleep하면 오차가 쌓이므로 시작 시각 기준으로 맞춥니다.
+                delay = started + i * self.token_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self.counters["completion_tokens"] += 1
+            yield token
+
+    async def complete(self, prompt: str) -> str:
+        return "".join([token async for token in self.generate(prompt)]).strip()
+
+    def embedding(self, text: str) -> List[float]:
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        return [rng.uniform(-1.0, 1.0) for _ in range(EMBEDDING_DIMENSIONS)]
+
+
+# --- OpenAI ---
+
+def _openai_prompt(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(m.get("content") or "") for m in messages)
+
+
+def _openai_wants_tool(mock: MockLLM, data: Dict[str, Any]) -> bool:
+    messages = data.get("messages", [])
+    return bool(
+        mock.tool_cql
+        and data.get("tools")
+        and data.get("tool_choice", "auto") != "none"
+        and not any(m.get("role") == "tool" for m in messages)
+    )
+
+
+def create_openai_app(mock: MockLLM) -> FastAPI:
+    app = FastAPI(title="Mock OpenAI")
+
+    def throttled() -> JSONResponse:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            headers={"retry-after-ms": "200"},
+        )
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        if mock.should_throttle():
+            return throttled()
+        data = await request.json()
+        model = data.get("model", "mock")
+        prompt = _openai_prompt(data.get("messages", []))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        prompt_tokens = mock.count_tokens(prompt)
+
+        if _openai_wants_tool(mock, data):
+            mock.counters["tool_calls"] += 1
+            await mock.first_token_delay()
+            tool_call = {"id": f"call_{uuid.uuid4().hex[:24]}", "type": "function", "function": {"name": "search_pages", "arguments": json.dumps({"cql": mock.tool_cql})}}
+            return {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": None, "tool_calls": [tool_call]}, "finish_reason": "tool_calls"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 20, "total_tokens": prompt_tokens + 20},
+            }
+
+        if not data.get("stream"):
+            text = await mock.complete(prompt)
+            completion_tokens = len(text.split())
+            return {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+            }
+
+        mock.counters["streams"] += 1
+        include_usage = bool((data.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, usage: Optional[Dict[str, int]] = None) -> str:
+            choices = [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            body = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices}
+            if usage:
+                body["usage"] = usage
+            return f"data: {json.dumps(body, ensure_ascii=False)}\n\n"
+
+        async def events():
+            completion_tokens = 0
+            yield chunk({"role": "assistant", "content": ""})
+            async for token in mock.generate(prompt):
+                completion_tokens += 1
+                yield chunk({"content": token})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk({}, usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        if mock.should_throttle():
+            return throttled()
+        data = await request.json()
+        inputs = data["input"] if isinstance(data["input"], list) else [data["input"]]
+        tokens = sum(mock.count_tokens(str(text)) for text in inputs)
+        return {
+            "object": "list",
+            "model": data.get("model", "mock"),
+            "data": [{"object": "embedding", "index": i, "embedding": mock.embedding(str(text))} for i, text in enumerate(inputs)],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.get("/_mock/stats")
+    async def mock_stats():
+        return mock.counters
+
+    return app
+
+
+# --- Gemini (gRPC) ---
+
+def make_self_signed_cert(directory: str) -> Tuple[str, str]:
+    """localhost/127.0.0.1용 자체 서명 인증서를 만들고 (인증서, 키) 경로를 반환합니다. (이미 있으면 재사용)"""
+    os.makedirs(directory, exist_ok=True)
+    cert = os.path.join(directory, "mock_llm.pem")
+    key = os.path.join(directory, "mock_llm.key")
+    if not (os.path.exists(cert) and os.path.exists(key)):
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "30",
+                "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+                "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+            ],
+            check=True,
+            capture_output=True,
+        )
+    return cert, key
+
+
+async def serve_gemini(mock: MockLLM, port: int, cert_dir: str):
+    """Gemini GenerativeService를 흉내내는 TLS gRPC 서버를 시작하여 반환합니다."""
+    import grpc
+    from google.ai import generativelanguage_v1beta as glm
+
+    def prompt_of(request) -> str:
+        return "\n".join(part.text for content in request.contents for part in content.parts if part.text)
+
+    def wants_tool(request) -> bool:
+        mode = request.tool_config.function_calling_config.mode
+        answered = any(part.function_response.name for content in request.contents for part in content.parts)
+        return bool(mock.tool_cql and request.tools and mode != glm.FunctionCallingConfig.Mode.NONE and not answered)
+
+    def response(parts: List[Any], prompt: str, completion_tokens: int, final: bool = True):
+        result = glm.GenerateContentResponse(candidates=[glm.Candidate(
+            content=glm.Content(role="model", parts=parts),
+            finish_reason=glm.Candidate.FinishReason.STOP if final else glm.Candidate.FinishReason.FINISH_REASON_UNSPECIFIED,
+        )])
+        prompt_tokens = mock.count_tokens(prompt)
+        result.usage_metadata = glm.GenerateContentResponse.UsageMetadata(
+            prompt_token_count=prompt_tokens, candidates_token_count=completion_tokens, total_token_count=prompt_tokens + completion_tokens,
+        )
+        return result
+
+    async def abort_if_throttled(context) -> None:
+        if mock.should_throttle():
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Resource has been exhausted (e.g. check quota).")
+
+    async def generate_content(request, context):
+        await abort_if_throttled(context)
+        prompt = prompt_of(request)
+        if wants_tool(request):
+            mock.counters["tool_calls"] += 1
+            await mock.first_token_delay()
+            call = glm.FunctionCall(name="search_pages", args={"cql": mock.tool_cql})
+            return response([glm.Part(function_call=call)], prompt, 20)
+        text = await mock.complete(prompt)
+        return response([glm.Part(text=text)], prompt, len(text.split()))
+
+    async def stream_generate_content(request, context):
+        await abort_if_throttled(context)
+        mock.counters["streams"] += 1
+        prompt = prompt_of(request)
+        count = 0
+        async for token in mock.generate(prompt):
+            count += 1
+            yield response([glm.Part(text=token)], prompt, count, final=count == mock.response_tokens)
+
+    async def embed_content(request, context):
+        await abort_if_throttled(context)
+        return glm.EmbedContentResponse(embedding=glm.ContentEmbedding(values=mock.embedding(prompt_of(request))))
+
+    async def batch_embed_contents(request, context):
+        await abort_if_throttled(context)
+        return glm.BatchEmbedContentsResponse(embeddings=[
+            glm.ContentEmbedding(values=mock.embedding("".join(part.text for part in r.content.parts))) for r in request.requests
+        ])
+
+    def handler(kind, fn, request_type, response_type):
+        return kind(fn, request_deserializer=request_type.deserialize, response_serializer=response_type.serialize)
+
+    server = grpc.aio.server()
+    server.add_generic_rpc_handlers([grpc.method_handlers_generic_handler(GEMINI_SERVICE, {
+        "GenerateContent": handler(grpc.unary_unary_rpc_method_handler, generate_content, glm.GenerateContentRequest, glm.GenerateContentResponse),
+        "StreamGenerateContent": handler(grpc.unary_stream_rpc_method_handler, stream_generate_content, glm.GenerateContentRequest, glm.GenerateContentResponse),
+        "EmbedContent": handler(grpc.unary_unary_rpc_method_handler, embed_content, glm.EmbedContentRequest, glm.EmbedContentResponse),
+        "BatchEmbedContents": handler(grpc.unary_unary_rpc_method_handler, batch_embed_contents, glm.BatchEmbedContentsRequest, glm.BatchEmbedContentsResponse),
+    })])
+    cert, key = make_self_signed_cert(cert_dir)
+    with open(key, "rb") as f_key, open(cert, "rb") as f_cert:
+        credentials = grpc.ssl_server_credentials([(f_key.read(), f_cert.read())])
+    server.add_secure_port(f"127.0.0.1:{port}", credentials)
+    await server.start()
+    return server
+
+
+async def main(args: argparse.Namespace) -> None:
+    mock = MockLLM(args.ttft_ms, args.tokens_per_s, args.response_tokens, args.throttle_ratio, args.tool_cql, args.slow_ratio, args.slow_ms)
+    gemini = None
+    if args.gemini_port:
+        gemini = await serve_gemini(mock, args.gemini_port, args.cert_dir)
+        print(f"Gemini gRPC: localhost:{args.gemini_port} (cert: {os.path.join(args.cert_dir, 'mock_llm.pem')})", flush=True)
+    try:
+        server = uvicorn.Server(uvicorn.Config(create_openai_app(mock), host="127.0.0.1", port=args.openai_port, log_level="warning"))
+        print(f"OpenAI HTTP: http://127.0.0.1:{args.openai_port}/v1", flush=True)
+        await server.serve()
+    finally:
+        if gemini is not None:
+            await gemini.stop(0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenAI/Gemini server")
+    parser.add_argument("--openai-port", type=int, default=8091)
+    parser.add_argument("--gemini-port", type=int, default=8092, help="0이면 Gemini gRPC 서버를 띄우지 않습니다")
+    parser.add_argument("--cert-dir", default=".cache/mock_llm", help="Gemini용 자체 서명 인증서를 둘 디렉터리")
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="첫 토큰까지의 시간 (ms)")
+    parser.add_argument("--tokens-per-s", type=float, default=50.0, help="초당 생성 토큰 수 (0이면 지연 없음)")
+    parser.add_argument("--response-tokens", type=int, default=200, help="응답 하나의 토큰 수")
+    parser.add_argument("--throttle-ratio", type=float, default=0.0, help="429로 거절할 요청 비율 (0 ~ 1)")
+    parser.add_argument("--slow-ratio", type=float, default=0.0, help="첫 토큰을 --slow-ms만큼 늦게 보낼 요청 비율 (0 ~ 1)")
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    parser.add_argument("--tool-cql", default=None, help="주면 첫 턴에 이 CQL로 search_pages 도구 호출을 요청합니다")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+"""
+변경 동기화 작업자(ChangeSyncWorker)를 실행합니다.
+
+기본 모드는 설정된 Confluence의 스페이스(--space 또는 SYNC_SPACES)를 한 번 동기화하고,
+--loop를 주면 SYNC_INTERVAL 간격으로 계속 동기화합니다.
+
+--mock 모드는 가짜 Confluence 서버(scripts/mock_confluence.py)와 임시 저장소로 다음 시나리오를 검증합니다.
+    1. 최초 동기화는 모든 페이지를 created 이벤트로 전달합니다.
+    2. 페이지 수정/추가 후 동기화는 바뀐 페이지만 전달합니다.
+    3. 작업자와 저장소를 새로 만들어도(재시작) 커서가 유지되어 아무 이벤트도 전달하지 않습니다.
+    4. 커서를 지우고 다시 동기화해도 버전이 같으므로 아무 이벤트도 전달하지 않습니다(멱등).
+시나리오가 기대와 다르면 0이 아닌 종료 코드로 끝납니다.
+
+사용법:
+    python scripts/run_sync_worker.py --mock [--pages 300]
+    python scripts/run_sync_worker.py --space DEV --space QA [--loop]
+"""
+import os
+import sys
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+MOCK_PORT = 8767
+if "--mock" in sys.argv:
+    os.environ["CONFLUENCE_URL"] = f"http://127.0.0.1:{MOCK_PORT}"
+    os.environ.setdefault("CONFLUENCE_USER", "mock")
+    os.environ.setdefault("CONFLUENCE_API_TOKEN", "mock")
+    os.environ.setdefault("CONFLUENCE_RATE_LIMIT", "0")
+
+from app.core.config import settings
+from app.models.confluence_models import PageUpdate
+from app.services.confluence_service import ConfluenceService
+from app.services.sync_service import ChangeSyncWorker, PageStore
+
+
+class EventRecorder:
+    """받은 이벤트를 기록하는 테스트용 구독자."""
+
+    def __init__(self, verbose: bool = False):
+        self.events = []
+        self.verbose = verbose
+
+    async def __call__(self, events) -> None:
+        self.events.extend(events)
+        if self.verbose:
+            for event in events:
+                print(f"  {event.change:<8} {event.space_key}/{event.page_id} v{event.previous_version} -> v{event.version} {event.title}")
+
+
+async def run_mock(pages: int) -> int:
+    from mock_confluence import MockConfluence, MockServerThread, create_app
+
+    store = MockConfluence(pages=pages, space_key="MOCK")
+    store.add_page("OTHER", "다른 스페이스", "<p>동기화 대상이 아닙니다</p>")
+    failures = []
+
+    def check(label: str, recorder: EventRecorder, created: int, updated: int) -> None:
+        actual = (sum(e.change == "created" for e in recorder.events), sum(e.change == "updated" for e in recorder.events))
+        status = "ok" if actual == (created, updated) else "FAIL"
+        if status == "FAIL":
+            failures.append(label)
+        print(f"[{status}] {label}: created={actual[0]} updated={actual[1]} (expected {created}/{updated})")
+
+    with tempfile.TemporaryDirectory() as tmp, MockServerThread(create_app(store), MOCK_PORT):
+        path = os.path.join(tmp, "page_store.sqlite3")
+        service = ConfluenceService()
+        await service.startup()
+        try:
+            recorder = EventRecorder()
+            worker = ChangeSyncWorker(service, PageStore(path), spaces=["MOCK"])
+            worker.subscribe(recorder)
+            await worker.sync_all()
+            check("initial sync", recorder, pages, 0)
+
+            first = next(iter(store.pages))
+            await service.update_page(first, PageUpdate(title="수정된 페이지", content="<p>changed</p>"))
+            store.add_page("MOCK", "새 페이지", "<p>new</p>")
+            recorder.events.clear()
+            recorder.verbose = True
+            await worker.sync_all()
+            check("incremental sync", recorder, 1, 1)
+
+            # 재시작: 같은 저장소 파일로 새 작업자를 만듭니다.
+            recorder = EventRecorder(verbose=True)
+            restarted = ChangeSyncWorker(service, PageStore(path), spaces=["MOCK"])
+            restarted.subscribe(recorder)
+            await restarted.sync_all()
+            check("sync after restart", recorder, 0, 0)
+
+            # 커서를 잃어도 버전 비교로 중복 이벤트가 생기지 않습니다.
+            with sqlite3.connect(path) as conn:
+                conn.execute("DELETE FROM sync_cursors")
+            await restarted.sync_all()
+            check("full resync without cursor", recorder, 0, 0)
+            print(restarted.stats())
+        finally:
+            await service.shutdown()
+    return 1 if failures else 0
+
+
+async def run(spaces, loop: bool) -> int:
+    service = ConfluenceService()
+    await service.startup()
+    worker = ChangeSyncWorker(service, PageStore(settings.SYNC_STORE_PATH), spaces=spaces or None)
+    worker.subscribe(EventRecorder(verbose=True))
+    try:
+        if not worker.spaces:
+            print("No spaces to sync; pass --space or set SYNC_SPACES")
+            return 1
+        while True:
+            for result in await worker.sync_all():
+                print(result)
+            if not loop:
+                return 0
+            await asyncio.sleep(worker.interval)
+    finally:
+        await service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mock", action="store_true", help="가짜 Confluence 서버로 동기화 시나리오를 검증합니다")
+    parser.add_argument("--pages", type=int, default=300, help="--mock 모드에서 만들 페이지 수")
+    parser.add_argument("--space", action="append", default=[], help="동기화할 스페이스 키 (여러 번 지정 가능)")
+    parser.add_argument("--loop", action="store_true", help="SYNC_INTERVAL 간격으로 계속 동기화합니다")
+    args = parser.parse_args()
+    if args.mock:
+        sys.exit(asyncio.run(run_mock(args.pages)))
+    sys.exit(asyncio.run(run(args.space, args.loop)))
@@ -1,70 +1,81 @@
 import os
 import sys
+import json
 import asyncio
+import logging
+import argparse
 from dotenv import load_dotenv
 
 # 프로젝트 루트 경로를 sys.path에 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.services.confluence_service import ConfluenceService
-from app.services.llm_factory import get_llm_service
-from app.models.confluence_models import PageUpdate
+from app.services.llm_factory import get_llm_service, shutdown_llm_services
+from app.services.batch_update_service import BatchUpdateService
+from app.services.llm_cache import bypass_llm_cache
 
-async def main(label: str, prompt: str):
+async def main(args: argparse.Namespace):
     """
     지정된 레이블을 가진 모든 Confluence 페이지를 찾아 LLM으로 내용을 비동기적으로 업데이트합니다.
+    조회, LLM 생성, 업데이트 단계가 파이프라인으로 겹쳐 실행됩니다.
     """
     load_dotenv()
-    
+    # 페이지별 진행 상황(BatchUpdateService의 INFO 로그)을 출력합니다.
+    logging.basicConfig(level=logging.INFO, format="  %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
     confluence_service = ConfluenceService()
     llm_service = get_llm_service()
 
-    print(f"'{label}' 레이블을 가진 페이지를 검색합니다...")
-    # CQL을 사용하여 레이블로 페이지 검색
-    pages = await confluence_service.search_pages(cql=f"label='{label}'")
-
-    if not pages:
-        print("해당 레이블을 가진 페이지를 찾을 수 없습니다.")
-        return
+    pipeline = BatchUpdateService(
+        confluence_service,
+        llm_service,
+        confluence_concurrency=args.confluence_concurrency,
+        llm_concurrency=args.llm_concurrency,
+        checkpoint_path=args.checkpoint,
+        dry_run=args.dry_run,
+    )
 
-    print(f"{len(pages)}개의 페이지를 찾았습니다. 내용을 업데이트합니다.")
+    print(f"'{args.label}' 레이블을 가진 페이지를 검색하여 업데이트합니다...")
+    try:
+        if args.no_llm_cache:
+            with bypass_llm_cache():
+                report = await pipeline.run(f"label='{args.label}'", args.prompt)
+        else:
+            report = await pipeline.run(f"label='{args.label}'", args.prompt)
+    finally:
+        await shutdown_llm_services()
+        await confluence_service.shutdown()
 
-    for page_summary in pages:
-        page_id = page_summary['id']
-        title = page_summary['title']
-        
-        print(f"  - '{title}' (ID: {page_id}) 페이지 업데이트 중...")
-        
-        # 현재 페이지의 전체 정보를 가져옵니다. (본문 내용 포함)
-        current_page = await confluence_service.get_page(page_id, expand="body.storage,version")
-        current_content = current_page['body']['storage']['value']
-        
-        # LLM을 사용하여 새 콘텐츠 생성
-        # llm_service.process_query가 비동기이므로 await 사용
-        full_prompt = f"{prompt}\n\n---\n\n기존 내용:\n{current_content}"
-        llm_response = await llm_service.process_query(full_prompt)
-        new_content = llm_response.get("response", "") # 응답 형식에 따라 수정 필요
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
 
-        if not new_content:
-            print(f"    ...LLM으로부터 유효한 콘텐츠를 받지 못해 건너뜁니다.")
-            continue
-        
-        # 페이지 업데이트 모델 생성
-        update_data = PageUpdate(title=title, content=new_content)
-        
-        # 페이지 업데이트 (update_page가 비동기이므로 await 사용)
-        await confluence_service.update_page(page_id, update_data)
-        
-        print(f"    ...완료.")
+    counts = report["counts"]
+    if not counts["found"]:
+        print("해당 레이블을 가진 페이지를 찾을 수 없습니다.")
+        return
 
-    print("\n모든 페이지 업데이트가 완료되었습니다.")
+    print(
+        f"\n완료: 발견 {counts['found']}, 업데이트 {counts['updated']}, 업데이트 예정(dry-run) {counts['would_update']}, 변경 없음 {counts['unchanged']}, 건너뜀 {counts['skipped']}, "
+        f"실패 {counts['failed']}, 이전 실행에서 완료 {counts['resumed']}"
+    )
+    if report["unchanged_rate"] is not None:
+        print(f"변경 없음 비율: {report['unchanged_rate'] * 100:.1f}% (Confluence에 쓰지 않음)")
+    print(f"처리량: {report['pages_per_s']} pages/s ({report['elapsed_s']}s)")
+    for stage in report["stages"]:
+        print(f"  {json.dumps(stage, ensure_ascii=False)}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("사용법: python update_pages_by_label.py <label> <prompt>")
-        sys.exit(1)
-    
-    label_arg = sys.argv[1]
-    prompt_arg = sys.argv[2]
+    parser = argparse.ArgumentParser(description="레이블로 찾은 Confluence 페이지들을 LLM으로 일괄 업데이트합니다.")
+    parser.add_argument("label", help="대상 페이지의 레이블")
+    parser.add_argument("prompt", help="LLM에게 전달할 업데이트 지시문")
+    parser.add_argument("--confluence-concurrency", type=int, default=None, help="Confluence 동시 호출 수")
+    parser.add_argument("--llm-concurrency", type=int, default=None, help="LLM 동시 호출 수")
+    parser.add_argument("--checkpoint", default=None, help="재개를 위한 체크포인트 파일 경로 (JSONL)")
+    parser.add_argument("--dry-run", action="store_true", help="페이지를 실제로 업데이트하지 않고 결과만 출력")
+    parser.add_argument("--no-llm-cache", action="store_true", help="LLM_CACHE_ENABLED여도 LLM 응답 캐시를 사용하지 않음")
+    parser.add_argument("--report", default=None, help="실행 결과(건수, 처리량, 단계별 통계)를 저장할 JSON 파일 경로")
+
     # 비동기 main 함수 실행
-    asyncio.run(main(label_arg, prompt_arg))
\ No newline at end of file
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,59 @@
+"""
+로컬 파일 여러 개를 Confluence 페이지의 첨부 파일로 동시에 올립니다.
+
+각 파일은 ATTACHMENT_CHUNK_SIZE 단위로 읽어 바로 전송하므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+동시에 올리는 파일 수는 --concurrency(기본값: ATTACHMENT_UPLOAD_CONCURRENCY)로 제한됩니다.
+--replace를 주면 같은 이름의 첨부 파일이 이미 있는 파일은 새 버전으로 올립니다.
+파일별 결과를 JSON으로 출력하며, 실패한 파일이 있으면 0이 아닌 종료 코드로 끝납니다.
+
+사용법:
+    python scripts/upload_attachments.py 12345 build.log core.dump [--replace] [--comment "nightly"] [--concurrency 4]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+from app.services.attachment_stream import AttachmentSource
+from app.services.confluence_service import ConfluenceService
+
+
+async def main(args: argparse.Namespace) -> int:
+    load_dotenv()
+    service = ConfluenceService()
+    sources = [AttachmentSource.from_path(path) for path in args.files]
+    started = time.perf_counter()
+    try:
+        results = await service.upload_attachments(args.page_id, sources, args.comment, args.replace, args.concurrency)
+    finally:
+        await service.shutdown()
+    elapsed = time.perf_counter() - started
+    total_bytes = sum(source.size for source in sources)
+    failed = sum(1 for result in results if result.status == "error")
+    print(json.dumps({
+        "results": [result.model_dump(exclude_none=True) for result in results],
+        "summary": {
+            "files": len(results),
+            "failed": failed,
+            "bytes": total_bytes,
+            "elapsed_s": round(elapsed, 2),
+            "mb_per_s": round(total_bytes / elapsed / 1024 / 1024, 1) if elapsed else None,
+        },
+    }, ensure_ascii=False, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="여러 파일을 Confluence 페이지에 첨부 파일로 동시에 올립니다.")
+    parser.add_argument("page_id", help="첨부할 페이지 ID")
+    parser.add_argument("files", nargs="+", help="올릴 파일 경로")
+    parser.add_argument("--comment", default=None, help="첨부 파일 설명")
+    parser.add_argument("--replace", action="store_true", help="같은 이름의 첨부 파일이 있으면 새 버전으로 올립니다")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시에 올릴 파일 수 (기본값: ATTACHMENT_UPLOAD_CONCURRENCY)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# app.core.config의 필수 설정. 테스트는 실제 Confluence에 접속하지 않습니다.
+os.environ.setdefault("CONFLUENCE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("CONFLUENCE_USER", "test")
+os.environ.setdefault("CONFLUENCE_API_TOKEN", "test")
+os.environ.setdefault("SYNC_SPACES", "")
+
+# SQLite 저장소가 작업 디렉터리의 .cache/에 만들어지지 않도록 임시 디렉터리를 사용합니다.
+_cache_dir = tempfile.mkdtemp(prefix="confluence-tests-")
+for name, filename in [
+    ("WRITE_ELISION_PATH", "page_hashes.sqlite3"),
+    ("PAGE_CACHE_SQLITE_PATH", "page_cache.sqlite3"),
+    ("SESSION_SQLITE_PATH", "sessions.sqlite3"),
+    ("REPORT_SUMMARY_CACHE_PATH", "report_summaries.sqlite3"),
+    ("INDEX_PATH", "search_index.sqlite3"),
+    ("SYNC_STORE_PATH", "page_store.sqlite3"),
+    ("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+]:
+    os.environ.setdefault(name, os.path.join(_cache_dir, filename))
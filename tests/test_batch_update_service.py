@@ -0,0 +1,47 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.batch_update_service import BatchUpdateService, Checkpoint
+
+
+def test_checkpoint_retries_skipped_and_failed_pages(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    checkpoint = Checkpoint(path)
+    for page_id, status in [("1", "updated"), ("2", "unchanged"), ("3", "skipped"), ("4", "failed"), ("5", "updated"), ("5", "failed")]:
+        checkpoint.record(page_id, status)
+
+    assert Checkpoint(path).done == {"1", "2"}
+
+
+class FakeConfluence:
+    def __init__(self, summaries):
+        self.summaries = summaries
+        self.updates = []
+
+    async def search_pages_iter(self, cql, expand=None, max_results=None):
+        for summary in self.summaries:
+            yield summary
+
+    async def get_page(self, page_id, expand=None):
+        return {"id": page_id, "title": f"페이지 {page_id}", "version": {"number": 1}, "body": {"storage": {"value": "<p>이전</p>"}}}
+
+    async def update_page(self, page_id, page_data):
+        self.updates.append(page_id)
+        return {"id": page_id, "version": {"number": 2}}
+
+
+class FakeLLM:
+    async def complete(self, prompt, system_prompt=None):
+        return "<p>이후</p>"
+
+
+def test_page_without_id_fails_without_hanging_and_dry_run_is_counted_separately(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BODY_FORMAT", "storage")
+    confluence = FakeConfluence([{"title": "ID 없음"}, {"id": "1"}])
+    pipeline = BatchUpdateService(confluence, FakeLLM(), confluence_concurrency=1, llm_concurrency=1, dry_run=True)
+
+    report = asyncio.run(asyncio.wait_for(pipeline.run("label='x'", "고쳐 주세요"), timeout=5))
+    assert report["counts"]["failed"] == 1
+    assert report["counts"]["would_update"] == 1
+    assert report["counts"]["updated"] == 0
+    assert confluence.updates == []
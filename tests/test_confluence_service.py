@@ -0,0 +1,174 @@
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.models.confluence_models import PageUpdate
+from app.services.confluence_service import ConfluenceService
+
+
+def make_service(handler) -> ConfluenceService:
+    service = ConfluenceService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(settings, "CONFLUENCE_MAX_RETRIES", 2)
+
+
+def test_put_is_not_retried_after_server_error():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    service = make_service(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(service.update_page("1", PageUpdate(title="t", content="<p>a</p>", version=3, force=True)))
+    assert calls == ["PUT"]
+
+
+def test_get_is_retried_after_server_error():
+    responses = [httpx.Response(502), httpx.Response(200, json={"id": "1", "title": "t", "version": {"number": 3}})]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    service = make_service(handler)
+    assert asyncio.run(service._request("GET", f"{service.base_url}/content/1"))["id"] == "1"
+    assert service.retry_stats["server_errors"] == 1
+
+
+def page_response(version: int, content: str = "<p>a</p>") -> dict:
+    return {"id": "1", "title": "t", "version": {"number": version}, "body": {"storage": {"value": content}}}
+
+
+def test_content_hash_store_opens_on_first_write(tmp_path, monkeypatch):
+    import app.services.content_hash as content_hash_module
+
+    path = tmp_path / "page_hashes.sqlite3"
+    monkeypatch.setattr(settings, "WRITE_ELISION_PATH", str(path))
+    monkeypatch.setattr(settings, "PAGE_CACHE_BACKEND", "none")
+    monkeypatch.setattr(content_hash_module, "_content_hash_store", None)
+    puts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT":
+            puts.append(request)
+            return httpx.Response(200, json=page_response(4, "<p>b</p>"))
+        return httpx.Response(200, json=page_response(4, "<p>b</p>") if puts else page_response(3))
+
+    service = make_service(handler)
+    asyncio.run(service.get_page("1", expand="body.storage,version"))
+    assert not path.exists()
+
+    update = PageUpdate(title="t", content="<p>b</p>", version=3)
+    assert asyncio.run(service.update_page("1", update))["version"]["number"] == 4
+    assert path.exists() and len(puts) == 1
+    # 같은 내용을 다시 쓰면 PUT을 생략합니다.
+    assert asyncio.run(service.update_page("1", PageUpdate(title="t", content="<p>b</p>", version=4)))["status"] == "skipped"
+    assert len(puts) == 1
+
+
+def test_remember_writes_only_on_version_change(tmp_path):
+    from app.services.content_hash import ContentHashStore
+
+    store = ContentHashStore(str(tmp_path / "hashes.sqlite3"))
+    assert asyncio.run(store.remember(page_response(3))) is True
+    assert asyncio.run(store.remember(page_response(3))) is False
+    assert asyncio.run(store.remember(page_response(2))) is False
+    assert asyncio.run(store.remember(page_response(4, "<p>new</p>"))) is True
+    assert asyncio.run(store.get("1"))[0] == 4
+
+
+def test_page_cache_revalidates_by_version(monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "PAGE_CACHE_TTL", 0.0)
+    current = {"version": 3, "content": "<p>a</p>"}
+    expands = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        expands.append(request.url.params.get("expand"))
+        if request.url.params.get("expand") == "version":
+            return httpx.Response(200, json={"id": "1", "title": "t", "version": {"number": current["version"]}})
+        return httpx.Response(200, json=page_response(current["version"], current["content"]))
+
+    service = make_service(handler)
+    assert asyncio.run(service.get_page("1", expand="body.storage"))["body"]["storage"]["value"] == "<p>a</p>"
+    assert expands == ["body.storage,version"]
+
+    # TTL이 지났지만 버전이 같으면 버전만 조회하고 캐시된 본문을 반환합니다.
+    assert asyncio.run(service.get_page("1", expand="body.storage"))["body"]["storage"]["value"] == "<p>a</p>"
+    assert expands[1:] == ["version"]
+    assert service.page_cache.counters["revalidated"] == 1
+
+    # 버전이 바뀌었으면 본문을 다시 받습니다.
+    current.update(version=4, content="<p>b</p>")
+    page = asyncio.run(service.get_page("1", expand="body.storage"))
+    assert page["version"]["number"] == 4 and page["body"]["storage"]["value"] == "<p>b</p>"
+    assert expands[2:] == ["version", "body.storage,version"]
+    assert service.page_cache.counters["revalidated"] == 1
+
+
+def test_read_after_write_does_not_share_older_get(monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "PAGE_CACHE_TTL", 60.0)
+    monkeypatch.setattr(settings, "WRITE_ELISION_ENABLED", False)
+    current = {"version": 1, "content": "<p>old</p>"}
+
+    async def run():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "PUT":
+                current.update(version=2, content="<p>new</p>")
+                return httpx.Response(200, json=page_response(2, "<p>new</p>"))
+            page = page_response(current["version"], current["content"])
+            if not started.is_set():
+                # 쓰기 전에 시작된 느린 GET
+                started.set()
+                await release.wait()
+            return httpx.Response(200, json=page)
+
+        service = make_service(handler)
+        slow = asyncio.ensure_future(service.get_page("1", expand="body.storage"))
+        await started.wait()
+        await service.update_page("1", PageUpdate(title="t", content="<p>new</p>", version=1, force=True))
+        fresh = asyncio.ensure_future(service.get_page("1", expand="body.storage"))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await slow, await fresh, await service.get_page("1", expand="body.storage")
+
+    slow, fresh, cached = asyncio.run(run())
+    assert slow["version"]["number"] == 1
+    assert fresh["version"]["number"] == 2 and fresh["body"]["storage"]["value"] == "<p>new</p>"
+    # 쓰기 전에 시작된 조회 결과는 캐시에 남지 않습니다.
+    assert cached["version"]["number"] == 2 and cached["body"]["storage"]["value"] == "<p>new</p>"
+
+
+def test_caller_version_is_confirmed_before_skipping(tmp_path, monkeypatch):
+    import app.services.content_hash as content_hash_module
+
+    monkeypatch.setattr(settings, "WRITE_ELISION_PATH", str(tmp_path / "page_hashes.sqlite3"))
+    monkeypatch.setattr(settings, "PAGE_CACHE_BACKEND", "none")
+    monkeypatch.setattr(content_hash_module, "_content_hash_store", None)
+    puts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT":
+            puts.append(request)
+            return httpx.Response(200, json=page_response(7, "<p>a</p>"))
+        # 다른 곳에서 v6으로 수정된 상태
+        return httpx.Response(200, json=page_response(6, "<p>changed</p>"))
+
+    service = make_service(handler)
+    asyncio.run(service.content_hashes.remember({**page_response(5), "title": "t"}))
+    updated = asyncio.run(service.update_page("1", PageUpdate(title="t", content="<p>a</p>", version=5)))
+    assert updated["version"]["number"] == 7 and len(puts) == 1
+    assert json.loads(puts[0].content)["version"]["number"] == 7
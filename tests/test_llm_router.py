@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.llm_cache import record_side_effect
+from app.services.llm_router import LLMRouter
+
+
+class FakeStream:
+    """SDK 스트림처럼 aclose로 연결을 닫아야 하는 비동기 이터레이터."""
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = list(chunks)
+        self.delay = delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(self.delay)
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeLLM:
+    def __init__(self, name, delay=0.0, error=None, writes=False):
+        self.model_name = name
+        self.delay = delay
+        self.error = error
+        self.writes = writes
+        self.calls = 0
+        self.streams = []
+
+    async def process_query(self, prompt, session_id=None):
+        self.calls += 1
+        if self.writes:
+            record_side_effect()
+        if self.error:
+            raise self.error
+        return {"answer": self.model_name}
+
+    def stream_query(self, prompt, session_id=None):
+        self.calls += 1
+        stream = FakeStream([self.model_name, "!"], self.delay)
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.fixture(autouse=True)
+def no_explore(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ROUTER_EXPLORE_RATIO", 0.0)
+
+
+def test_cancelled_hedge_stream_is_closed(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ROUTER_HEDGE", True)
+    monkeypatch.setattr(settings, "LLM_ROUTER_HEDGE_MIN_SAMPLES", 1)
+    monkeypatch.setattr(settings, "LLM_ROUTER_HEDGE_MIN_DELAY", 0.01)
+    monkeypatch.setattr(settings, "LLM_ROUTER_HEDGE_BUDGET", 1.0)
+    slow, fast = FakeLLM("slow", delay=5.0), FakeLLM("fast")
+    router = LLMRouter({"slow": slow, "fast": fast})
+    router.health["slow"].record_success("stream_query", 0.01)
+    router.health["fast"].record_success("stream_query", 0.02)
+
+    async def collect():
+        return [chunk async for chunk in router.stream_query("질문")]
+
+    assert asyncio.run(collect()) == ["fast", "!"]
+    assert router.counters["hedges_won"] == 1
+    assert slow.streams[0].closed
+    assert fast.streams[0].closed
+
+
+def test_process_query_fails_over_without_writes():
+    first, second = FakeLLM("first", error=RuntimeError("boom")), FakeLLM("second")
+    router = LLMRouter({"first": first, "second": second})
+    assert asyncio.run(router.process_query("질문")) == {"answer": "second"}
+    assert router.counters["fallbacks"] == 1
+
+
+def test_process_query_does_not_fail_over_after_write():
+    first, second = FakeLLM("first", error=RuntimeError("boom"), writes=True), FakeLLM("second")
+    router = LLMRouter({"first": first, "second": second})
+    with pytest.raises(RuntimeError):
+        asyncio.run(router.process_query("질문"))
+    assert second.calls == 0
+    assert router.counters["fallbacks"] == 0
@@ -0,0 +1,37 @@
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+import app.main as main
+
+
+class FakeConfluence:
+    def __init__(self, pages=None, status_code=None):
+        self.pages = pages or []
+        self.status_code = status_code
+
+    async def search_pages_iter(self, cql, expand=None, max_results=None):
+        if self.status_code is not None:
+            request = httpx.Request("GET", "http://confluence/rest/api/content/search")
+            raise httpx.HTTPStatusError("error", request=request, response=httpx.Response(self.status_code, request=request))
+        for page in self.pages:
+            yield page
+
+
+def test_search_maps_upstream_error_to_status_code(monkeypatch):
+    monkeypatch.setattr(main, "confluence_service", FakeConfluence(status_code=400))
+    response = TestClient(main.app).get("/pages/search", params={"cql": "title ~"})
+    assert response.status_code == 400
+
+
+def test_search_streams_ndjson(monkeypatch):
+    pages = [{"id": "1", "title": "a"}, {"id": "2", "title": "b"}]
+    monkeypatch.setattr(main, "confluence_service", FakeConfluence(pages))
+    response = TestClient(main.app).get("/pages/search", params={"cql": "type = page"})
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == pages
+
+    monkeypatch.setattr(main, "confluence_service", FakeConfluence([]))
+    response = TestClient(main.app).get("/pages/search", params={"cql": "type = page"})
+    assert response.status_code == 200 and response.text == ""
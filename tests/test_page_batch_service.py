@@ -0,0 +1,59 @@
+import asyncio
+
+from app.models.confluence_models import BatchOperation
+from app.services.page_batch_service import PageBatchService
+
+
+class FakeConfluence:
+    def __init__(self, fail_titles=()):
+        self.fail_titles = set(fail_titles)
+        self.created = []
+
+    async def create_page(self, page_data):
+        await asyncio.sleep(0.01)
+        if page_data.title in self.fail_titles:
+            raise RuntimeError("400 Bad Request")
+        page_id = str(100 + len(self.created))
+        self.created.append((page_id, page_data.title, page_data.parent_id))
+        return {"id": page_id, "title": page_data.title, "version": {"number": 1}}
+
+
+def run_batch(confluence, operations):
+    async def source():
+        for operation in operations:
+            yield BatchOperation(**operation)
+
+    async def collect():
+        return [result async for result in PageBatchService(confluence, concurrency=4).run(source())]
+
+    return sorted(asyncio.run(collect()), key=lambda result: result.index)
+
+
+def create(title, ref=None, parent_id=None):
+    return {"op": "create", "space_key": "DEV", "title": title, "content": "<p>x</p>", "ref": ref, "parent_id": parent_id}
+
+
+def test_parent_is_created_before_child():
+    confluence = FakeConfluence()
+    results = run_batch(confluence, [create("부모", ref="parent"), create("자식", parent_id="parent"), create("기존 부모 아래", parent_id="42")])
+    assert [r.status for r in results] == ["ok", "ok", "ok"]
+    titles = [title for _, title, _ in confluence.created]
+    assert titles.index("부모") < titles.index("자식")
+    assert {title: parent for _, title, parent in confluence.created} == {"부모": None, "자식": results[0].page_id, "기존 부모 아래": "42"}
+
+
+def test_failed_parent_fails_its_children():
+    confluence = FakeConfluence(fail_titles={"부모"})
+    results = run_batch(confluence, [create("부모", ref="parent"), create("자식", ref="child", parent_id="parent"), create("손자", parent_id="child")])
+    assert [r.status for r in results] == ["error", "error", "error"]
+    assert "ref 'parent' failed" in results[1].error
+    assert confluence.created == []
+
+
+def test_forward_and_unknown_refs_are_rejected():
+    confluence = FakeConfluence()
+    results = run_batch(confluence, [create("자식", parent_id="later"), create("부모", ref="later"), create("오타", parent_id="missing"), create("숫자 ref", ref="7")])
+    assert [r.status for r in results] == ["error", "ok", "error", "error"]
+    assert "unknown ref 'later'" in results[0].error
+    assert "unknown ref 'missing'" in results[2].error
+    assert [title for _, title, _ in confluence.created] == ["부모"]
@@ -0,0 +1,41 @@
+import asyncio
+
+from app.services.report_service import ReportService, SummaryCache
+
+
+class FakeLLM:
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.calls = 0
+
+    async def complete(self, prompt, system_prompt=None):
+        self.calls += 1
+        return f"{self.model_name}: 요약"
+
+
+def test_summary_cache_key_includes_model_name(tmp_path):
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite3"))
+    first, second = FakeLLM("gpt-4o-mini"), FakeLLM("gpt-4o")
+
+    assert asyncio.run(ReportService(None, first, cache)._summarize("본문", "요약하세요", "chunk-1")) == "gpt-4o-mini: 요약"
+    assert asyncio.run(ReportService(None, first, cache)._summarize("본문", "요약하세요", "chunk-1")) == "gpt-4o-mini: 요약"
+    assert first.calls == 1
+    # 같은 클래스라도 모델이 다르면 다른 모델의 요약을 재사용하지 않습니다.
+    assert asyncio.run(ReportService(None, second, cache)._summarize("본문", "요약하세요", "chunk-1")) == "gpt-4o: 요약"
+    assert second.calls == 1
+
+
+def test_summary_cache_expires_and_evicts(tmp_path):
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite3"), ttl=60.0, max_bytes=30)
+    asyncio.run(cache.set("a", "가" * 4))
+    asyncio.run(cache.set("b", "나" * 4))
+    asyncio.run(cache.set("c", "다" * 4))
+    # 합계가 max_bytes를 넘으면 가장 오래 사용되지 않은 요약부터 지웁니다.
+    assert asyncio.run(cache.get("a")) is None
+    assert asyncio.run(cache.get("c")) == "다" * 4
+    assert cache.stats()["evictions"] >= 1
+
+    expired = SummaryCache(str(tmp_path / "expired.sqlite3"), ttl=0.0)
+    asyncio.run(expired.set("a", "요약"))
+    assert asyncio.run(expired.get("a")) is None
+    assert expired.stats()["expired"] == 1
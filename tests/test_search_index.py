@@ -0,0 +1,54 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.search_index import SearchIndex
+from app.services.sync_service import parse_when
+
+
+class FakeConfluence:
+    def __init__(self, pages):
+        self.pages = pages
+        self.queries = []
+
+    async def search_pages_iter(self, cql, expand=None, max_results=None):
+        self.queries.append(cql)
+        for page in self.pages:
+            yield page
+
+
+def make_page(page_id, when):
+    return {
+        "id": page_id, "title": f"페이지 {page_id}", "space": {"key": "DEV"},
+        "version": {"number": 1, "when": when}, "body": {"storage": {"value": "<p>배포 절차</p>"}},
+    }
+
+
+def test_sync_cursor_follows_server_time_in_confluence_timezone(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_TIMEZONE", "Asia/Seoul")
+    monkeypatch.setattr(settings, "INDEX_SYNC_OVERLAP_MINUTES", 10)
+    index = SearchIndex(str(tmp_path / "index.sqlite3"))
+    confluence = FakeConfluence([make_page("1", "2024-05-01T10:00:00.000Z"), make_page("2", "2024-05-01T12:00:00.000Z")])
+
+    result = asyncio.run(index.sync(confluence, "type = page"))
+    assert result["indexed"] == 2
+    assert parse_when(index._get_state("cursor:type = page")) == parse_when("2024-05-01T12:00:00.000Z")
+
+    result = asyncio.run(index.sync(confluence, "type = page"))
+    assert confluence.queries[-1] == '(type = page) and lastmodified >= "2024-05-01 20:50"'
+    assert result["indexed"] == 0
+
+
+def test_sync_removes_pages_that_left_the_scope(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INDEX_SYNC_PRUNE_HOURS", 0)
+    index = SearchIndex(str(tmp_path / "index.sqlite3"))
+    pages = [make_page("1", "2024-05-01T10:00:00.000Z"), make_page("2", "2024-05-01T11:00:00.000Z")]
+    asyncio.run(index.sync(FakeConfluence(pages), "type = page"))
+    # 다른 범위에도 속한 페이지는 이 범위에서 사라져도 인덱스에 남습니다.
+    asyncio.run(index.sync(FakeConfluence(pages[1:]), "space = DEV"))
+    assert {r["id"] for r in asyncio.run(index.search("배포"))} == {"1", "2"}
+
+    confluence = FakeConfluence([])
+    result = asyncio.run(index.sync(confluence, "type = page"))
+    assert confluence.queries[-1] == "type = page"
+    assert result["removed"] == 1
+    assert [r["id"] for r in asyncio.run(index.search("배포"))] == ["2"]
@@ -0,0 +1,43 @@
+import asyncio
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 1}
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)))
+        return flight, results
+
+    flight, results = asyncio.run(run())
+    assert calls == [1]
+    assert results == [{"value": 1}] * 3
+    # 공유된 결과는 호출자마다 복사본입니다.
+    assert results[0] is not results[1]
+    assert flight.stats() == {"in_flight": 0, "calls": 1, "coalesced": 2, "forgotten": 0}
+
+
+def test_forgotten_call_is_not_shared_with_later_callers():
+    values = iter(["old", "new"])
+
+    async def fetch():
+        value = next(values)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        assert flight.forget(lambda key: key == "key") == 1
+        second = await flight.do("key", fetch)
+        return await first, second
+
+    assert asyncio.run(run()) == ("old", "new")
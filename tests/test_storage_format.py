@@ -0,0 +1,114 @@
+import pytest
+
+from app.services.storage_format import storage_to_markdown, markdown_to_storage
+
+
+def round_trip(storage: str, edit=lambda markdown: markdown) -> str:
+    macros = {}
+    markdown = storage_to_markdown(storage, macros)
+    return markdown_to_storage(edit(markdown), macros)
+
+
+LAYOUT = (
+    '<ac:layout><ac:layout-section ac:type="two_equal">'
+    "<ac:layout-cell><p>왼쪽</p></ac:layout-cell>"
+    "<ac:layout-cell><p>오른쪽</p></ac:layout-cell>"
+    "</ac:layout-section></ac:layout>"
+)
+EXPAND = (
+    '<ac:structured-macro ac:name="expand" ac:schema-version="1"><ac:parameter ac:name="title">자세히</ac:parameter>'
+    "<ac:rich-text-body><p>접힌 내용</p></ac:rich-text-body></ac:structured-macro>"
+)
+INFO_PANEL = (
+    '<ac:structured-macro ac:name="info" ac:schema-version="1"><ac:parameter ac:name="title">주의</ac:parameter>'
+    "<ac:rich-text-body><p>패널 본문</p></ac:rich-text-body></ac:structured-macro>"
+)
+MENTION = '<p>담당: <ac:link><ri:user ri:account-id="557058:abc" /></ac:link></p>'
+TIME = '<p>마감 <time datetime="2024-05-01" /></p>'
+STYLED_SPAN = '<p>상태 <span style="color: rgb(255,86,48);">지연</span></p>'
+MERGED_TABLE = '<table><tbody><tr><th colspan="2">머리글</th></tr><tr><td>a</td><td>b</td></tr></tbody></table>'
+COLUMN_WIDTH_TABLE = '<table><colgroup><col style="width: 200px;" /><col /></colgroup><tbody><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></tbody></table>'
+SPACE_LINK = '<p><ac:link><ri:page ri:space-key="DEV" ri:content-title="배포" /></ac:link></p>'
+CODE_TITLE = (
+    '<ac:structured-macro ac:name="code"><ac:parameter ac:name="title">run.sh</ac:parameter>'
+    "<ac:plain-text-body><![CDATA[echo hi]]></ac:plain-text-body></ac:structured-macro>"
+)
+
+
+@pytest.mark.parametrize(
+    "storage",
+    [LAYOUT, EXPAND, INFO_PANEL, MENTION, TIME, STYLED_SPAN, MERGED_TABLE, COLUMN_WIDTH_TABLE, SPACE_LINK, CODE_TITLE],
+    ids=["layout", "expand", "info-panel", "mention", "time", "styled-span", "merged-table", "column-width-table", "space-link", "code-title"],
+)
+def test_unrepresentable_elements_round_trip_unchanged(storage):
+    assert round_trip(storage) == storage
+
+
+def test_plain_markup_round_trips_through_markdown():
+    storage = (
+        "<h2>제목</h2><p>본문 <strong>굵게</strong> <a href=\"https://example.com\">링크</a></p>"
+        "<ul><li>하나</li><li>둘<ul><li>중첩</li></ul></li></ul>"
+        "<table><tbody><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></tbody></table>"
+    )
+    macros = {}
+    markdown = storage_to_markdown(storage, macros)
+    assert "| A | B |" in markdown and "- 둘" in markdown
+    assert macros == {}
+    assert markdown_to_storage(markdown, macros) == storage
+
+
+def test_container_body_stays_editable():
+    storage = LAYOUT + EXPAND
+    result = round_trip(storage, lambda markdown: markdown.replace("접힌 내용", "수정한 내용").replace("왼쪽", "LEFT"))
+    assert result == storage.replace("접힌 내용", "수정한 내용").replace("왼쪽", "LEFT")
+
+
+def test_edits_around_preserved_elements_keep_them():
+    storage = "<p>소개</p>" + MERGED_TABLE + MENTION
+    result = round_trip(storage, lambda markdown: markdown.replace("소개", "새 소개"))
+    assert result.startswith("<p>새 소개</p>")
+    assert MERGED_TABLE in result
+    assert '<ri:user ri:account-id="557058:abc" />' in result
+
+
+def test_broken_wrapper_pair_is_rejected():
+    macros = {}
+    markdown = storage_to_markdown(EXPAND, macros)
+    with pytest.raises(ValueError):
+        markdown_to_storage(markdown.replace("{{/macro:1}}", ""), macros)
+    with pytest.raises(ValueError):
+        markdown_to_storage(markdown.replace("\n\n{{/macro:1}}", " {{/macro:1}}"), macros)
+
+
+def test_read_only_conversion_is_unchanged():
+    # macros 없이 변환하면 이전처럼 프롬프트용으로 간결하게 줄입니다.
+    markdown = storage_to_markdown(INFO_PANEL + MENTION)
+    assert markdown == "> **Info:** 패널 본문\n\n담당: @557058:abc"
+
+
+@pytest.mark.parametrize(
+    "storage",
+    [
+        "<p>**not bold** and `tick`</p>",
+        "<p>- not a list</p>",
+        "<p>| a | b |</p>",
+        "<p>[y](z)</p>",
+        "<p># not a heading</p>",
+        "<p>1. not ordered</p>",
+        "<p>&gt; not a quote</p>",
+        "<p>line<br/>- second</p>",
+        "<p>a_b ~~c~~ C:\\temp\\*</p>",
+        "<p><code>a*b_c</code> and <a href=\"https://example.com/a_b\">x*y [z]</a></p>",
+        "<table><tbody><tr><th>a|b</th><th>- c</th></tr><tr><td>[x] d</td><td>e</td></tr></tbody></table>",
+    ],
+    ids=["emphasis-and-code", "list", "table", "link", "heading", "ordered-list", "quote", "after-br", "punctuation", "inside-code-and-link", "table-cells"],
+)
+def test_markdown_syntax_in_text_stays_literal(storage):
+    assert round_trip(storage) == storage
+
+
+def test_edit_keeps_escaped_text_elsewhere_literal():
+    storage = "<p>**not bold**</p><p>수정 전</p>"
+    assert round_trip(storage, lambda markdown: markdown.replace("수정 전", "수정 **후**")) == (
+        "<p>**not bold**</p><p>수정 <strong>후</strong></p>"
+    )
@@ -0,0 +1,36 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.services.sync_service import ChangeSyncWorker, PageStore, format_cql_date, parse_when
+
+
+class FakeConfluence:
+    def __init__(self, pages):
+        self.pages = pages
+        self.queries = []
+
+    async def search_pages_iter(self, cql, expand=None, max_results=None):
+        self.queries.append(cql)
+        for page in self.pages:
+            yield page
+
+
+def test_format_cql_date_uses_confluence_timezone(monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_TIMEZONE", "Asia/Seoul")
+    assert format_cql_date(datetime(2024, 5, 1, 23, 30, tzinfo=timezone.utc)) == "2024-05-02 08:30"
+    monkeypatch.setattr(settings, "CONFLUENCE_TIMEZONE", "UTC")
+    assert format_cql_date(datetime(2024, 5, 1, 23, 30, tzinfo=timezone.utc)) == "2024-05-01 23:30"
+
+
+def test_sync_cursor_is_sent_in_confluence_timezone(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_TIMEZONE", "Asia/Seoul")
+    monkeypatch.setattr(settings, "SYNC_OVERLAP_MINUTES", 5)
+    page = {"id": "1", "title": "a", "version": {"number": 1, "when": "2024-05-01T23:30:00.000Z"}, "body": {"storage": {"value": "<p>a</p>"}}}
+    confluence = FakeConfluence([page])
+    worker = ChangeSyncWorker(confluence, PageStore(str(tmp_path / "store.sqlite3")), spaces=["DEV"])
+
+    asyncio.run(worker.sync_space("DEV"))
+    assert asyncio.run(worker.store.get_cursor("DEV")) == parse_when("2024-05-01T23:30:00.000Z")
+    asyncio.run(worker.sync_space("DEV"))
+    assert 'lastmodified >= "2024-05-02 08:25"' in confluence.queries[-1]
@@ -0,0 +1,35 @@
+import json
+
+from app.core.config import settings
+from app.services.tool_dispatcher import ToolDispatcher
+
+
+def test_truncate_index_results_without_body(monkeypatch):
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_CHARS", 300)
+    results = [{"id": str(i), "title": f"페이지 {i}", "snippet": "…배포 [절차]…" * 5, "score": 1.0} for i in range(10)]
+    serialized = ToolDispatcher._truncate({"results": results})
+    assert len(serialized) <= 300
+    truncated = json.loads(serialized)
+    assert truncated["truncated"] is True
+    assert truncated["results"] == results[:len(truncated["results"])]
+    assert truncated["omitted"] == len(results) - len(truncated["results"]) > 0
+
+
+def test_truncate_shrinks_bodies_and_keeps_index_items(monkeypatch):
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_CHARS", 600)
+    results = [
+        {"id": "1", "title": "본문 있음", "body": "가" * 1000},
+        {"id": "2", "title": "색인 결과", "snippet": "배포 절차"},
+    ]
+    truncated = json.loads(ToolDispatcher._truncate({"results": results}))
+    assert truncated["truncated"] is True
+    assert truncated["results"][0]["body"].endswith("…") and len(truncated["results"][0]["body"]) < 1000
+    assert truncated["results"][1] == results[1]
+
+
+def test_truncate_non_list_result_stays_valid_json(monkeypatch):
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_CHARS", 200)
+    serialized = ToolDispatcher._truncate({"report_draft": {"title": "보고서", "content": "<p>\"내용\"</p>" * 100}})
+    assert len(serialized) <= 200
+    truncated = json.loads(serialized)
+    assert truncated["truncated"] is True and truncated["preview"].startswith('{"report_draft"')